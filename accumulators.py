@@ -0,0 +1,198 @@
+import numpy as np
+
+
+class RunningMoments:
+    # Count, mean and sum of squared deviations, updated batch by batch with
+    # the pairwise (Chan et al.) combination rule so historical rows never
+    # need rescanning. NaNs are ignored.
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = int(count)
+        self.mean = float(mean)
+        self.m2 = float(m2)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values):
+            batch_mean = values.mean()
+            batch = RunningMoments(
+                len(values), batch_mean, ((values - batch_mean) ** 2).sum()
+            )
+            self.merge(batch)
+        return self
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta**2 * self.count * other.count / total
+        self.count = total
+        return self
+
+    @property
+    def variance(self):
+        # Sample variance (ddof=1), matching pandas Series.var()
+        return self.m2 / (self.count - 1) if self.count > 1 else float("nan")
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.variance))
+
+    def to_dict(self):
+        return {"count": self.count, "mean": self.mean, "m2": self.m2}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["count"], data["mean"], data["m2"])
+
+
+class QuantileSketch:
+    # Mergeable KLL quantile sketch. Level h holds items of weight 2**h and
+    # levels are compacted (sort, keep every other item from a random offset)
+    # when they outgrow their capacity, so memory stays O(k log n). Until the
+    # first compaction every item is kept and quantiles are exact.
+
+    def __init__(self, k=200, seed=0):
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - 1 - level
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        while sum(len(items) for items in self.levels) > sum(
+            self._capacity(h) for h in range(len(self.levels))
+        ):
+            level = next(
+                h
+                for h in range(len(self.levels))
+                if len(self.levels[h]) > self._capacity(h)
+            )
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(self.levels[level])
+            keep = items[-1:] if len(items) % 2 else items[:0]
+            items = items[: len(items) - len(keep)]
+            promoted = items[self._rng.integers(2) :: 2]
+            self.levels[level] = keep
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.count += len(values)
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._compress()
+        return self
+
+    @property
+    def exact(self):
+        return len(self.levels) == 1
+
+    def rank_error(self):
+        # Normalised rank error at 99% confidence; the empirical fit
+        # 2.446 / k**0.9433 reported for KLL sketches (about 1.65% at k=200)
+        return 0.0 if self.exact else 2.446 / self.k**0.9433
+
+    def quantile(self, q):
+        if self.count == 0:
+            return float("nan")
+        if self.exact:
+            return float(np.quantile(self.levels[0], q))
+        items = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [np.full(len(level), 2.0**h) for h, level in enumerate(self.levels)]
+        )
+        order = np.argsort(items)
+        cumulative = np.cumsum(weights[order])
+        index = np.searchsorted(cumulative, q * cumulative[-1], side="left")
+        return float(items[order][min(index, len(items) - 1)])
+
+    @property
+    def median(self):
+        return self.quantile(0.5)
+
+    def to_dict(self):
+        return {
+            "k": self.k,
+            "count": self.count,
+            "levels": [items.tolist() for items in self.levels],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["k"])
+        sketch.count = data["count"]
+        sketch.levels = [np.array(items, dtype=np.float64) for items in data["levels"]]
+        return sketch
+
+
+class SummaryStats:
+    # Exact moments plus a quantile sketch for one variable in one group:
+    # everything a "Summary Statistics" panel shows, built in a single pass
+    # and mergeable across batches or shards.
+
+    def __init__(self, moments=None, sketch=None):
+        self.moments = moments or RunningMoments()
+        self.sketch = sketch or QuantileSketch()
+
+    @classmethod
+    def of(cls, values):
+        return cls().update(values)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.moments.update(values)
+        self.sketch.update(values)
+        return self
+
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+        return self
+
+    @property
+    def count(self):
+        return self.moments.count
+
+    @property
+    def mean(self):
+        return self.moments.mean if self.count else float("nan")
+
+    @property
+    def std(self):
+        return self.moments.std
+
+    @property
+    def median(self):
+        return self.sketch.median
+
+    def quantile(self, q):
+        return self.sketch.quantile(q)
+
+    def to_dict(self):
+        return {"moments": self.moments.to_dict(), "sketch": self.sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            RunningMoments.from_dict(data["moments"]),
+            QuantileSketch.from_dict(data["sketch"]),
+        )
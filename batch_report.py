@@ -0,0 +1,563 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from cohort_store import STATS_COLUMNS, ingest_csv, load_summary, read_cohort
+
+# Headless runner for the dashboard analyses: every analysis over a cohort
+# file (a CSV export or a cohort store directory), for any number of sites,
+# without Streamlit. Each analysis is one task that reads the columns it
+# needs from the store and runs its vectorized engine over the whole cohort;
+# tasks of every site share one process pool. Per site the results tables
+# are written as JSON and Parquet, the figures as HTML (and PNG when the
+# image exporter is installed), and everything as one bordered PDF report.
+#
+#     python batch_report.py site_a.csv site_b.csv --out reports
+
+OUTCOME = "CLINICAL OUTCOMES"
+
+# Rows of a table printed in the PDF report; the full table is in the
+# Parquet and JSON output
+PDF_ROWS = 60
+
+
+def overview_tables(store_path):
+    summary = load_summary(store_path)
+    outcomes = pd.DataFrame(
+        {
+            "Outcome": ["ALIVE", "DEAD"],
+            "Patients": [summary.outcome_count("ALIVE"), summary.outcome_count("DEAD")],
+        }
+    )
+    sexes = pd.DataFrame(
+        {
+            "Sex": ["MALE", "FEMALE"],
+            "Patients": [summary.sex_count("MALE"), summary.sex_count("FEMALE")],
+        }
+    )
+    age_groups = summary.age_outcome_counts().pivot(
+        index="Age_Group", columns=OUTCOME, values="Count"
+    )
+    return {
+        "outcomes": outcomes,
+        "sex": sexes,
+        "age_groups": age_groups.reset_index().rename_axis(columns=None),
+    }
+
+
+def test_tables(store_path):
+    # The page tests from one streamed pass over the store (the Combined
+    # Analysis out-of-core mode), with max-T, Holm and BH adjustment
+    from chunked import analyze, combined_family
+    from multiple_testing import adjust_table
+
+    analysis = analyze(store_path)
+    combined = analysis.combined_results()
+    combined["Max-T P"] = combined_family(store_path).max_t()
+    return {
+        "rank_tests": analysis.rank_tests(),
+        "contingency_tests": analysis.contingency_tests(),
+        "combined": adjust_table(combined),
+    }
+
+
+def roc_tables(store_path):
+    from roc import roc_table
+
+    data = read_cohort(store_path, STATS_COLUMNS + [OUTCOME])
+    return {"roc": roc_table(data, STATS_COLUMNS)}
+
+
+def correlation_tables(store_path):
+    from correlation import CorrelationMatrix
+    from multiple_testing import adjust_table
+
+    correlations = CorrelationMatrix(
+        read_cohort(store_path, STATS_COLUMNS + [OUTCOME]), STATS_COLUMNS
+    )
+    tables = {"outcome": adjust_table(correlations.outcome_table())}
+    for kind in ["pearson", "spearman"]:
+        order = correlations.clustered_order(kind)
+        matrix = correlations.frame(kind).loc[order, order]
+        tables[kind] = matrix.rename_axis("Variable").reset_index()
+    return tables
+
+
+def sensitivity_tables(store_path):
+    from cohort_store import UNSTABLE_CRITERIA
+    from sensitivity import SensitivityGrid
+
+    grid = SensitivityGrid(read_cohort(store_path, list(UNSTABLE_CRITERIA) + [OUTCOME]))
+    return {"thresholds": grid.to_frame()}
+
+
+def stratified_tables(store_path, strata=("Age Group",)):
+    # Mantel-Haenszel odds ratio of death for every exposure flag, with the
+    # page's default stratification
+    from cohort_store import COMORBIDITY_MASK, UNSTABLE_CRITERIA
+    from multiple_testing import adjust_table
+    from stratified import FLAGS, StratifiedTables
+
+    data = read_cohort(
+        store_path,
+        ["Age_Group", "SEX", COMORBIDITY_MASK] + list(UNSTABLE_CRITERIA) + [OUTCOME],
+    )
+    rows = []
+    for exposure in FLAGS:
+        tables = StratifiedTables(data, exposure, [s for s in strata if s != exposure])
+        mh = tables.mantel_haenszel()
+        bd = tables.breslow_day()
+        rows.append(
+            {
+                "Exposure": exposure,
+                "Crude OR": tables.crude_odds_ratio(),
+                "MH OR": mh["Odds Ratio"],
+                "CI Lower": mh["CI Lower"],
+                "CI Upper": mh["CI Upper"],
+                "CMH Chi-square": mh["Chi-square"],
+                "P-Value": mh["P-Value"],
+                "Breslow-Day P": bd["P-Value"],
+            }
+        )
+    return {"mantel_haenszel": adjust_table(pd.DataFrame(rows))}
+
+
+def mortality_tables(store_path):
+    from mortality_model import (
+        DEFAULT_TERMS,
+        MODEL_COLUMNS,
+        ModelCache,
+        design_matrix,
+        formula,
+        model_frame,
+        outcome_vector,
+    )
+    from roc import roc_summary
+
+    data = read_cohort(store_path, MODEL_COLUMNS)
+    fit = ModelCache().fit(data, DEFAULT_TERMS)
+    frame = model_frame(data, DEFAULT_TERMS)
+    auc = roc_summary(
+        fit.predict(design_matrix(frame, DEFAULT_TERMS)),
+        outcome_vector(frame),
+        n_boot=0,
+    )
+    model = pd.DataFrame(
+        [
+            {
+                "Formula": formula(DEFAULT_TERMS),
+                "Patients": fit.n,
+                "Deaths": fit.events,
+                "AIC": fit.aic,
+                "McFadden R2": fit.pseudo_r2,
+                "AUC": auc["AUC"] if auc else np.nan,
+                "Method": fit.method,
+                "Converged": fit.converged,
+                "Separated Terms": ", ".join(fit.separated),
+            }
+        ]
+    )
+    return {"model": model, "odds_ratios": fit.odds_ratios()}
+
+
+def risk_tables(store_path):
+    from risk_score import DEFAULT_ITEMS, ScoreBuilder, item_columns
+
+    columns = list(
+        dict.fromkeys(column for item in DEFAULT_ITEMS for column in item_columns(item))
+    )
+    # The folds run in this task's process; the pool already spreads the
+    # analyses over the cores
+    validation = ScoreBuilder(max_workers=1).build(
+        read_cohort(store_path, columns + [OUTCOME]), DEFAULT_ITEMS
+    )
+    cv_auc = validation.auc()
+    score = pd.DataFrame(
+        [
+            {
+                "Items": ", ".join(DEFAULT_ITEMS),
+                "Patients": validation.n,
+                "Deaths": validation.events,
+                "Cross-validated AUC": cv_auc["AUC"] if cv_auc else np.nan,
+                "CI Lower": cv_auc["CI Lower"] if cv_auc else np.nan,
+                "CI Upper": cv_auc["CI Upper"] if cv_auc else np.nan,
+                "Apparent AUC": validation.apparent_auc(),
+                "Brier Score": validation.brier(),
+                "Calibration Slope": validation.calibration_slope(),
+            }
+        ]
+    )
+    return {
+        "score": score,
+        "points": validation.score.points_table(),
+        "risk": validation.score.risk_table(),
+        "calibration": validation.calibration_table(),
+    }
+
+
+# Analyses in report order; each takes a store path and returns
+# {table name: DataFrame}
+ANALYSES = {
+    "overview": overview_tables,
+    "tests": test_tables,
+    "roc": roc_tables,
+    "correlation": correlation_tables,
+    "sensitivity": sensitivity_tables,
+    "stratified": stratified_tables,
+    "mortality": mortality_tables,
+    "risk": risk_tables,
+}
+
+
+def _run_analysis(task):
+    site, name, store_path = task
+    start = time.perf_counter()
+    return site, name, ANALYSES[name](store_path), time.perf_counter() - start
+
+
+def site_store(path, out_dir):
+    # Store directory of a site; a CSV is ingested into the site's output
+    if os.path.isdir(path):
+        return path
+    store_path = os.path.join(out_dir, "cohort_store")
+    ingest_csv(path, store_path)
+    return store_path
+
+
+def run_analyses(stores, analyses=None, max_workers=None):
+    # {site: {analysis: {table: DataFrame}}} and {(site, analysis): seconds}
+    # for {site: store path}; independent analyses run in parallel
+    tasks = [
+        (site, name, store_path)
+        for site, store_path in stores.items()
+        for name in analyses or ANALYSES
+    ]
+    workers = max_workers or min(len(tasks), os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            done = list(pool.map(_run_analysis, tasks))
+    else:
+        done = [_run_analysis(task) for task in tasks]
+
+    results = {site: {} for site in stores}
+    timings = {}
+    for site, name, tables, seconds in done:
+        results[site][name] = tables
+        timings[site, name] = seconds
+    return results, timings
+
+
+def _layout(fig, **kwargs):
+    # The dashboard's figure fonts
+    fig.update_layout(
+        title_font=dict(size=30),
+        legend=dict(font=dict(size=26)),
+        xaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+        yaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+        **kwargs,
+    )
+    return fig
+
+
+def report_figures(results):
+    # (file name, figure) pairs drawn from a site's results tables
+    figures = []
+    if "overview" in results:
+        outcomes = results["overview"]["outcomes"]
+        fig = go.Figure(
+            go.Pie(
+                values=outcomes["Patients"],
+                labels=outcomes["Outcome"],
+                marker_colors=["#2E8B57", "#DC143C"],
+                textinfo="percent+label",
+                textfont_size=20,
+            )
+        )
+        figures.append(
+            (
+                "Clinical_Outcomes_Distribution",
+                _layout(fig, title="Clinical Outcomes Distribution"),
+            )
+        )
+    if "tests" in results:
+        rank_tests = results["tests"]["rank_tests"]
+        fig = go.Figure()
+        for outcome, color in [("ALIVE", "#2E8B57"), ("DEAD", "#DC143C")]:
+            fig.add_trace(
+                go.Bar(
+                    name=outcome,
+                    x=rank_tests["Variable"],
+                    y=rank_tests[f"Mean ({outcome})"],
+                    marker_color=color,
+                )
+            )
+        figures.append(
+            (
+                "Means_by_Clinical_Outcome",
+                _layout(fig, title="Means by Clinical Outcome", barmode="group"),
+            )
+        )
+    if "roc" in results:
+        roc = results["roc"]["roc"]
+        fig = go.Figure(
+            go.Bar(
+                x=roc["Variable"],
+                y=roc["AUC"],
+                marker_color="#45B7D1",
+                error_y=dict(
+                    type="data",
+                    symmetric=False,
+                    array=roc["CI Upper"] - roc["AUC"],
+                    arrayminus=roc["AUC"] - roc["CI Lower"],
+                ),
+            )
+        )
+        fig.add_hline(y=0.5, line_dash="dash", line_color="gray")
+        figures.append(
+            (
+                "ROC_AUC",
+                _layout(fig, title="AUC for Death (95% CI)", yaxis_range=[0, 1]),
+            )
+        )
+    if "correlation" in results:
+        matrix = results["correlation"]["pearson"].set_index("Variable")
+        fig = go.Figure(
+            go.Heatmap(
+                z=matrix.to_numpy(),
+                x=list(matrix.columns),
+                y=list(matrix.index),
+                zmin=-1,
+                zmax=1,
+                colorscale="RdBu_r",
+                text=np.round(matrix.to_numpy(), 2),
+                texttemplate="%{text}",
+            )
+        )
+        fig.update_layout(
+            title="Clustered Correlation Matrix",
+            height=700,
+            title_font=dict(size=30),
+            xaxis=dict(tickfont=dict(size=16)),
+            yaxis=dict(tickfont=dict(size=16), autorange="reversed"),
+        )
+        figures.append(("Correlation_Matrix", fig))
+    if "mortality" in results:
+        odds = results["mortality"]["odds_ratios"]
+        odds = odds[odds["Term"] != "Intercept"]
+        fig = go.Figure(
+            go.Scatter(
+                x=odds["Odds Ratio"],
+                y=odds["Term"],
+                mode="markers",
+                marker=dict(color="#DC143C", size=14),
+                error_x=dict(
+                    type="data",
+                    symmetric=False,
+                    array=odds["OR Upper"] - odds["Odds Ratio"],
+                    arrayminus=odds["Odds Ratio"] - odds["OR Lower"],
+                ),
+            )
+        )
+        fig.add_vline(x=1, line_dash="dash", line_color="gray")
+        _layout(fig, title="Adjusted Odds Ratios for Death")
+        fig.update_xaxes(type="log", title_text="Odds Ratio (log scale)")
+        figures.append(("Adjusted_Odds_Ratios", fig))
+    if "risk" in results:
+        calibration = results["risk"]["calibration"]
+        fig = go.Figure()
+        fig.add_trace(
+            go.Scatter(
+                x=[0, 1],
+                y=[0, 1],
+                mode="lines",
+                line=dict(color="gray", dash="dash"),
+                name="Perfect calibration",
+            )
+        )
+        fig.add_trace(
+            go.Scatter(
+                x=calibration["Predicted"],
+                y=calibration["Observed"],
+                mode="lines+markers",
+                marker=dict(color="#DC143C", size=14),
+                name="Out-of-fold risk groups",
+            )
+        )
+        _layout(fig, title="Risk Score: Predicted vs Observed Mortality")
+        fig.update_xaxes(range=[0, 1], title_text="Mean Predicted Risk")
+        fig.update_yaxes(range=[0, 1], title_text="Observed Death Rate")
+        figures.append(("Risk_Score_Calibration", fig))
+    return figures
+
+
+def figure_png(fig):
+    # PNG bytes, or None without a working image exporter (kaleido)
+    try:
+        return fig.to_image(format="png", width=1200, height=800, scale=2)
+    except Exception:
+        return None
+
+
+def write_tables(results, out_dir, formats=("json", "parquet")):
+    if "parquet" in formats:
+        table_dir = os.path.join(out_dir, "tables")
+        os.makedirs(table_dir, exist_ok=True)
+        for analysis, tables in results.items():
+            for name, table in tables.items():
+                table.to_parquet(
+                    os.path.join(table_dir, f"{analysis}__{name}.parquet"), index=False
+                )
+    if "json" in formats:
+        document = {
+            analysis: {
+                name: json.loads(table.to_json(orient="records"))
+                for name, table in tables.items()
+            }
+            for analysis, tables in results.items()
+        }
+        with open(os.path.join(out_dir, "results.json"), "w") as f:
+            json.dump(document, f, indent=1)
+
+
+def write_figures(figures, out_dir):
+    # {file name: PNG bytes or None}; every figure is also saved as HTML
+    figure_dir = os.path.join(out_dir, "figures")
+    os.makedirs(figure_dir, exist_ok=True)
+    images = {}
+    for filename, fig in figures:
+        fig.write_html(
+            os.path.join(figure_dir, f"{filename}.html"), include_plotlyjs="cdn"
+        )
+        images[filename] = figure_png(fig)
+        if images[filename] is not None:
+            with open(os.path.join(figure_dir, f"{filename}.png"), "wb") as f:
+                f.write(images[filename])
+    return images
+
+
+def _table_text(table):
+    shown = table.head(PDF_ROWS).to_string(
+        index=False, max_colwidth=40, float_format=lambda value: f"{value:.4g}"
+    )
+    if len(table) > PDF_ROWS:
+        shown += f"\n... {len(table) - PDF_ROWS:,} more rows in the table files"
+    return shown
+
+
+def write_pdf(site, results, images, path):
+    import fitz  # PyMuPDF
+
+    from pdf_borders import add_word_style_borders
+
+    # Landscape A4, monospaced tables shrunk to fit the page width
+    width, height, margin = 842, 595, 48
+    doc = fitz.open()
+    page = doc.new_page(width=width, height=height)
+    page.insert_text(
+        (margin, height / 2 - 20), f"Clinical outcomes report: {site}", fontsize=24
+    )
+    page.insert_text(
+        (margin, height / 2 + 12),
+        time.strftime("Generated %Y-%m-%d %H:%M"),
+        fontsize=12,
+    )
+
+    for analysis, tables in results.items():
+        for name, table in tables.items():
+            lines = _table_text(table).splitlines()
+            fontsize = min(
+                8.0,
+                max(4.0, (width - 2 * margin) / (0.6 * max(map(len, lines)))),
+            )
+            per_page = int((height - 2 * margin - 30) / (fontsize * 1.2))
+            for start in range(0, len(lines), per_page):
+                page = doc.new_page(width=width, height=height)
+                page.insert_text((margin, margin), f"{analysis}: {name}", fontsize=14)
+                page.insert_text(
+                    (margin, margin + 30),
+                    "\n".join(lines[start : start + per_page]),
+                    fontname="cour",
+                    fontsize=fontsize,
+                )
+
+    for filename, image in images.items():
+        if image is None:
+            continue
+        page = doc.new_page(width=width, height=height)
+        page.insert_image(
+            fitz.Rect(margin, margin, width - margin, height - margin), stream=image
+        )
+
+    unbordered = path + ".tmp"
+    doc.save(unbordered)
+    doc.close()
+    try:
+        add_word_style_borders(unbordered, path)
+    finally:
+        os.unlink(unbordered)
+
+
+def write_site_report(site, results, out_dir, formats=("json", "parquet"), pdf=True):
+    os.makedirs(out_dir, exist_ok=True)
+    write_tables(results, out_dir, formats)
+    images = write_figures(report_figures(results), out_dir)
+    if pdf:
+        write_pdf(site, results, images, os.path.join(out_dir, "report.pdf"))
+
+
+def site_name(path):
+    return os.path.splitext(os.path.basename(os.path.normpath(path)))[0]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run every dashboard analysis over cohort files and write "
+        "the results tables, figures and a bordered PDF report per site"
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="cohort CSVs or cohort store directories, one per site"
+    )
+    parser.add_argument("--out", default="reports", help="output directory")
+    parser.add_argument(
+        "--analyses",
+        nargs="+",
+        choices=list(ANALYSES),
+        default=list(ANALYSES),
+    )
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=["json", "parquet"],
+        default=["json", "parquet"],
+    )
+    parser.add_argument("--no-pdf", action="store_true")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    out_dirs = {
+        site_name(path): os.path.join(args.out, site_name(path)) for path in args.paths
+    }
+    if len(out_dirs) < len(args.paths):
+        parser.error("site names (file or directory names) must be unique")
+    stores = {}
+    for path in args.paths:
+        site = site_name(path)
+        os.makedirs(out_dirs[site], exist_ok=True)
+        stores[site] = site_store(path, out_dirs[site])
+
+    start = time.perf_counter()
+    results, timings = run_analyses(stores, args.analyses, args.workers)
+    for (site, name), seconds in timings.items():
+        print(f"{site:>20} {name:<12} {seconds:7.2f} s")
+    for site, site_results in results.items():
+        write_site_report(
+            site, site_results, out_dirs[site], args.formats, not args.no_pdf
+        )
+        print(f"Wrote {out_dirs[site]}")
+    print(f"Total {time.perf_counter() - start:.1f} s")
@@ -0,0 +1,399 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from batch_report import ANALYSES, report_figures
+from cohort_store import (
+    append_batch,
+    clean_cohort,
+    clear_store,
+    read_cohort,
+)
+from instrumentation import sampled_rss
+from synthetic_cohort import BATCH, build_store, write_csv
+
+# Benchmarks of the data pipeline, the statistics engines and the exporters
+# on synthetic cohorts (synthetic_cohort.py) of increasing size. Every case
+# runs --repeat times after an untimed setup; the median and minimum are
+# saved as JSON with the machine and library versions, and --baseline
+# compares the run against an earlier file, exiting non-zero when a case got
+# slower. Timings only compare on one machine: record the baseline there
+# (the results files are not tracked), and the comparison warns when the
+# machine or library versions differ. With --memory each case runs once
+# more to record its peak Python allocations (tracemalloc) and the growth of
+# the resident set size, which also counts Arrow, PyMuPDF and the image
+# exporter; a baseline with memory figures is then compared on the traced
+# peak as well.
+#
+#     python benchmark.py --sizes 1e2 1e3 1e4 1e5 --out benchmark.json
+#     python benchmark.py --out benchmark_baseline.json --memory
+#     python benchmark.py --baseline benchmark_baseline.json --memory
+#
+# Cases that would take minutes at a size (the permutation engines grow with
+# patients times resamples) are skipped above their row limit and recorded as skipped.
+
+SIZES = [100, 1_000, 10_000, 100_000]
+PDF_PAGES = [1, 10, 100]
+REPEAT = 3
+
+# A case regressed when its median is this many times the baseline's;
+# medians under the noise floor (seconds) are not compared
+TOLERANCE = 1.25
+NOISE_FLOOR = 0.01
+# Traced peaks under this many bytes are not compared
+MEMORY_FLOOR = 2**20
+
+# name, setup(csv_path, store_path) -> run arguments, run(*arguments), and
+# the largest cohort the case is run on (None: no limit)
+Case = namedtuple("Case", "name setup run max_rows")
+
+
+def _csv(csv_path, store_path):
+    return (csv_path,)
+
+
+def _store(csv_path, store_path):
+    return (store_path,)
+
+
+def _raw_frame(csv_path, store_path):
+    return (pd.read_csv(csv_path),)
+
+
+def _groups(csv_path, store_path, column="INITIAL LACTATE (clean)"):
+    # Initial lactate of the ALIVE and DEAD patients
+    data = read_cohort(store_path, [column, "CLINICAL OUTCOMES"]).dropna()
+    dead = (data["CLINICAL OUTCOMES"] == "DEAD").to_numpy()
+    values = data[column].to_numpy(dtype=np.float64)
+    return values[~dead], values[dead]
+
+
+def _ingest_paths(csv_path, store_path):
+    return csv_path, store_path + "-ingest"
+
+
+def _read_csv(csv_path):
+    for _ in pd.read_csv(csv_path, chunksize=BATCH):
+        pass
+
+
+def _ingest_csv(csv_path, store_path):
+    # ingest_csv in batches, so memory stays bounded at any size
+    clear_store(store_path)
+    for raw in pd.read_csv(csv_path, chunksize=BATCH):
+        append_batch(store_path, clean_cohort(raw))
+
+
+def _mann_whitney(alive, dead):
+    from rank_tests import mann_whitney
+
+    return mann_whitney(alive, dead)
+
+
+def _permutation_test(alive, dead):
+    from multiple_testing import TwoSampleFamily
+
+    return TwoSampleFamily(alive, dead).permutation_test()
+
+
+def _bootstrap_effects(alive, dead):
+    from effect_sizes import ContinuousEffects, effect_size_table
+
+    return effect_size_table(ContinuousEffects(alive, dead))
+
+
+def _roc_bootstrap(alive, dead):
+    from roc import roc_summary
+
+    values = np.concatenate([alive, dead])
+    positive = np.r_[np.zeros(len(alive), bool), np.ones(len(dead), bool)]
+    return roc_summary(values, positive)
+
+
+def _combined_family(csv_path, store_path):
+    from chunked import combined_family
+
+    return (combined_family(store_path),)
+
+
+def _max_t(family):
+    return family.max_t()
+
+
+def _figure_results(csv_path, store_path):
+    return (
+        {
+            name: ANALYSES[name](store_path)
+            for name in ["overview", "roc", "correlation", "mortality", "risk"]
+        },
+    )
+
+
+def cohort_cases():
+    # Cases run on every cohort size
+    cases = [
+        Case("csv_read", _csv, _read_csv, None),
+        Case("csv_ingest", _ingest_paths, _ingest_csv, None),
+        Case("clean_cohort", _raw_frame, clean_cohort, BATCH),
+    ]
+    # Each analysis page's computation, as run by the batch report
+    limits = {"tests": 10_000, "roc": 10_000, "correlation": 10_000}
+    for name, analysis in ANALYSES.items():
+        cases.append(Case(f"analysis:{name}", _store, analysis, limits.get(name)))
+    # The resampling engines on their own
+    cases += [
+        Case("mann_whitney", _groups, _mann_whitney, None),
+        Case("permutation_test", _groups, _permutation_test, 10_000),
+        Case("bootstrap_effects", _groups, _bootstrap_effects, None),
+        Case("roc_bootstrap", _groups, _roc_bootstrap, None),
+        Case("max_t", _combined_family, _max_t, 10_000),
+        Case("figures", _figure_results, report_figures, 10_000),
+    ]
+    return cases
+
+
+def _png_export(figures):
+    from dashboard.sidebar import fig_to_png
+
+    for _, fig in figures:
+        fig_to_png(fig)
+
+
+def _synthetic_pdf(path, pages):
+    import fitz  # PyMuPDF
+
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {number + 1}", fontsize=18)
+        page.insert_text((72, 110), "Lorem ipsum dolor sit amet. " * 2, fontsize=11)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def _add_borders(input_path, output_path):
+    from pdf_borders import add_word_style_borders
+
+    add_word_style_borders(input_path, output_path)
+
+
+def time_case(run, args, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(*args)
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def measure_memory(run, args):
+    # (peak traced bytes above the start, resident set size growth) over one
+    # more run. The process is warm by then, so freed memory the allocator
+    # kept makes the resident growth a lower bound.
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        with sampled_rss() as usage:
+            run(*args)
+        peak = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return peak, usage.growth
+
+
+def _record(case, rows, runs=None, skipped=None, memory=None):
+    record = {"case": case, "rows": rows}
+    if runs is not None:
+        record.update(
+            median=statistics.median(runs), min=min(runs), runs=runs, skipped=None
+        )
+    else:
+        record.update(median=None, min=None, runs=[], skipped=skipped)
+    peak, growth = memory or (None, None)
+    record.update(peak_bytes=peak, rss_growth_bytes=growth)
+    return record
+
+
+def run_benchmarks(
+    sizes=SIZES, pdf_pages=PDF_PAGES, repeat=REPEAT, cases=None, memory=False
+):
+    results = []
+
+    def report(record):
+        results.append(record)
+        shown = (
+            f"{record['median']:9.4f} s" if record["skipped"] is None else "  skipped"
+        )
+        rows = f"{record['rows']:>10,}" if record["rows"] is not None else " " * 10
+        if record["peak_bytes"] is not None:
+            shown += (
+                f" {record['peak_bytes'] / 2**20:9.1f} MB peak"
+                f" {record['rss_growth_bytes'] / 2**20:9.1f} MB resident"
+            )
+        print(f"{record['case']:<26}{rows} {shown}", flush=True)
+
+    def measure(name, rows, run, args):
+        runs = time_case(run, args, repeat)
+        return _record(name, rows, runs, memory=memory and measure_memory(run, args))
+
+    def selected(name):
+        return not cases or any(name.startswith(prefix) for prefix in cases)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in sizes:
+            csv_path = os.path.join(workdir, f"cohort-{rows}.csv")
+            store_path = os.path.join(workdir, f"store-{rows}")
+            write_csv(csv_path, rows)
+            build_store(store_path, rows)
+            for case in cohort_cases():
+                if not selected(case.name):
+                    continue
+                if case.max_rows is not None and rows > case.max_rows:
+                    report(_record(case.name, rows, skipped="above row limit"))
+                    continue
+                args = case.setup(csv_path, store_path)
+                report(measure(case.name, rows, case.run, args))
+
+        if selected("png_export"):
+            # Image export of the report figures; needs kaleido
+            store_path = build_store(os.path.join(workdir, "store-png"), 1_000)
+            figures = report_figures(_figure_results(None, store_path)[0])
+            try:
+                report(measure("png_export", None, _png_export, (figures,)))
+            except Exception as e:
+                report(_record("png_export", None, skipped=f"{type(e).__name__}: {e}"))
+
+        if selected("pdf_borders"):
+            for pages in pdf_pages:
+                input_path = _synthetic_pdf(
+                    os.path.join(workdir, f"doc-{pages}.pdf"), pages
+                )
+                output_path = os.path.join(workdir, f"bordered-{pages}.pdf")
+                report(
+                    measure(
+                        f"pdf_borders:{pages}_pages",
+                        None,
+                        _add_borders,
+                        (input_path, output_path),
+                    )
+                )
+    return results
+
+
+def environment():
+    import plotly
+
+    return {
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "plotly": plotly.__version__,
+    }
+
+
+def compare(results, baseline, tolerance=TOLERANCE, floor=NOISE_FLOOR, metric="median"):
+    # Rows of (case, rows, baseline, value, ratio, verdict) of metric
+    # ("median" seconds or "peak_bytes") for every case measured in both runs
+    worse, better = (
+        ("SLOWER", "faster") if metric == "median" else ("LARGER", "smaller")
+    )
+    before = {
+        (record["case"], record["rows"]): record.get(metric)
+        for record in baseline["results"]
+        if record.get(metric) is not None
+    }
+    rows = []
+    for record in results:
+        key = (record["case"], record["rows"])
+        if record.get(metric) is None or key not in before:
+            continue
+        ratio = record[metric] / before[key] if before[key] else float("inf")
+        if max(record[metric], before[key]) < floor:
+            verdict = "noise"
+        elif ratio > tolerance:
+            verdict = worse
+        elif ratio < 1 / tolerance:
+            verdict = better
+        else:
+            verdict = "same"
+        rows.append((*key, before[key], record[metric], ratio, verdict))
+    value = "Median" if metric == "median" else "Peak Bytes"
+    return pd.DataFrame(
+        rows, columns=["Case", "Rows", "Baseline", value, "Ratio", "Verdict"]
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the pipeline, statistics and exporters on "
+        "synthetic cohorts"
+    )
+    parser.add_argument(
+        "--sizes", nargs="+", type=float, default=SIZES, help="cohort sizes in rows"
+    )
+    parser.add_argument("--pdf-pages", nargs="+", type=int, default=PDF_PAGES)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument(
+        "--cases", nargs="+", help="only cases whose names start with these"
+    )
+    parser.add_argument("--out", default="benchmark.json")
+    parser.add_argument("--baseline", help="earlier results to compare against")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument(
+        "--memory", action="store_true", help="also record peak memory per case"
+    )
+    args = parser.parse_args()
+
+    results = run_benchmarks(
+        [int(size) for size in args.sizes],
+        args.pdf_pages,
+        args.repeat,
+        args.cases,
+        args.memory,
+    )
+    machine = environment()
+    with open(args.out, "w") as f:
+        json.dump({"environment": machine, "results": results}, f, indent=1)
+    print(f"Wrote {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        comparison = compare(results, baseline, args.tolerance)
+        print(f"\nAgainst {args.baseline} ({baseline['environment']['date']}):")
+        changed = [
+            key
+            for key, value in machine.items()
+            if key != "date" and baseline["environment"].get(key) != value
+        ]
+        if changed:
+            print(
+                f"Warning: the baseline was recorded with a different "
+                f"{', '.join(changed)}; its timings may not compare"
+            )
+        print(comparison.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+        regressed = (comparison["Verdict"] == "SLOWER").any()
+        memory = compare(
+            results, baseline, args.tolerance, MEMORY_FLOOR, metric="peak_bytes"
+        )
+        if len(memory):
+            print("\nPeak traced memory:")
+            print(memory.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+            regressed |= (memory["Verdict"] == "LARGER").any()
+        if regressed:
+            sys.exit(1)
@@ -0,0 +1,314 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+from scipy.stats import chi2_contingency, fisher_exact, kstwo
+
+from cohort_store import (
+    COMORBIDITY_MASK,
+    OUTCOMES,
+    UNSTABLE_CRITERIA,
+    CohortSummary,
+    clean_cohort,
+    has_comorbidity,
+    part_paths,
+    read_cohort,
+    unstable_hemodynamics,
+)
+from effect_sizes import (
+    ContinuousEffects,
+    OddsRatioEffect,
+    effect_row,
+    effect_size_table,
+)
+from rank_tests import asymptotic_pvalue
+
+# Out-of-core execution: cohort files are streamed in chunks, every chunk is
+# reduced to small mergeable partials (counts, contingency tables, moments,
+# per-value outcome counts) and only the partials are combined. Peak memory is
+# one chunk plus the partials, whatever the size of the registry.
+
+RANK_COLUMNS = [
+    "INITIAL LACTATE (clean)",
+    "LACTATE CLEARANCE (clean)",
+    "REPEAT LACTATE (clean)",
+    "CRP (clean)",
+    "AGE",
+]
+# Values of each rank column are rounded to this step before they are
+# counted: the precision the measurements are recorded at, and 0.01
+# percentage points for the derived clearance. The per-value counts then stay
+# bounded however many patients are streamed; a rank test moves only where
+# rounding merges values closer than a step.
+RESOLUTIONS = {
+    "INITIAL LACTATE (clean)": 0.1,
+    "LACTATE CLEARANCE (clean)": 0.01,
+    "REPEAT LACTATE (clean)": 0.1,
+    "CRP (clean)": 0.1,
+    "AGE": 1.0,
+}
+COMBINED_RANK_TESTS = {
+    "INITIAL LACTATE (clean)": "Initial Lactate",
+    "LACTATE CLEARANCE (clean)": "Lactate Clearance",
+    "REPEAT LACTATE (clean)": "Repeat Lactate",
+    "AGE": "Age",
+}
+COMBINED_FLAGS = ["CAD", "SHTN+T2DM", "Unstable Hemodynamics"]
+
+
+def iter_chunks(path, chunksize=100_000):
+    # Cleaned chunks from either a raw cohort CSV or a cohort store directory
+    if os.path.isdir(path):
+        for part in part_paths(path):
+            table = feather.read_table(part, memory_map=True)
+            for batch in table.to_batches(max_chunksize=chunksize):
+                yield batch.to_pandas()
+    else:
+        for raw in pd.read_csv(path, chunksize=chunksize):
+            yield clean_cohort(raw)
+
+
+class RankCounts:
+    # Per-value outcome counts for one variable. Merging chunks is a sum of
+    # counts, and rank statistics (midranks with ties, ECDFs) follow exactly
+    # from the merged table, so memory grows with the number of distinct
+    # values rather than the number of rows. A resolution rounds values
+    # first, which bounds that for continuous measurements; without one
+    # every distinct value is counted exactly.
+
+    def __init__(self, resolution=None):
+        self.resolution = resolution
+        self.counts = pd.DataFrame(columns=OUTCOMES, dtype=np.int64)
+
+    def update(self, values, outcome_codes):
+        values = np.asarray(values, dtype=np.float64)
+        keep = ~np.isnan(values) & (outcome_codes >= 0)
+        values, codes = values[keep], outcome_codes[keep]
+        if self.resolution:
+            values = np.round(values / self.resolution) * self.resolution
+        batch = (
+            pd.crosstab(values, codes)
+            .reindex(columns=range(len(OUTCOMES)), fill_value=0)
+            .set_axis(OUTCOMES, axis=1)
+        )
+        return self.merge_counts(batch)
+
+    def merge_counts(self, counts):
+        self.counts = self.counts.add(counts, fill_value=0).astype(np.int64)
+        return self
+
+    def merge(self, other):
+        return self.merge_counts(other.counts)
+
+    def _sorted_counts(self):
+        counts = self.counts.sort_index()
+        return counts["ALIVE"].to_numpy(), counts["DEAD"].to_numpy()
+
+    def mann_whitney(self):
+        # U for ALIVE vs DEAD from midranks of the merged counts, with the
+        # tie-corrected normal approximation
+        alive, dead = self._sorted_counts()
+        totals = alive + dead
+        n1, n2 = alive.sum(), dead.sum()
+        midranks = np.cumsum(totals) - (totals - 1) / 2
+        u1 = (alive * midranks).sum() - n1 * (n1 + 1) / 2
+        ties = float((totals**3 - totals).sum())
+        return float(u1), asymptotic_pvalue(u1, n1, n2, ties)
+
+    def effect_sizes(self):
+        # ALIVE vs DEAD from the per-value counts; no Hodges-Lehmann shift,
+        # as its pairs of distinct values are not bounded by the chunk size
+        counts = self.counts.sort_index()
+        values = counts.index.to_numpy(dtype=np.float64)
+        return ContinuousEffects(
+            values, values, counts["ALIVE"], counts["DEAD"], hodges_lehmann=False
+        )
+
+    def ks_2samp(self):
+        alive, dead = self._sorted_counts()
+        n1, n2 = alive.sum(), dead.sum()
+        d = np.abs(np.cumsum(alive) / n1 - np.cumsum(dead) / n2).max()
+        return float(d), float(kstwo.sf(d, np.round(n1 * n2 / (n1 + n2))))
+
+
+def contingency_test(table):
+    # Same rule as the dashboard: Fisher's exact if any cell < 5
+    if min(min(row) for row in table) < 5:
+        statistic, p_value = fisher_exact(table)
+        return "Fisher's Exact Test", statistic, p_value
+    statistic, p_value, _, _ = chi2_contingency(table)
+    return "Chi-square Test", statistic, p_value
+
+
+class ChunkedAnalysis:
+    # Mergeable partial results for every analysis page
+
+    def __init__(self, resolution=None):
+        # One resolution for every rank column, 0 for exact counts; by
+        # default each column's RESOLUTIONS step
+        self.summary = CohortSummary()
+        self.ranks = {
+            column: RankCounts(
+                RESOLUTIONS[column] if resolution is None else resolution
+            )
+            for column in RANK_COLUMNS
+        }
+        self.hemodynamics = np.zeros((2, len(OUTCOMES)), dtype=np.int64)
+        self.shtn_and_t2dm = np.zeros((2, len(OUTCOMES)), dtype=np.int64)
+
+    def update(self, chunk):
+        self.summary.update(chunk)
+        codes = chunk["CLINICAL OUTCOMES"].cat.codes.to_numpy()
+        for column, ranks in self.ranks.items():
+            ranks.update(chunk[column].to_numpy(dtype=np.float64), codes)
+
+        # [flagged, not flagged] x outcome, matching the page tables
+        known = codes >= 0
+        vitals = chunk[list(UNSTABLE_CRITERIA)].notna().all(axis=1).to_numpy()
+        stable = ~unstable_hemodynamics(chunk).to_numpy()
+        rows = known & vitals
+        self.hemodynamics += np.bincount(
+            stable[rows] * len(OUTCOMES) + codes[rows], minlength=4
+        ).reshape(2, 2)
+        both = (
+            has_comorbidity(chunk, "SHTN") & has_comorbidity(chunk, "T2DM")
+        ).to_numpy()
+        self.shtn_and_t2dm += np.bincount(
+            ~both[known] * len(OUTCOMES) + codes[known], minlength=4
+        ).reshape(2, 2)
+        return self
+
+    def merge(self, other):
+        self.summary.merge(other.summary)
+        for column, ranks in self.ranks.items():
+            ranks.merge(other.ranks[column])
+        self.hemodynamics += other.hemodynamics
+        self.shtn_and_t2dm += other.shtn_and_t2dm
+        return self
+
+    def rank_tests(self):
+        rows = []
+        for column, ranks in self.ranks.items():
+            u_stat, p_mw = ranks.mann_whitney()
+            ks_stat, p_ks = ranks.ks_2samp()
+            alive, dead = self.summary.group_stats(column)
+            rows.append(
+                {
+                    "Variable": column,
+                    "Mean (ALIVE)": alive.mean,
+                    "Mean (DEAD)": dead.mean,
+                    "U-Statistic": u_stat,
+                    "Mann-Whitney P": p_mw,
+                    "KS Statistic": ks_stat,
+                    "KS P": p_ks,
+                }
+            )
+        return pd.DataFrame(rows)
+
+    def contingency_tables(self):
+        return {
+            "CAD": self.summary.comorbidity_table("CAD"),
+            "SHTN+T2DM": self.shtn_and_t2dm.tolist(),
+            "Unstable Hemodynamics": self.hemodynamics.tolist(),
+        }
+
+    def contingency_tests(self):
+        rows = []
+        for name, table in self.contingency_tables().items():
+            test_name, statistic, p_value = contingency_test(table)
+            rows.append(
+                {
+                    "Comparison": f"{name} vs Outcomes",
+                    "Test Type": test_name,
+                    "Statistic": statistic,
+                    "P-Value": p_value,
+                }
+            )
+        return pd.DataFrame(rows)
+
+    def combined_results(self):
+        # Rows of the Combined Analysis "Statistical Test Results" table
+        rows, effects = [], []
+        for column, label in COMBINED_RANK_TESTS.items():
+            u_stat, p_value = self.ranks[column].mann_whitney()
+            rows.append(
+                [f"{label} vs Outcomes", "Mann-Whitney U (asymptotic)", u_stat, p_value]
+            )
+            effects.append(
+                effect_row(
+                    effect_size_table(self.ranks[column].effect_sizes()),
+                    "Cliff's Delta",
+                )
+            )
+        for name, table in self.contingency_tables().items():
+            _, statistic, p_value = contingency_test(table)
+            rows.append(
+                [f"{name} vs Outcomes", "Fisher/Chi-square", statistic, p_value]
+            )
+            (flag_alive, flag_dead), (other_alive, other_dead) = table
+            effects.append(
+                effect_row(
+                    effect_size_table(
+                        OddsRatioEffect(flag_dead, flag_alive, other_dead, other_alive)
+                    ),
+                    "Odds Ratio",
+                )
+            )
+        results = pd.DataFrame(
+            rows, columns=["Test", "Test Type", "Statistic", "P-Value"]
+        )
+        results["Significant (α=0.05)"] = np.where(
+            results["P-Value"] < 0.05, "Yes", "No"
+        )
+        return pd.concat([results, pd.DataFrame(effects)], axis=1)
+
+
+def combined_family(store_path):
+    # The Combined Analysis tests as one in-memory max-T family, every
+    # variable tested on the same permutations of the outcome
+    from multiple_testing import OutcomeFamily
+    from stratified import flag
+
+    data = read_cohort(
+        store_path,
+        list(COMBINED_RANK_TESTS)
+        + [COMORBIDITY_MASK]
+        + list(UNSTABLE_CRITERIA)
+        + ["CLINICAL OUTCOMES"],
+    )
+    data = data[data["CLINICAL OUTCOMES"].notna()]
+    family = OutcomeFamily(data["CLINICAL OUTCOMES"] == "DEAD")
+    for column in COMBINED_RANK_TESTS:
+        family.add_continuous(data[column])
+    for name in COMBINED_FLAGS:
+        family.add_flag(flag(data, name))
+    return family
+
+
+def analyze(path, chunksize=100_000, resolution=None):
+    analysis = ChunkedAnalysis(resolution)
+    for chunk in iter_chunks(path, chunksize):
+        analysis.update(chunk)
+    return analysis
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run the dashboard tests over a cohort file chunk by chunk"
+    )
+    parser.add_argument("path", help="cohort CSV or cohort store directory")
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument(
+        "--resolution",
+        type=float,
+        default=None,
+        help="rounding step for every rank column (0: exact counts; "
+        "default: each column's recorded precision)",
+    )
+    args = parser.parse_args()
+    result = analyze(args.path, args.chunksize, args.resolution)
+    print(f"Patients: {result.summary.rows}")
+    print(result.rank_tests().to_string(index=False))
+    print(result.contingency_tests().to_string(index=False))
@@ -0,0 +1,95 @@
+import threading
+
+import pandas as pd
+
+from cohort_store import RAW_TEXT, STORE_PATH, read_table, store_version
+
+
+class Cohort:
+    # Compact in-memory view over a cohort store. Columns are pulled from the
+    # memory-mapped store the first time they are asked for and then kept in
+    # their typed form (float32 measurements, categoricals, bitmask), so
+    # resident memory follows the columns pages actually use. Free-text
+    # columns are only loaded on demand and can be dropped again. Parts
+    # appended to the store after loading are picked up by refresh(), which
+    # reads only the new parts; a rebuilt store drops everything loaded.
+
+    def __init__(self, store_path=STORE_PATH):
+        self.store_path = store_path
+        self._version = store_version(store_path)
+        self._columns = {}
+        self._lock = threading.Lock()
+
+    @property
+    def _parts(self):
+        return [path for path, _ in self._version]
+
+    def _load(self, names):
+        missing = [name for name in dict.fromkeys(names) if name not in self._columns]
+        if missing:
+            frame = read_table(self.store_path, missing, self._parts).to_pandas()
+            for name in missing:
+                self._columns[name] = frame[name]
+
+    def refresh(self):
+        with self._lock:
+            version = store_version(self.store_path)
+            known = len(self._version)
+            if version[:known] != self._version:
+                self._columns = {}
+                self._version = version
+                return True
+            new_parts = [path for path, _ in version[known:]]
+            if not new_parts:
+                return False
+            if self._columns:
+                batch = read_table(
+                    self.store_path, list(self._columns), new_parts
+                ).to_pandas()
+                for name, series in self._columns.items():
+                    self._columns[name] = pd.concat(
+                        [series, batch[name]], ignore_index=True
+                    )
+            self._version = version
+            return True
+
+    def columns(self, *names):
+        self.refresh()
+        with self._lock:
+            self._load(names)
+            return pd.DataFrame(
+                {name: self._columns[name] for name in names}, copy=False
+            )
+
+    def raw_text(self, column):
+        if column not in RAW_TEXT:
+            raise KeyError(f"{column} is not a raw text column")
+        return self.columns(column)[column]
+
+    def drop_raw_text(self):
+        with self._lock:
+            for name in RAW_TEXT:
+                self._columns.pop(name, None)
+
+    def __len__(self):
+        with self._lock:
+            if not self._columns:
+                self._load(["CLINICAL OUTCOMES"])
+            return len(next(iter(self._columns.values())))
+
+    def memory_report(self):
+        with self._lock:
+            loaded = dict(self._columns)
+        rows = [
+            {
+                "Column": name,
+                "Dtype": str(series.dtype),
+                "Bytes": int(series.memory_usage(index=False, deep=True)),
+                "Raw Text": name in RAW_TEXT,
+            }
+            for name, series in loaded.items()
+        ]
+        report = pd.DataFrame(rows, columns=["Column", "Dtype", "Bytes", "Raw Text"])
+        n = max(len(self), 1)
+        report["Bytes per Patient"] = (report["Bytes"] / n).round(2)
+        return report.sort_values("Bytes", ascending=False, ignore_index=True)
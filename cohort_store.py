@@ -0,0 +1,406 @@
+import argparse
+import glob
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from accumulators import SummaryStats
+
+# Default locations of the source spreadsheet export and the typed store
+CSV_PATH = "_Thesis - Sheet1.csv"
+STORE_PATH = "cohort_store"
+
+OUTCOMES = ["ALIVE", "DEAD"]
+SEXES = ["MALE", "FEMALE"]
+AGE_GROUPS = ["20-40", "41-60", "61-80", ">80"]
+AGE_BINS = [0, 40, 60, 80, 100]
+
+# Unit-suffixed text columns and the float32 column each one is parsed into
+MEASUREMENTS = {
+    "INITIAL LACTATE": ("INITIAL LACTATE (clean)", r"([\d.]+)"),
+    "REPEAT LACTATE": ("REPEAT LACTATE (clean)", r"([\d.]+)"),
+    "LACTATE CLEARANCE": ("LACTATE CLEARANCE (recorded)", r"(-?[\d.]+)"),
+    "CRP": ("CRP (clean)", r"([\d.]+)"),
+    "SBP": ("SBP_clean", r"(\d+)"),
+    "DBP": ("DBP_clean", r"(\d+)"),
+    "SPO2%": ("SPO2_clean", r"(\d+)"),
+    "RR": ("RR_clean", r"(\d+)"),
+    "CBG": ("CBG_clean", r"(\d+)"),
+    "TEMPERATURE": ("TEMPERATURE_clean", r"([\d.]+)"),
+    "HR": ("HR_clean", r"(\d+)"),
+    "UREA": ("UREA_clean", r"([\d.]+)"),
+    "CREATININE": ("CREATININE_clean", r"([\d.]+)"),
+}
+
+# Clearance (%) is derived from the cleaned lactate columns rather than the
+# recorded percentage text; rows where the two disagree by more than the
+# tolerance (percentage points; recorded values are often whole percents)
+# are flagged
+CLEARANCE = "LACTATE CLEARANCE (clean)"
+CLEARANCE_RECORDED = "LACTATE CLEARANCE (recorded)"
+CLEARANCE_MISMATCH = "CLEARANCE MISMATCH"
+CLEARANCE_TOLERANCE = 1.0
+
+# Comorbidities tracked in the K/C/O bitmask. Matching is a case-insensitive
+# substring test, the same rule the dashboard pages use for CAD and SHTN/T2DM.
+COMORBIDITIES = [
+    "CKD",
+    "SHTN",
+    "T2DM",
+    "CAD",
+    "APE",
+    "CLD",
+    "HF",
+    "CVA",
+    "HYPOTHYROID",
+    "ANEMIA",
+]
+COMORBIDITY_MASK = "COMORBIDITY MASK"
+
+# Patients are classed as hemodynamically unstable if ANY vital is below its
+# threshold
+UNSTABLE_CRITERIA = {
+    "SBP_clean": 120,
+    "DBP_clean": 80,
+    "SPO2_clean": 90,
+    "CBG_clean": 75,
+    "HR_clean": 45,
+}
+
+# Free-text columns carried through unchanged for display only
+RAW_TEXT = ["NAME", "PID NO", "COMPLAINTS", "K/C/O", "SBP/DBP"] + list(MEASUREMENTS)
+
+
+def comorbidity_bit(name):
+    return 1 << COMORBIDITIES.index(name)
+
+
+def has_comorbidity(df, name):
+    return (df[COMORBIDITY_MASK] & comorbidity_bit(name)) != 0
+
+
+def unstable_hemodynamics(df, criteria=UNSTABLE_CRITERIA):
+    unstable = np.zeros(len(df), dtype=bool)
+    for column, threshold in criteria.items():
+        unstable |= (df[column] < threshold).to_numpy(dtype=bool)
+    return pd.Series(unstable, index=df.index)
+
+
+def derive_clearance(cohort):
+    # (initial - repeat) / initial in one vectorized pass over the cleaned
+    # lactate arrays, instead of per-row parsing of the recorded text
+    initial = cohort["INITIAL LACTATE (clean)"].to_numpy()
+    repeat = cohort["REPEAT LACTATE (clean)"].to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        clearance = np.where(initial > 0, (initial - repeat) / initial * 100, np.nan)
+    recorded = cohort[CLEARANCE_RECORDED].to_numpy()
+    cohort[CLEARANCE] = clearance.astype("float32")
+    cohort[CLEARANCE_MISMATCH] = np.abs(clearance - recorded) > CLEARANCE_TOLERANCE
+    return cohort
+
+
+def clean_cohort(raw):
+    # Turn a raw spreadsheet frame into the typed store layout
+    out = pd.DataFrame(index=raw.index)
+    out["AGE"] = pd.to_numeric(raw["AGE"], errors="coerce").astype("float32")
+    out["SEX"] = pd.Categorical(
+        raw["SEX"].astype("string").str.strip().str.upper(), categories=SEXES
+    )
+    out["CLINICAL OUTCOMES"] = pd.Categorical(
+        raw["CLINICAL OUTCOMES"].astype("string").str.strip().str.upper(),
+        categories=OUTCOMES,
+    )
+    out["Age_Group"] = pd.cut(out["AGE"], bins=AGE_BINS, labels=AGE_GROUPS, right=True)
+
+    for source, (target, pattern) in MEASUREMENTS.items():
+        out[target] = (
+            raw[source]
+            .astype("string")
+            .str.extract(pattern, expand=False)
+            .astype("float32")
+        )
+    derive_clearance(out)
+
+    kco = raw["K/C/O"].astype("string").str.upper().fillna("")
+    mask = np.zeros(len(raw), dtype=np.uint16)
+    for i, name in enumerate(COMORBIDITIES):
+        flags = kco.str.contains(name, regex=False).to_numpy(dtype=np.uint16)
+        mask |= flags << np.uint16(i)
+    out[COMORBIDITY_MASK] = mask
+
+    for column in RAW_TEXT:
+        out[column] = raw[column].astype("string")
+    return out
+
+
+def part_paths(store_path):
+    return sorted(glob.glob(os.path.join(store_path, "part-*.feather")))
+
+
+def _summary_path(store_path):
+    return os.path.join(store_path, "summary.json")
+
+
+# Columns with moments and a quantile sketch kept per outcome in the summary
+STATS_COLUMNS = ["AGE"] + [
+    CLEARANCE if target == CLEARANCE_RECORDED else target
+    for target, _ in MEASUREMENTS.values()
+]
+
+# Bumped whenever the summary layout changes; older files are rebuilt
+SUMMARY_VERSION = 3
+
+# Bumped whenever clean_cohort changes the part layout; stored in each
+# part's schema metadata so stale stores can be detected and rebuilt
+STORE_LAYOUT = b"2"
+
+# Schema metadata marking parts that were generated rather than recorded
+# (synthetic_cohort.py), so that they are never mistaken for patient data
+SYNTHETIC = b"synthetic"
+
+
+class CohortSummary:
+    # Group counts, contingency tables and per-outcome summary statistics
+    # (exact moments plus a quantile sketch) for a store.
+    # Each appended batch is folded in on its own, so keeping the summary
+    # current costs time proportional to the batch, not the whole history.
+
+    def __init__(self):
+        self.rows = 0
+        self.outcomes = np.zeros(len(OUTCOMES), dtype=np.int64)
+        self.sex = np.zeros((len(SEXES), len(OUTCOMES)), dtype=np.int64)
+        self.age_groups = np.zeros((len(AGE_GROUPS), len(OUTCOMES)), dtype=np.int64)
+        # comorbidity x [present, absent] x outcome
+        self.comorbidities = np.zeros(
+            (len(COMORBIDITIES), 2, len(OUTCOMES)), dtype=np.int64
+        )
+        self.stats = {
+            (column, outcome): SummaryStats()
+            for column in STATS_COLUMNS
+            for outcome in OUTCOMES
+        }
+
+    def update(self, cohort):
+        self.rows += len(cohort)
+        outcome = cohort["CLINICAL OUTCOMES"].cat.codes.to_numpy()
+        known = outcome >= 0
+        outcome = outcome[known]
+        n_out = len(OUTCOMES)
+        self.outcomes += np.bincount(outcome, minlength=n_out)
+
+        for table, column in ((self.sex, "SEX"), (self.age_groups, "Age_Group")):
+            codes = cohort[column].cat.codes.to_numpy()[known]
+            keep = codes >= 0
+            table += np.bincount(
+                codes[keep] * n_out + outcome[keep], minlength=table.size
+            ).reshape(table.shape)
+
+        mask = cohort[COMORBIDITY_MASK].to_numpy()[known]
+        for i in range(len(COMORBIDITIES)):
+            absent = ((mask >> i) & 1) == 0
+            self.comorbidities[i] += np.bincount(
+                absent * n_out + outcome, minlength=2 * n_out
+            ).reshape(2, n_out)
+
+        for column in STATS_COLUMNS:
+            values = cohort[column].to_numpy(dtype=np.float64)[known]
+            for code, name in enumerate(OUTCOMES):
+                self.stats[(column, name)].update(values[outcome == code])
+        return self
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.outcomes += other.outcomes
+        self.sex += other.sex
+        self.age_groups += other.age_groups
+        self.comorbidities += other.comorbidities
+        for key, stats in other.stats.items():
+            self.stats[key].merge(stats)
+        return self
+
+    def outcome_count(self, outcome):
+        return int(self.outcomes[OUTCOMES.index(outcome)])
+
+    def sex_count(self, sex):
+        return int(self.sex[SEXES.index(sex)].sum())
+
+    def age_group_counts(self):
+        return pd.Series(
+            self.age_groups.sum(axis=1), index=pd.Index(AGE_GROUPS, name="Age_Group")
+        )
+
+    def age_outcome_counts(self):
+        return (
+            pd.DataFrame(self.age_groups, index=AGE_GROUPS, columns=OUTCOMES)
+            .rename_axis(index="Age_Group", columns="CLINICAL OUTCOMES")
+            .stack()
+            .reset_index(name="Count")
+        )
+
+    def group_stats(self, column):
+        # (ALIVE, DEAD) summary statistics for one column
+        return tuple(self.stats[(column, outcome)] for outcome in OUTCOMES)
+
+    def comorbidity_table(self, name):
+        # [[with_alive, with_dead], [without_alive, without_dead]]
+        return self.comorbidities[COMORBIDITIES.index(name)].tolist()
+
+    def to_dict(self):
+        return {
+            "rows": self.rows,
+            "outcomes": self.outcomes.tolist(),
+            "sex": self.sex.tolist(),
+            "age_groups": self.age_groups.tolist(),
+            "comorbidities": self.comorbidities.tolist(),
+            "version": SUMMARY_VERSION,
+            "stats": [
+                [column, outcome, stats.to_dict()]
+                for (column, outcome), stats in self.stats.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        summary = cls()
+        summary.rows = data["rows"]
+        for name in ("outcomes", "sex", "age_groups", "comorbidities"):
+            setattr(summary, name, np.array(data[name], dtype=np.int64))
+        for column, outcome, stats in data["stats"]:
+            summary.stats[(column, outcome)] = SummaryStats.from_dict(stats)
+        return summary
+
+
+def rebuild_summary(store_path=STORE_PATH):
+    # Full rescan, part by part; only needed for stores written before the
+    # current summary layout
+    summary = CohortSummary()
+    for part in part_paths(store_path):
+        summary.update(feather.read_table(part, memory_map=True).to_pandas())
+    if summary.rows:
+        save_summary(store_path, summary)
+    return summary
+
+
+def load_summary(store_path=STORE_PATH):
+    path = _summary_path(store_path)
+    if not os.path.exists(path):
+        return rebuild_summary(store_path)
+    with open(path) as f:
+        data = json.load(f)
+    if data.get("version") != SUMMARY_VERSION:
+        return rebuild_summary(store_path)
+    return CohortSummary.from_dict(data)
+
+
+def save_summary(store_path, summary):
+    path = _summary_path(store_path)
+    with open(path + ".tmp", "w") as f:
+        json.dump(summary.to_dict(), f)
+    os.replace(path + ".tmp", path)
+
+
+def write_part(store_path, cohort, index=None, source=None):
+    # Parts are uncompressed Arrow IPC files so reads can be memory-mapped;
+    # index defaults to the next free part number, and source (SYNTHETIC)
+    # is stamped in the part's schema metadata
+    os.makedirs(store_path, exist_ok=True)
+    if index is None:
+        index = len(part_paths(store_path))
+    path = os.path.join(store_path, f"part-{index:05d}.feather")
+    table = pa.Table.from_pandas(cohort, preserve_index=False)
+    metadata = {**(table.schema.metadata or {}), b"cohort_layout": STORE_LAYOUT}
+    if source is not None:
+        metadata[b"cohort_source"] = source
+    table = table.replace_schema_metadata(metadata)
+    feather.write_feather(table, path, compression="uncompressed")
+    return path
+
+
+def append_batch(store_path, cohort):
+    # Add a cleaned batch as a new part and fold it into the stored summary
+    if part_paths(store_path) and not store_is_current(store_path):
+        raise ValueError(
+            f"{store_path} was written by an older clean_cohort; rebuild it "
+            "with ingest_csv before appending"
+        )
+    summary = load_summary(store_path).update(cohort)
+    path = write_part(store_path, cohort)
+    save_summary(store_path, summary)
+    return path
+
+
+def append_csv(csv_path, store_path=STORE_PATH):
+    return append_batch(store_path, clean_cohort(pd.read_csv(csv_path)))
+
+
+def clear_store(store_path=STORE_PATH):
+    # Remove every part and the summary, leaving an empty store
+    for path in part_paths(store_path) + [_summary_path(store_path)]:
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def ingest_csv(csv_path, store_path=STORE_PATH):
+    # Replace the store with a freshly parsed copy of csv_path
+    clear_store(store_path)
+    return append_csv(csv_path, store_path)
+
+
+def store_version(store_path=STORE_PATH):
+    # Changes whenever a part is added or rewritten; used as a cache key
+    return tuple((p, os.stat(p).st_mtime_ns) for p in part_paths(store_path))
+
+
+def store_is_current(store_path=STORE_PATH):
+    parts = part_paths(store_path)
+    if not parts:
+        return False
+    schema = pa.ipc.open_file(pa.memory_map(parts[0])).schema
+    return (schema.metadata or {}).get(b"cohort_layout") == STORE_LAYOUT
+
+
+def store_is_synthetic(store_path=STORE_PATH):
+    # True if any part of the store was generated by synthetic_cohort.py
+    return any(
+        (pa.ipc.open_file(pa.memory_map(part)).schema.metadata or {}).get(
+            b"cohort_source"
+        )
+        == SYNTHETIC
+        for part in part_paths(store_path)
+    )
+
+
+def read_table(store_path=STORE_PATH, columns=None, parts=None):
+    tables = [
+        feather.read_table(path, columns=columns, memory_map=True)
+        for path in (part_paths(store_path) if parts is None else parts)
+    ]
+    if not tables:
+        raise FileNotFoundError(f"No cohort store found at {store_path}")
+    return pa.concat_tables(tables)
+
+
+def read_cohort(store_path=STORE_PATH, columns=None):
+    return read_table(store_path, columns).to_pandas()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert a cohort CSV into the typed columnar store"
+    )
+    parser.add_argument("csv", nargs="?", default=CSV_PATH)
+    parser.add_argument("store", nargs="?", default=STORE_PATH)
+    parser.add_argument(
+        "--append",
+        action="store_true",
+        help="add the CSV as a new admission batch instead of rebuilding",
+    )
+    args = parser.parse_args()
+    if args.append:
+        print(f"Appended {append_csv(args.csv, args.store)}")
+    else:
+        print(f"Wrote {ingest_csv(args.csv, args.store)}")
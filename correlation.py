@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+from scipy.cluster.hierarchy import leaves_list, linkage
+from scipy.spatial.distance import squareform
+from scipy.stats import t
+
+# Correlation matrices over every numeric column at once, with pairwise
+# complete observations. With X the values (NaN as 0) and M the 0/1 known
+# mask, every pairwise count, sum, sum of squares and cross product is one
+# of four matrix products (M'M, X'M, (X^2)'M, X'X), accumulated over row
+# blocks so memory stays at one block whatever the number of rows.
+#
+# Spearman is Pearson on ranks, each column ranked once over its known
+# values; point-biserial correlations with the outcome are Pearson against a
+# 0/1 death indicator carried as one more column.
+
+OUTCOME = "DEAD"
+
+# Rows per block of the accumulated matrix products
+ROW_BLOCK = 2**16
+
+# Permutation p-values are used up to this many rows times permutations;
+# above it the t distribution is exact enough and far cheaper
+PERMUTATION_BUDGET = 2**27
+PERMUTATIONS = 1000
+
+
+def _mask_product(known, values):
+    # known.T @ values for a 0/1 mask; columns with no missing rows in the
+    # block contribute plain column sums, so only the incomplete ones cost a
+    # matrix product
+    result = np.tile(values.sum(axis=0), (known.shape[1], 1))
+    incomplete = np.flatnonzero(~known.all(axis=0))
+    if len(incomplete):
+        result[incomplete] = known[:, incomplete].T.astype(np.float64) @ values
+    return result
+
+
+def _moments(left, right):
+    # Pairwise complete (n, sum_left, sum_right, sum_sq_left, sum_sq_right,
+    # cross) matrices between the columns of two equally long arrays
+    symmetric = left is right
+    shape = (left.shape[1], right.shape[1])
+    n, sum_l, sum_r, sq_l, sq_r, cross = (np.zeros(shape) for _ in range(6))
+    for start in range(0, len(left), ROW_BLOCK):
+        a = left[start : start + ROW_BLOCK].astype(np.float64)
+        known_a = ~np.isnan(a)
+        a[~known_a] = 0.0
+        if symmetric:
+            b, known_b = a, known_a
+        else:
+            b = right[start : start + ROW_BLOCK].astype(np.float64)
+            known_b = ~np.isnan(b)
+            b[~known_b] = 0.0
+        n += _mask_product(known_a, known_b.astype(np.float64))
+        sum_l += _mask_product(known_b, a).T
+        sq_l += _mask_product(known_b, a * a).T
+        if not symmetric:
+            sum_r += _mask_product(known_a, b)
+            sq_r += _mask_product(known_a, b * b)
+        cross += a.T @ b
+    if symmetric:
+        sum_r, sq_r = sum_l.T, sq_l.T
+    return n, sum_l, sum_r, sq_l, sq_r, cross
+
+
+def _pearson(left, right):
+    n, sum_l, sum_r, sq_l, sq_r, cross = _moments(left, right)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        covariance = n * cross - sum_l * sum_r
+        scale = np.sqrt((n * sq_l - sum_l**2) * (n * sq_r - sum_r**2))
+        r = np.clip(covariance / scale, -1.0, 1.0)
+    return np.where(n > 2, r, np.nan), n
+
+
+def _ranks(values):
+    # Average ranks over each column's known values, NaN kept. One sort per
+    # column, on the known values only (sorting around NaNs is several times
+    # slower); tied runs get the mean of their positions.
+    columns = np.ascontiguousarray(values.T)
+    ranks = np.full(columns.shape, np.nan, dtype=columns.dtype)
+    for column, out in zip(columns, ranks):
+        known = np.flatnonzero(~np.isnan(column))
+        if len(known) == len(column):
+            known = slice(None)
+        order = np.argsort(column[known])
+        ordered = column[known][order]
+        boundary = np.r_[True, ordered[1:] != ordered[:-1]]
+        starts = np.flatnonzero(boundary)
+        ends = np.r_[starts[1:], len(ordered)]
+        average = ((starts + ends + 1) / 2).astype(columns.dtype)
+        ranked = np.empty(len(ordered), dtype=columns.dtype)
+        ranked[order] = average[np.cumsum(boundary) - 1]
+        out[known] = ranked
+    return ranks.T
+
+
+def _t_pvalues(r, n):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        statistic = r * np.sqrt((n - 2) / (1 - r**2))
+        return 2 * t.sf(np.abs(statistic), n - 2)
+
+
+def _permutation_pvalues(values, r, n_perm, seed):
+    # Every pair tested on the same permutations: one row permutation of
+    # the right-hand copy gives a null replicate of the whole matrix
+    rng = np.random.default_rng(seed)
+    exceed = np.zeros(r.shape)
+    for _ in range(n_perm):
+        permuted, _ = _pearson(values, values[rng.permutation(len(values))])
+        exceed += np.abs(permuted) >= np.abs(r) - 1e-12
+    return (exceed + 1) / (n_perm + 1)
+
+
+class CorrelationMatrix:
+    # Pearson and Spearman matrices (with pairwise counts and p-values) over
+    # the given columns plus the outcome indicator
+
+    def __init__(self, df, columns, n_perm=PERMUTATIONS, seed=0):
+        self.columns = list(columns) + [OUTCOME]
+        outcome = df["CLINICAL OUTCOMES"]
+        dead = np.where(outcome.isna(), np.nan, outcome == OUTCOME)
+        # float32 keeps the copy small and represents every (half) rank
+        # exactly below 2**23 rows; products are taken in float64 per block
+        dtype = np.float32 if len(df) < 2**23 else np.float64
+        values = np.column_stack(
+            [df[column].to_numpy(dtype=dtype) for column in columns]
+            + [dead.astype(dtype)]
+        )
+        ranks = _ranks(values)
+
+        self.pearson, self.n = _pearson(values, values)
+        self.spearman, _ = _pearson(ranks, ranks)
+        if n_perm and len(values) * n_perm <= PERMUTATION_BUDGET:
+            self.method = f"permutation ({n_perm} permutations)"
+            self.pearson_p = _permutation_pvalues(values, self.pearson, n_perm, seed)
+            self.spearman_p = _permutation_pvalues(ranks, self.spearman, n_perm, seed)
+        else:
+            self.method = "t distribution"
+            self.pearson_p = _t_pvalues(self.pearson, self.n)
+            self.spearman_p = _t_pvalues(self.spearman, self.n)
+
+    def frame(self, kind="pearson"):
+        matrix = self.pearson if kind == "pearson" else self.spearman
+        return pd.DataFrame(matrix, index=self.columns, columns=self.columns)
+
+    def pvalues(self, kind="pearson"):
+        matrix = self.pearson_p if kind == "pearson" else self.spearman_p
+        return pd.DataFrame(matrix, index=self.columns, columns=self.columns)
+
+    def clustered_order(self, kind="pearson"):
+        # Average-linkage clustering on 1 - |r|, so strongly related
+        # variables sit together whatever the sign
+        matrix = np.nan_to_num(self.pearson if kind == "pearson" else self.spearman)
+        distance = 1 - np.abs(matrix)
+        np.fill_diagonal(distance, 0.0)
+        distance = (distance + distance.T) / 2
+        if len(distance) < 3:
+            return list(self.columns)
+        order = leaves_list(linkage(squareform(distance, checks=False), "average"))
+        return [self.columns[i] for i in order]
+
+    def outcome_table(self):
+        # Point-biserial (and Spearman) correlation of every column with death
+        last = len(self.columns) - 1
+        return pd.DataFrame(
+            {
+                "Variable": self.columns[:-1],
+                "Point-biserial r": self.pearson[:-1, last],
+                "P-Value": self.pearson_p[:-1, last],
+                "Spearman rho": self.spearman[:-1, last],
+                "Spearman P": self.spearman_p[:-1, last],
+                "N": self.n[:-1, last].astype(np.int64),
+            }
+        )
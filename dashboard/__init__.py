@@ -0,0 +1,18 @@
+# Pages in navigation order: (title, script under dashboard/pages, icon). The
+# titles are the analysis names used for page columns and graph downloads.
+PAGES = [
+    ("Overview", "overview.py", "📊"),
+    ("Initial Lactate Analysis", "initial_lactate.py", "🧪"),
+    ("Lactate Clearance Analysis", "lactate_clearance.py", "🔄"),
+    ("Repeat Lactate Analysis", "repeat_lactate.py", "🔁"),
+    ("CRP Analysis", "crp.py", "🔬"),
+    ("SEPSIS Lactate Clearance Analysis", "sepsis_clearance.py", "🦠"),
+    ("Age Analysis", "age.py", "👥"),
+    ("CAD Analysis", "cad.py", "❤️"),
+    ("SHTN+T2DM Analysis", "shtn_t2dm.py", "💔"),
+    ("Unstable Hemodynamic Analysis", "unstable_hemodynamics.py", "⚠️"),
+    ("Combined Analysis", "combined.py", "🔗"),
+    ("Mortality Model", "mortality.py", "🧮"),
+    ("Stratified Analysis", "stratified_analysis.py", "🧩"),
+    ("Risk Score", "risk.py", "🎯"),
+]
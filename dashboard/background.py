@@ -0,0 +1,112 @@
+import streamlit as st
+
+from jobs import DONE, FAILED, Download, JobQueue
+
+# Background jobs of the current session. The queue is shared by every
+# session in the process; each session owns the jobs it started and keeps
+# their ids, so results survive page changes and reruns until dismissed or
+# evicted, and other sessions' jobs only evict them once the session is gone.
+
+# Seconds between refreshes of the unfinished jobs
+POLL_INTERVAL = 1.0
+
+# Fragment key of the jobs panel, rerun when a job is started
+PANEL = "jobs"
+
+
+def _session_id():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else None
+
+
+def _session_alive(session_id):
+    from streamlit import runtime
+
+    return runtime.exists() and runtime.get_instance().is_active_session(session_id)
+
+
+@st.cache_resource
+def get_job_queue():
+    return JobQueue(alive=_session_alive)
+
+
+def submit_job(name, fn, *args, kind=None, **kwargs):
+    job = get_job_queue().submit(
+        name, fn, *args, kind=kind, owner=_session_id(), **kwargs
+    )
+    st.session_state.setdefault("jobs", []).append(job.id)
+    return job
+
+
+def session_jobs(kind=None):
+    queue = get_job_queue()
+    jobs = [queue.get(job_id) for job_id in st.session_state.get("jobs", [])]
+    return [job for job in jobs if job and (kind is None or job.kind == kind)]
+
+
+def latest_result(kind):
+    # Most recent finished job of a kind, or None
+    finished = [job for job in session_jobs(kind) if job.status == DONE]
+    return finished[-1] if finished else None
+
+
+def start_job(name, fn, *args, kind=None, **kwargs):
+    # Widget callback: submits the job and reruns only the jobs panel, so the
+    # job shows up (and is polled) without rerunning the page
+    submit_job(name, fn, *args, kind=kind, **kwargs)
+    st.rerun(scope=PANEL)
+
+
+@st.fragment(key=PANEL)
+def job_panel():
+    jobs = session_jobs()
+    if not jobs:
+        return
+
+    st.markdown("---")
+    st.subheader("⏳ Background Jobs")
+    if any(job.active for job in jobs):
+        # Only the unfinished jobs are polled
+        st.session_state.active_jobs = {job.id for job in jobs if job.active}
+        st.fragment(_active_jobs, run_every=POLL_INTERVAL)()
+    for job in reversed(jobs):
+        if job.active:
+            continue
+        st.markdown(f"**{job.name}** · {job.status} · {job.elapsed:.0f} s")
+        if job.status == DONE and isinstance(job.result, Download):
+            st.download_button(
+                label=f"📥 {job.result.file_name}",
+                data=job.result.data,
+                file_name=job.result.file_name,
+                mime=job.result.mime,
+                key=f"download-job-{job.id}",
+                on_click="ignore",
+            )
+        elif job.status == FAILED:
+            st.error(job.error)
+            if "kaleido" in job.error.lower():
+                st.info(
+                    "Note: Install kaleido package for PNG export: pip install kaleido"
+                )
+        st.button(
+            "Dismiss", key=f"dismiss-job-{job.id}", on_click=dismiss_job, args=(job.id,)
+        )
+
+
+def _active_jobs():
+    jobs = [job for job in session_jobs() if job.active]
+    if st.session_state.active_jobs - {job.id for job in jobs}:
+        # A job finished: rerun the app so pages showing its result update
+        # and the panel stops polling
+        st.rerun()
+    for job in reversed(jobs):
+        st.markdown(f"**{job.name}** · {job.status} · {job.elapsed:.0f} s")
+        st.progress(job.progress, text=job.message or None)
+        st.button("Cancel", key=f"cancel-job-{job.id}", on_click=job.cancel)
+
+
+def dismiss_job(job_id):
+    get_job_queue().remove(job_id)
+    st.session_state.jobs.remove(job_id)
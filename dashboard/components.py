@@ -0,0 +1,26 @@
+import streamlit as st
+
+# Result blocks shared by several pages
+
+
+def show_most_significant(results_df, test_column="Test"):
+    # Smallest family-wise adjusted p-value, ties broken by the raw p-value
+    adjusted = "Max-T P" if "Max-T P" in results_df else "Holm P"
+    best = results_df.sort_values([adjusted, "P-Value"]).iloc[0]
+    message = (
+        f"**{best[test_column]}** (p = {best['P-Value']:.4f}; adjusted for "
+        f"{len(results_df)} tests: {adjusted} = {best[adjusted]:.4f}, "
+        f"BH P = {best['BH P']:.4f})"
+    )
+    if best[adjusted] < 0.05:
+        st.success(f"🎯 Most significant result: {message}")
+    else:
+        st.info(f"No result is significant after correction. Smallest: {message}")
+
+
+def show_effect_sizes(effects, caption):
+    st.subheader("📏 Effect Sizes")
+    st.dataframe(effects.round(4), use_container_width=True)
+    if "Cliff's Delta" in set(effects["Effect Size"]):
+        caption += "; Cliff's delta equals the rank-biserial correlation"
+    st.caption(caption + "; 95% BCa bootstrap confidence intervals")
@@ -0,0 +1,426 @@
+import functools
+import io
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from cohort import Cohort
+from instrumentation import LOAD, TEST, timed
+from cohort_store import (
+    CLEARANCE_MISMATCH,
+    CLEARANCE_RECORDED,
+    COMORBIDITY_MASK,
+    CSV_PATH,
+    OUTCOMES,
+    STATS_COLUMNS,
+    STORE_PATH,
+    ingest_csv,
+    load_summary,
+    read_cohort,
+    store_is_current,
+    store_is_synthetic,
+    store_version,
+)
+from roc import roc_table
+
+# Data shared by every page. The module is imported once per process, so
+# the cached helpers below keep their entries across reruns and sessions;
+# the analysis engines are imported by the helper that uses them. The
+# helpers are timed outside their caches, so a run's timings show cache
+# hits (hashing the arguments) as well as the computations.
+#
+# Like the Cohort itself, the features derived from it and the test results
+# are @shared: one object per process, computed once however many sessions
+# ask for it, instead of the copy st.cache_data unpickles for every call.
+# They are keyed by column name and store version rather than by the data,
+# so a rerun hashes a few strings, and a session gets a read-only view.
+
+
+def frozen(value, seen=None):
+    # Marks the NumPy arrays of a shared result read-only, through tuples,
+    # lists, dicts and object attributes. Frames need no marking: with
+    # pandas' copy-on-write, changing a view of one copies the data first.
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return value
+    seen.add(id(value))
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            frozen(item, seen)
+    elif isinstance(value, dict):
+        for item in value.values():
+            frozen(item, seen)
+    elif hasattr(value, "__dict__") and not isinstance(
+        value, (pd.DataFrame, pd.Series, type)
+    ):
+        frozen(vars(value), seen)
+    return value
+
+
+def read_only(value):
+    # A session's view of a shared result: frames are shallow copy-on-write
+    # copies, so a page adding a column or a row changes only its own view
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    if type(value) is tuple:
+        return tuple(read_only(item) for item in value)
+    return value
+
+
+def shared(function):
+    # st.cache_resource for results every session may read but none may
+    # change: frozen once when computed, handed out through read_only
+    @st.cache_resource
+    @functools.wraps(function)
+    def cached(*args):
+        return frozen(function(*args))
+
+    @functools.wraps(function)
+    def view(*args):
+        return read_only(cached(*args))
+
+    view.clear = cached.clear
+    return view
+
+
+VITALS = ["SBP_clean", "DBP_clean", "SPO2_clean", "CBG_clean", "HR_clean"]
+PAGE_COLUMNS = {
+    "Overview": [],
+    "Initial Lactate Analysis": ["INITIAL LACTATE (clean)"],
+    "Lactate Clearance Analysis": [
+        "LACTATE CLEARANCE (clean)",
+        CLEARANCE_RECORDED,
+        CLEARANCE_MISMATCH,
+        "INITIAL LACTATE (clean)",
+        "REPEAT LACTATE (clean)",
+    ],
+    "Repeat Lactate Analysis": ["REPEAT LACTATE (clean)"],
+    "CRP Analysis": ["CRP (clean)"],
+    "SEPSIS Lactate Clearance Analysis": [],
+    "Age Analysis": ["AGE"],
+    "CAD Analysis": [COMORBIDITY_MASK],
+    "SHTN+T2DM Analysis": [COMORBIDITY_MASK],
+    "Unstable Hemodynamic Analysis": VITALS,
+    "Combined Analysis": [
+        "INITIAL LACTATE (clean)",
+        "LACTATE CLEARANCE (clean)",
+        "REPEAT LACTATE (clean)",
+        "AGE",
+        COMORBIDITY_MASK,
+    ]
+    + VITALS,
+    "Stratified Analysis": ["Age_Group", "SEX", COMORBIDITY_MASK] + VITALS,
+}
+
+
+def page_columns(analysis_type):
+    # The model pages take their columns from their engines, imported here
+    # so they load only when the page is opened
+    if analysis_type == "Mortality Model":
+        from mortality_model import MODEL_COLUMNS
+
+        return MODEL_COLUMNS[:-1]
+    if analysis_type == "Risk Score":
+        from risk_score import ITEMS, item_columns
+
+        return list(
+            dict.fromkeys(column for item in ITEMS for column in item_columns(item))
+        )
+    return PAGE_COLUMNS[analysis_type]
+
+
+EXPORT_COLUMNS = [
+    "INITIAL LACTATE (clean)",
+    "LACTATE CLEARANCE (clean)",
+    "CLINICAL OUTCOMES",
+]
+
+
+def page_data(analysis_type):
+    return cohort_columns(*page_columns(analysis_type), "CLINICAL OUTCOMES")
+
+
+# SEPSIS subset embedded as variable
+SEPSIS_CSV = """SEPSIS LACTATE CLEARANCE,CLINICAL OUTCOME
+4.80%,DEAD
+66.67%,ALIVE
+36.84%,ALIVE
+78.32%,ALIVE
+41.18%,ALIVE
+19.91%,ALIVE
+1.43%,ALIVE
+34.78%,ALIVE
+52.00%,ALIVE
+66.67%,ALIVE
+53.49%,ALIVE
+21.62%,ALIVE
+45.58%,ALIVE
+44.74%,ALIVE
+50.00%,ALIVE
+21.74%,ALIVE
+42.98%,ALIVE
+39.53%,ALIVE
+40.91%,ALIVE
+57.39%,ALIVE
+20.00%,ALIVE
+5.55%,DEAD
+23.08%,ALIVE
+11.11%,ALIVE
+18.18%,ALIVE
+31.62%,ALIVE
+7.60%,DEAD
+44.88%,ALIVE
+12.50%,ALIVE
+-14.29%,DEAD
+88.55%,ALIVE"""
+
+
+@timed("SEPSIS subset", LOAD)
+@shared
+def sepsis_clearance():
+    df2 = pd.read_csv(io.StringIO(SEPSIS_CSV))
+    df2["SEPSIS LACTATE CLEARANCE (clean)"] = (
+        df2["SEPSIS LACTATE CLEARANCE"].str.extract(r"([\d.-]+)").astype(float)
+    )
+    return df2
+
+
+# Cohort data is read from the typed columnar store, built from the CSV on
+# first start (or when the store layout is out of date). Each page only
+# loads the columns it uses.
+def ensure_store():
+    if not store_is_current(STORE_PATH):
+        ingest_csv(CSV_PATH, STORE_PATH)
+
+
+# Whether the store holds a generated cohort, checked once per store version
+@shared
+def get_store_is_synthetic(store_path, version):
+    return store_is_synthetic(store_path)
+
+
+def synthetic_store():
+    return get_store_is_synthetic(STORE_PATH, store_version(STORE_PATH))
+
+
+# One compact Cohort per store, shared by every session in the process. New
+# admission batches appended to the store are folded in by Cohort.refresh().
+# The frames it hands out share its columns, copy-on-write.
+@st.cache_resource
+def get_cohort(store_path):
+    return Cohort(store_path)
+
+
+@timed("Cohort columns", LOAD)
+def cohort_columns(*columns):
+    return get_cohort(STORE_PATH).columns(*columns)
+
+
+# A column with the outcome, over the patients where both are known: the
+# frame a single-variable page tests and plots
+@shared
+def get_outcome_frame(store_path, version, column):
+    return get_cohort(store_path).columns(column, "CLINICAL OUTCOMES").dropna()
+
+
+@timed("Outcome frame", LOAD)
+def outcome_frame(column):
+    return get_outcome_frame(STORE_PATH, store_version(STORE_PATH), column)
+
+
+# (ALIVE, DEAD) values of a column as read-only arrays
+@shared
+def get_outcome_groups(store_path, version, column):
+    frame = get_outcome_frame(store_path, version, column)
+    return tuple(
+        frame.loc[frame["CLINICAL OUTCOMES"] == outcome, column].to_numpy()
+        for outcome in OUTCOMES
+    )
+
+
+@timed("Outcome groups", LOAD)
+def outcome_groups(column):
+    return get_outcome_groups(STORE_PATH, store_version(STORE_PATH), column)
+
+
+# [[flagged ALIVE, flagged DEAD], [others ALIVE, others DEAD]] for a flag of
+# stratified.py (a comorbidity, SHTN+T2DM or Unstable Hemodynamics), over
+# the patients where the flag and the outcome are known
+@shared
+def get_flag_table(store_path, version, name):
+    from stratified import flag, flag_columns
+
+    data = get_cohort(store_path).columns(*flag_columns(name), "CLINICAL OUTCOMES")
+    flags = flag(data, name).to_numpy(dtype=float)
+    outcomes = data["CLINICAL OUTCOMES"].to_numpy(dtype=object)
+    return [
+        [int(((flags == value) & (outcomes == outcome)).sum()) for outcome in OUTCOMES]
+        for value in (1.0, 0.0)
+    ]
+
+
+@timed("Flag table", LOAD)
+def flag_table(name):
+    return get_flag_table(STORE_PATH, store_version(STORE_PATH), name)
+
+
+# Group counts and running moments maintained incrementally at ingestion
+@shared
+def get_summary(store_path, version):
+    return load_summary(store_path)
+
+
+@timed("Cohort summary", LOAD)
+def cohort_summary():
+    return get_summary(STORE_PATH, store_version(STORE_PATH))
+
+
+# Combined Analysis tests streamed over the store in fixed-size chunks, so
+# only one chunk plus the mergeable partial results is ever held in memory
+@timed("Chunked tests", TEST)
+@shared
+def get_chunked_analysis(store_path, version, chunksize):
+    from chunked import analyze
+
+    return analyze(store_path, chunksize)
+
+
+def chunked_analysis(chunksize):
+    return get_chunked_analysis(STORE_PATH, store_version(STORE_PATH), chunksize)
+
+
+# AUC, bootstrap CI and Youden-optimal cutoff for every numeric variable
+@timed("ROC table", TEST)
+@shared
+def get_roc_table(store_path, version):
+    data = read_cohort(store_path, STATS_COLUMNS + ["CLINICAL OUTCOMES"])
+    return roc_table(data, STATS_COLUMNS)
+
+
+# Pearson, Spearman and point-biserial matrices over every numeric column
+@timed("Correlations", TEST)
+@shared
+def get_correlations(store_path, version):
+    from correlation import CorrelationMatrix
+
+    data = read_cohort(store_path, STATS_COLUMNS + ["CLINICAL OUTCOMES"])
+    return CorrelationMatrix(data, STATS_COLUMNS)
+
+
+# Fitted mortality models shared by every session, keyed by formula and data
+@st.cache_resource
+def get_model_cache():
+    from mortality_model import ModelCache
+
+    return ModelCache()
+
+
+# Cross-validated risk scores shared by every session, keyed by items and data
+@st.cache_resource
+def get_score_builder():
+    from risk_score import ScoreBuilder
+
+    return ScoreBuilder()
+
+
+# Unstable-hemodynamics tables for every combination of vital thresholds
+@timed("Sensitivity grid", TEST)
+@shared
+def get_sensitivity_grid(store_path, version):
+    from sensitivity import SensitivityGrid
+
+    return SensitivityGrid(read_cohort(store_path, VITALS + ["CLINICAL OUTCOMES"]))
+
+
+# Mann-Whitney U (statistic, p-value, method), Welch's t-test and
+# Kolmogorov-Smirnov (statistic, p-value) of ALIVE vs DEAD for a column
+GroupTests = namedtuple("GroupTests", "mann_whitney welch ks")
+
+
+@shared
+def get_group_tests(store_path, version, column):
+    from scipy.stats import ks_2samp, ttest_ind
+
+    from rank_tests import mann_whitney
+
+    alive, dead = get_outcome_groups(store_path, version, column)
+    with timed("Welch's t-test", TEST):
+        t_stat, p_ttest = ttest_ind(alive, dead, equal_var=False)
+    with timed("Kolmogorov-Smirnov", TEST):
+        ks_stat, p_ks = ks_2samp(alive, dead)
+    return GroupTests(
+        mann_whitney(alive, dead),
+        (float(t_stat), float(p_ttest)),
+        (float(ks_stat), float(p_ks)),
+    )
+
+
+@timed("Group tests", TEST)
+def group_tests(column):
+    return get_group_tests(STORE_PATH, store_version(STORE_PATH), column)
+
+
+# Effect sizes with BCa intervals, every statistic of a comparison drawn from
+# the same bootstrap resamples
+@timed("Effect sizes", TEST)
+@shared
+def get_effect_sizes(alive, dead):
+    from effect_sizes import ContinuousEffects, effect_size_table
+
+    return effect_size_table(ContinuousEffects(alive, dead))
+
+
+@shared
+def get_group_effect_sizes(store_path, version, column):
+    return get_effect_sizes(*get_outcome_groups(store_path, version, column))
+
+
+@timed("Group effect sizes", TEST)
+def group_effect_sizes(column):
+    return get_group_effect_sizes(STORE_PATH, store_version(STORE_PATH), column)
+
+
+# Permutation p-values of the page tests and their max-T adjustment, from one
+# shared set of label permutations
+@shared
+def get_group_test_family(store_path, version, column):
+    from multiple_testing import TwoSampleFamily
+
+    alive, dead = get_outcome_groups(store_path, version, column)
+    _, permuted_p, max_t_p = TwoSampleFamily(alive, dead).permutation_test()
+    return permuted_p, max_t_p
+
+
+@timed("Permutation tests", TEST)
+def group_test_family(column):
+    return get_group_test_family(STORE_PATH, store_version(STORE_PATH), column)
+
+
+@timed("Odds ratio", TEST)
+@shared
+def get_odds_ratio(exposed_dead, exposed_alive, unexposed_dead, unexposed_alive):
+    from effect_sizes import OddsRatioEffect, effect_size_table
+
+    return effect_size_table(
+        OddsRatioEffect(exposed_dead, exposed_alive, unexposed_dead, unexposed_alive)
+    )
+
+
+# The Combined Analysis tests as one max-T family, every variable tested on
+# the same permutations of the outcome
+@timed("Combined family", TEST)
+@shared
+def get_combined_family(store_path, version):
+    from chunked import combined_family
+
+    return combined_family(store_path)
+
+
+@timed("Max-T", TEST)
+@shared
+def get_combined_max_t(store_path, version):
+    return get_combined_family(store_path, version).max_t()
@@ -0,0 +1,137 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from scipy.stats import chi2_contingency
+
+from instrumentation import FIGURE, TEST, timed
+from dashboard.components import show_effect_sizes
+from dashboard.data import flag_table, get_odds_ratio
+
+st.header("❤️ CAD vs Clinical Outcomes")
+
+# Contingency table of CAD (from the K/C/O comorbidity bitmask) vs outcome
+contingency_table = flag_table("CAD")
+(cad_alive, cad_dead), (no_cad_alive, no_cad_dead) = contingency_table
+
+# Use Fisher's exact test if any cell has count < 5, otherwise chi-square
+with timed("Fisher/Chi-square", TEST):
+    if min(cad_alive, cad_dead, no_cad_alive, no_cad_dead) < 5:
+        from scipy.stats import fisher_exact
+
+        odds_ratio, p_chi2 = fisher_exact(contingency_table)
+        chi2_stat = odds_ratio
+        test_name = "Fisher's Exact Test"
+    else:
+        chi2_stat, p_chi2, dof, expected = chi2_contingency(contingency_table)
+        test_name = "Chi-square Test"
+
+# Display test results
+st.subheader("📊 Statistical Test Results")
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.metric(f"{test_name} Statistic", f"{chi2_stat:.4f}")
+with col2:
+    st.metric("P-Value", f"{p_chi2:.4f}")
+with col3:
+    significance = "Significant" if p_chi2 < 0.05 else "Not Significant"
+    st.metric("Result", significance)
+
+# Contingency table display
+st.subheader("📋 Contingency Table")
+contingency_df = pd.DataFrame(
+    {"CAD": [cad_alive, cad_dead], "No CAD": [no_cad_alive, no_cad_dead]},
+    index=["ALIVE", "DEAD"],
+)
+st.dataframe(contingency_df, use_container_width=True)
+show_effect_sizes(
+    get_odds_ratio(cad_dead, cad_alive, no_cad_dead, no_cad_alive),
+    "Odds of death with CAD vs without",
+)
+
+# Double bar chart (grouped)
+with timed("Outcome bar chart", FIGURE):
+    fig_bar = go.Figure()
+    fig_bar.add_trace(
+        go.Bar(
+            name="ALIVE",
+            x=["CAD", "No CAD"],
+            y=[cad_alive, no_cad_alive],
+            marker_color="#2E8B57",
+        )
+    )
+    fig_bar.add_trace(
+        go.Bar(
+            name="DEAD",
+            x=["CAD", "No CAD"],
+            y=[cad_dead, no_cad_dead],
+            marker_color="#DC143C",
+        )
+    )
+    fig_bar.update_layout(
+        title="Clinical Outcomes by CAD Status",
+        xaxis_title="CAD Status",
+        yaxis_title="Count",
+        barmode="group",
+        title_font=dict(size=30),
+        legend=dict(font=dict(size=26)),
+        xaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+        yaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+    )
+    st.plotly_chart(fig_bar, use_container_width=True)
+
+# Pie chart showing CAD distribution
+col1, col2 = st.columns(2)
+with col1:
+    with timed("CAD donut", FIGURE):
+        fig_pie_cad = px.pie(
+            values=[cad_alive + cad_dead, no_cad_alive + no_cad_dead],
+            names=["CAD Patients", "No CAD Patients"],
+            title="CAD Distribution",
+            color_discrete_sequence=["#FF6B6B", "#4ECDC4"],
+            hole=0.4,
+        )
+        fig_pie_cad.update_traces(textinfo="percent+label", textfont_size=20)
+        fig_pie_cad.update_layout(
+            title_font=dict(size=30), legend=dict(font=dict(size=26))
+        )
+        st.plotly_chart(fig_pie_cad, use_container_width=True)
+
+with col2:
+    with timed("Outcome donut", FIGURE):
+        fig_pie_outcome = px.pie(
+            values=[cad_alive + no_cad_alive, cad_dead + no_cad_dead],
+            names=["ALIVE", "DEAD"],
+            title="Overall Outcomes",
+            color_discrete_map={"ALIVE": "#2E8B57", "DEAD": "#DC143C"},
+            hole=0.4,
+        )
+        fig_pie_outcome.update_traces(textinfo="percent+label", textfont_size=20)
+        fig_pie_outcome.update_layout(
+            title_font=dict(size=30), legend=dict(font=dict(size=26))
+        )
+        st.plotly_chart(fig_pie_outcome, use_container_width=True)
+
+# Survival rates
+st.subheader("📈 Survival Rates")
+col1, col2 = st.columns(2)
+
+with col1:
+    cad_total = cad_alive + cad_dead
+    cad_survival_rate = (cad_alive / cad_total * 100) if cad_total > 0 else 0
+    st.write("**CAD Patients**")
+    st.write(f"Total: {cad_total}")
+    st.write(f"Alive: {cad_alive}")
+    st.write(f"Dead: {cad_dead}")
+    st.write(f"Survival Rate: {cad_survival_rate:.1f}%")
+
+with col2:
+    no_cad_total = no_cad_alive + no_cad_dead
+    no_cad_survival_rate = (
+        (no_cad_alive / no_cad_total * 100) if no_cad_total > 0 else 0
+    )
+    st.write("**No CAD Patients**")
+    st.write(f"Total: {no_cad_total}")
+    st.write(f"Alive: {no_cad_alive}")
+    st.write(f"Dead: {no_cad_dead}")
+    st.write(f"Survival Rate: {no_cad_survival_rate:.1f}%")
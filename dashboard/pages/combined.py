@@ -0,0 +1,442 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from scipy.stats import chi2_contingency
+
+from cohort_store import STORE_PATH, store_version
+from effect_sizes import effect_row
+from instrumentation import FIGURE, TEST, timed
+from multiple_testing import adjust_table
+from roc import roc_curve
+from dashboard.background import latest_result, start_job
+from dashboard.components import show_most_significant
+from dashboard.data import (
+    chunked_analysis,
+    cohort_columns,
+    flag_table,
+    get_combined_family,
+    get_combined_max_t,
+    get_correlations,
+    get_odds_ratio,
+    get_roc_table,
+    group_effect_sizes,
+    group_tests,
+    outcome_frame,
+)
+
+chunked_mode = st.sidebar.checkbox(
+    "Out-of-core mode",
+    help="Run the tests chunk by chunk over the store instead of "
+    "loading every column into memory",
+)
+if chunked_mode:
+    chunksize = st.sidebar.number_input(
+        "Rows per chunk", min_value=1, value=100_000, step=10_000
+    )
+df = cohort_columns(
+    "INITIAL LACTATE (clean)", "LACTATE CLEARANCE (clean)", "CLINICAL OUTCOMES"
+)
+
+st.header("🔬 Combined Analysis Dashboard")
+
+# Prepare data for all tests
+initial_df = outcome_frame("INITIAL LACTATE (clean)")
+clearance_df = outcome_frame("LACTATE CLEARANCE (clean)")
+
+# Test results table
+st.subheader("🧪 Statistical Test Results")
+if chunked_mode:
+    results_df = chunked_analysis(chunksize).combined_results()
+else:
+    # Rank tests and 2x2 tables shared by every session, computed once per
+    # store version
+    u_stat_initial, p_val_initial, method_initial = group_tests(
+        "INITIAL LACTATE (clean)"
+    ).mann_whitney
+    u_stat_clearance, p_val_clearance, method_clearance = group_tests(
+        "LACTATE CLEARANCE (clean)"
+    ).mann_whitney
+    u_stat_repeat, p_val_repeat, method_repeat = group_tests(
+        "REPEAT LACTATE (clean)"
+    ).mann_whitney
+    u_stat_age, p_val_age, method_age = group_tests("AGE").mann_whitney
+
+    # CAD analysis
+    contingency = flag_table("CAD")
+    (cad_alive_count, cad_dead_count), (no_cad_alive_count, no_cad_dead_count) = (
+        contingency
+    )
+
+    with timed("CAD Fisher/Chi-square", TEST):
+        if (
+            min(
+                cad_alive_count,
+                cad_dead_count,
+                no_cad_alive_count,
+                no_cad_dead_count,
+            )
+            < 5
+        ):
+            from scipy.stats import fisher_exact
+
+            chi2_stat_cad, p_val_cad = fisher_exact(contingency)
+        else:
+            chi2_stat_cad, p_val_cad, _, _ = chi2_contingency(contingency)
+
+    # SHTN+T2DM analysis
+    contingency_shtn_t2dm = flag_table("SHTN+T2DM")
+    (shtn_t2dm_alive_count, shtn_t2dm_dead_count), (
+        no_shtn_t2dm_alive_count,
+        no_shtn_t2dm_dead_count,
+    ) = contingency_shtn_t2dm
+
+    with timed("SHTN+T2DM Fisher/Chi-square", TEST):
+        if (
+            min(
+                shtn_t2dm_alive_count,
+                shtn_t2dm_dead_count,
+                no_shtn_t2dm_alive_count,
+                no_shtn_t2dm_dead_count,
+            )
+            < 5
+        ):
+            from scipy.stats import fisher_exact
+
+            chi2_stat_shtn_t2dm, p_val_shtn_t2dm = fisher_exact(contingency_shtn_t2dm)
+        else:
+            chi2_stat_shtn_t2dm, p_val_shtn_t2dm, _, _ = chi2_contingency(
+                contingency_shtn_t2dm
+            )
+
+    # Hemodynamic analysis
+    contingency_hemo = flag_table("Unstable Hemodynamics")
+    (unstable_hemo_alive, unstable_hemo_dead), (stable_hemo_alive, stable_hemo_dead) = (
+        contingency_hemo
+    )
+
+    with timed("Hemodynamics Fisher/Chi-square", TEST):
+        if (
+            min(
+                unstable_hemo_alive,
+                unstable_hemo_dead,
+                stable_hemo_alive,
+                stable_hemo_dead,
+            )
+            < 5
+        ):
+            from scipy.stats import fisher_exact
+
+            chi2_stat_hemo, p_val_hemo = fisher_exact(contingency_hemo)
+        else:
+            chi2_stat_hemo, p_val_hemo, _, _ = chi2_contingency(contingency_hemo)
+
+    results_data = {
+        "Test": [
+            "Initial Lactate vs Outcomes",
+            "Lactate Clearance vs Outcomes",
+            "Repeat Lactate vs Outcomes",
+            "Age vs Outcomes",
+            "CAD vs Outcomes",
+            "SHTN+T2DM vs Outcomes",
+            "Unstable Hemodynamics vs Outcomes",
+        ],
+        "Test Type": [
+            f"Mann-Whitney U ({method_initial})",
+            f"Mann-Whitney U ({method_clearance})",
+            f"Mann-Whitney U ({method_repeat})",
+            f"Mann-Whitney U ({method_age})",
+            "Fisher/Chi-square",
+            "Fisher/Chi-square",
+            "Fisher/Chi-square",
+        ],
+        "Statistic": [
+            u_stat_initial,
+            u_stat_clearance,
+            u_stat_repeat,
+            u_stat_age,
+            chi2_stat_cad,
+            chi2_stat_shtn_t2dm,
+            chi2_stat_hemo,
+        ],
+        "P-Value": [
+            p_val_initial,
+            p_val_clearance,
+            p_val_repeat,
+            p_val_age,
+            p_val_cad,
+            p_val_shtn_t2dm,
+            p_val_hemo,
+        ],
+        "Significant (α=0.05)": [
+            "Yes" if p_val_initial < 0.05 else "No",
+            "Yes" if p_val_clearance < 0.05 else "No",
+            "Yes" if p_val_repeat < 0.05 else "No",
+            "Yes" if p_val_age < 0.05 else "No",
+            "Yes" if p_val_cad < 0.05 else "No",
+            "Yes" if p_val_shtn_t2dm < 0.05 else "No",
+            "Yes" if p_val_hemo < 0.05 else "No",
+        ],
+    }
+    results_df = pd.DataFrame(results_data)
+
+    # Effect size per comparison: Cliff's delta (ALIVE vs DEAD) for the
+    # rank tests, odds of death with vs without for the 2x2 tables
+    effect_rows = [
+        effect_row(group_effect_sizes(column), "Cliff's Delta")
+        for column in [
+            "INITIAL LACTATE (clean)",
+            "LACTATE CLEARANCE (clean)",
+            "REPEAT LACTATE (clean)",
+            "AGE",
+        ]
+    ] + [
+        effect_row(get_odds_ratio(*counts), "Odds Ratio")
+        for counts in [
+            (
+                cad_dead_count,
+                cad_alive_count,
+                no_cad_dead_count,
+                no_cad_alive_count,
+            ),
+            (
+                shtn_t2dm_dead_count,
+                shtn_t2dm_alive_count,
+                no_shtn_t2dm_dead_count,
+                no_shtn_t2dm_alive_count,
+            ),
+            (
+                unstable_hemo_dead,
+                unstable_hemo_alive,
+                stable_hemo_dead,
+                stable_hemo_alive,
+            ),
+        ]
+    ]
+    results_df = pd.concat([results_df, pd.DataFrame(effect_rows)], axis=1)
+    results_df["Max-T P"] = get_combined_max_t(STORE_PATH, store_version(STORE_PATH))
+results_df = adjust_table(results_df)
+st.dataframe(results_df, use_container_width=True)
+show_most_significant(results_df)
+st.caption(
+    "Estimate: Cliff's delta (ALIVE vs DEAD) or odds ratio of death; "
+    "95% BCa bootstrap confidence intervals"
+)
+
+
+def start_max_t(n_perm):
+    family = get_combined_family(STORE_PATH, store_version(STORE_PATH))
+    start_job(
+        f"Max-T, {n_perm:,} permutations",
+        family.max_t,
+        n_perm,
+        kind="combined-max-t",
+    )
+
+
+if not chunked_mode:
+    # Finer max-T p-values from more permutations, computed as a background
+    # job (progress in the sidebar) so the dashboard stays usable meanwhile
+    with st.expander("🔁 Max-T with more permutations"):
+        n_perm = st.number_input(
+            "Permutations", min_value=1_000, value=100_000, step=10_000
+        )
+        st.button("Run in background", on_click=start_max_t, args=(n_perm,))
+        job = latest_result("combined-max-t")
+        if job is not None:
+            finer = results_df[["Test", "P-Value", "Max-T P"]].copy()
+            finer[f"Max-T P ({job.total:,} permutations)"] = job.result
+            st.dataframe(finer, use_container_width=True)
+            st.caption(f"{job.name}, finished in {job.elapsed:.1f} s")
+
+# ROC analysis and optimal cutoffs
+st.subheader("📈 ROC Analysis and Optimal Cutoffs")
+roc_df = get_roc_table(STORE_PATH, store_version(STORE_PATH))
+st.dataframe(roc_df.round(3), use_container_width=True)
+
+roc_variable = st.selectbox("ROC curve for", roc_df["Variable"])
+roc_row = roc_df.set_index("Variable").loc[roc_variable]
+roc_data = cohort_columns(roc_variable, "CLINICAL OUTCOMES").dropna()
+curve = roc_curve(
+    roc_data[roc_variable],
+    roc_data["CLINICAL OUTCOMES"] == "DEAD",
+    roc_row["DEAD if"],
+)
+
+with timed("ROC curve", FIGURE):
+    fig_roc = go.Figure()
+    fig_roc.add_trace(
+        go.Scatter(
+            x=curve["FPR"],
+            y=curve["TPR"],
+            mode="lines",
+            line=dict(color="#DC143C", width=3),
+            name=f"AUC = {roc_row['AUC']:.3f}",
+        )
+    )
+    fig_roc.add_trace(
+        go.Scatter(
+            x=[0, 1],
+            y=[0, 1],
+            mode="lines",
+            line=dict(color="gray", dash="dash"),
+            name="Chance",
+        )
+    )
+    fig_roc.add_trace(
+        go.Scatter(
+            x=[1 - roc_row["Specificity"]],
+            y=[roc_row["Sensitivity"]],
+            mode="markers",
+            marker=dict(color="#2E8B57", size=16),
+            name=f"Youden cutoff {roc_row['DEAD if']} {roc_row['Youden Cutoff']:g}",
+        )
+    )
+    fig_roc.update_layout(
+        title=f"ROC Curve: {roc_variable} (DEAD vs ALIVE)",
+        xaxis_title="1 - Specificity",
+        yaxis_title="Sensitivity",
+        title_font=dict(size=30),
+        legend=dict(font=dict(size=26)),
+        xaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+        yaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+    )
+    st.plotly_chart(fig_roc, use_container_width=True)
+st.write(
+    f"AUC {roc_row['AUC']:.3f} (95% CI {roc_row['CI Lower']:.3f}-"
+    f"{roc_row['CI Upper']:.3f}); AUC equals U/(n1·n2) from the "
+    "Mann-Whitney test."
+)
+
+# Side-by-side comparison
+col1, col2 = st.columns(2)
+
+with col1:
+    # Initial Lactate bar chart
+    initial_mean_alive = initial_df[initial_df["CLINICAL OUTCOMES"] == "ALIVE"][
+        "INITIAL LACTATE (clean)"
+    ].mean()
+    initial_mean_dead = initial_df[initial_df["CLINICAL OUTCOMES"] == "DEAD"][
+        "INITIAL LACTATE (clean)"
+    ].mean()
+
+    with timed("Initial lactate bar chart", FIGURE):
+        fig_bar1 = go.Figure()
+        fig_bar1.add_trace(
+            go.Bar(
+                x=["ALIVE", "DEAD"],
+                y=[initial_mean_alive, initial_mean_dead],
+                marker_color=["#2E8B57", "#DC143C"],
+                name="Mean Initial Lactate",
+            )
+        )
+        fig_bar1.update_layout(
+            title="Mean Initial Lactate by Outcome",
+            yaxis_title="Initial Lactate (mmol/L)",
+            xaxis_title="Clinical Outcome",
+            title_font=dict(size=30),
+            legend=dict(font=dict(size=26)),
+            xaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+            yaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+        )
+        st.plotly_chart(fig_bar1, use_container_width=True)
+
+with col2:
+    # Lactate Clearance bar chart
+    clearance_mean_alive = clearance_df[clearance_df["CLINICAL OUTCOMES"] == "ALIVE"][
+        "LACTATE CLEARANCE (clean)"
+    ].mean()
+    clearance_mean_dead = clearance_df[clearance_df["CLINICAL OUTCOMES"] == "DEAD"][
+        "LACTATE CLEARANCE (clean)"
+    ].mean()
+
+    with timed("Clearance bar chart", FIGURE):
+        fig_bar2 = go.Figure()
+        fig_bar2.add_trace(
+            go.Bar(
+                x=["ALIVE", "DEAD"],
+                y=[clearance_mean_alive, clearance_mean_dead],
+                marker_color=["#2E8B57", "#DC143C"],
+                name="Mean Lactate Clearance",
+            )
+        )
+        fig_bar2.update_layout(
+            title="Mean Lactate Clearance by Outcome",
+            yaxis_title="Lactate Clearance (%)",
+            xaxis_title="Clinical Outcome",
+            title_font=dict(size=30),
+            legend=dict(font=dict(size=26)),
+            xaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+            yaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+        )
+        st.plotly_chart(fig_bar2, use_container_width=True)
+
+# Correlation analysis
+st.subheader("🔗 Correlation Analysis")
+correlations = get_correlations(STORE_PATH, store_version(STORE_PATH))
+correlation = correlations.frame().loc[
+    "INITIAL LACTATE (clean)", "LACTATE CLEARANCE (clean)"
+]
+correlation_df = df[["INITIAL LACTATE (clean)", "LACTATE CLEARANCE (clean)"]].dropna()
+
+col1, col2 = st.columns([1, 2])
+with col1:
+    st.metric("Correlation Coefficient", f"{correlation:.3f}")
+
+with col2:
+    # Create correlation categories for pie chart
+    correlation_df["Lactate_Category"] = pd.cut(
+        correlation_df["INITIAL LACTATE (clean)"],
+        bins=[0, 2, 4, float("inf")],
+        labels=["Low (0-2)", "Medium (2-4)", "High (>4)"],
+    )
+
+    corr_counts = correlation_df["Lactate_Category"].value_counts()
+
+    with timed("Lactate category donut", FIGURE):
+        fig_corr_pie = px.pie(
+            values=corr_counts.values,
+            names=corr_counts.index,
+            title="Initial Lactate Categories Distribution",
+            color_discrete_sequence=["#4ECDC4", "#FFD93D", "#FF6B6B"],
+            hole=0.4,
+        )
+        fig_corr_pie.update_traces(textinfo="percent+label", textfont_size=20)
+        fig_corr_pie.update_layout(
+            title_font=dict(size=30), legend=dict(font=dict(size=26))
+        )
+        st.plotly_chart(fig_corr_pie, use_container_width=True)
+
+# Every numeric variable against every other and against death,
+# clustered so related variables sit together
+corr_kind = st.radio("Correlation", ["Pearson", "Spearman"], horizontal=True).lower()
+corr_order = correlations.clustered_order(corr_kind)
+corr_matrix = correlations.frame(corr_kind).loc[corr_order, corr_order]
+with timed("Correlation heatmap", FIGURE):
+    fig_corr_heatmap = go.Figure(
+        go.Heatmap(
+            z=corr_matrix.to_numpy(),
+            x=corr_order,
+            y=corr_order,
+            zmin=-1,
+            zmax=1,
+            colorscale="RdBu_r",
+            text=np.round(corr_matrix.to_numpy(), 2),
+            texttemplate="%{text}",
+        )
+    )
+    fig_corr_heatmap.update_layout(
+        title="Clustered Correlation Matrix",
+        height=700,
+        title_font=dict(size=30),
+        xaxis=dict(tickfont=dict(size=16)),
+        yaxis=dict(tickfont=dict(size=16), autorange="reversed"),
+    )
+    st.plotly_chart(fig_corr_heatmap, use_container_width=True)
+
+st.dataframe(adjust_table(correlations.outcome_table()), use_container_width=True)
+st.caption(
+    "Pairwise-complete correlations; the DEAD column is the point-biserial "
+    f"correlation with death. P-values: {correlations.method}."
+)
@@ -0,0 +1,115 @@
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+
+from instrumentation import FIGURE, timed
+from dashboard.components import show_effect_sizes
+from dashboard.data import (
+    cohort_summary,
+    group_effect_sizes,
+    group_tests,
+    outcome_frame,
+)
+
+st.header("🔬 CRP vs Clinical Outcomes")
+
+# Filter data
+filtered_df = outcome_frame("CRP (clean)")
+
+# Per-outcome summary statistics maintained at ingestion
+alive_stats, dead_stats = cohort_summary().group_stats("CRP (clean)")
+
+# Mann-Whitney U Test
+u_stat, p_value, mw_method = group_tests("CRP (clean)").mann_whitney
+
+# Display test results
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.metric("U-Statistic", f"{u_stat:.2f}")
+with col2:
+    st.metric("P-Value", f"{p_value:.4f}")
+with col3:
+    significance = "Significant" if p_value < 0.05 else "Not Significant"
+    st.metric("Result", significance)
+st.caption(f"Mann-Whitney U p-value: {mw_method}")
+show_effect_sizes(group_effect_sizes("CRP (clean)"), "ALIVE vs DEAD")
+
+# Bar chart comparing mean values
+mean_alive = alive_stats.mean
+mean_dead = dead_stats.mean
+
+with timed("Mean bar chart", FIGURE):
+    fig_bar = go.Figure()
+    fig_bar.add_trace(
+        go.Bar(
+            x=["ALIVE", "DEAD"],
+            y=[mean_alive, mean_dead],
+            marker_color=["#2E8B57", "#DC143C"],
+            showlegend=False,
+        )
+    )
+    # Add custom legend to show color mapping
+    fig_bar.add_trace(
+        go.Scatter(
+            x=[None],
+            y=[None],
+            mode="markers",
+            marker=dict(size=10, color="#2E8B57"),
+            name="ALIVE",
+            showlegend=True,
+        )
+    )
+    fig_bar.add_trace(
+        go.Scatter(
+            x=[None],
+            y=[None],
+            mode="markers",
+            marker=dict(size=10, color="#DC143C"),
+            name="DEAD",
+            showlegend=True,
+        )
+    )
+    fig_bar.update_layout(
+        title="Mean CRP by Clinical Outcome",
+        yaxis_title="Mean CRP (mg/L)",
+        xaxis_title="Clinical Outcome",
+        title_font=dict(size=30),
+        legend=dict(font=dict(size=26)),
+        xaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+        yaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+    )
+    st.plotly_chart(fig_bar, use_container_width=True)
+
+# Pie chart showing CRP categories
+normal_crp = len(filtered_df[filtered_df["CRP (clean)"] <= 10])
+elevated_crp = len(filtered_df[filtered_df["CRP (clean)"] > 10])
+
+with timed("CRP category donut", FIGURE):
+    fig_pie = px.pie(
+        values=[normal_crp, elevated_crp],
+        names=["Normal CRP (≤10 mg/L)", "Elevated CRP (>10 mg/L)"],
+        title="CRP Distribution (Normal vs Elevated)",
+        color_discrete_sequence=["#4ECDC4", "#FF6B6B"],
+        hole=0.4,
+    )
+    fig_pie.update_traces(textinfo="percent+label", textfont_size=20)
+    fig_pie.update_layout(title_font=dict(size=30), legend=dict(font=dict(size=26)))
+    st.plotly_chart(fig_pie, use_container_width=True)
+
+# Summary statistics
+st.subheader("📈 Summary Statistics")
+col1, col2 = st.columns(2)
+
+with col1:
+    st.write("**ALIVE Group**")
+    st.write(f"Mean: {alive_stats.mean:.2f} mg/L")
+    st.write(f"Median: {alive_stats.median:.2f} mg/L")
+    st.write(f"Std Dev: {alive_stats.std:.2f} mg/L")
+    st.write(f"Count: {alive_stats.count}")
+
+with col2:
+    st.write("**DEAD Group**")
+    st.write(f"Mean: {dead_stats.mean:.2f} mg/L")
+    st.write(f"Median: {dead_stats.median:.2f} mg/L")
+    st.write(f"Std Dev: {dead_stats.std:.2f} mg/L")
+    st.write(f"Count: {dead_stats.count}")
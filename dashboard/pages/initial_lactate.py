@@ -0,0 +1,102 @@
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+
+from instrumentation import FIGURE, timed
+from dashboard.components import show_effect_sizes
+from dashboard.data import (
+    cohort_summary,
+    group_effect_sizes,
+    group_tests,
+    outcome_frame,
+)
+
+st.header("🧪 Initial Lactate vs Clinical Outcomes")
+
+# Filter data
+filtered_df = outcome_frame("INITIAL LACTATE (clean)")
+
+# Per-outcome summary statistics maintained at ingestion
+alive_stats, dead_stats = cohort_summary().group_stats("INITIAL LACTATE (clean)")
+
+# Mann-Whitney U Test
+u_stat, p_value, mw_method = group_tests("INITIAL LACTATE (clean)").mann_whitney
+
+# Display test results
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.metric("U-Statistic", f"{u_stat:.2f}")
+with col2:
+    st.metric("P-Value", f"{p_value:.4f}")
+with col3:
+    significance = "Significant" if p_value < 0.05 else "Not Significant"
+    st.metric("Result", significance)
+st.caption(f"Mann-Whitney U p-value: {mw_method}")
+show_effect_sizes(group_effect_sizes("INITIAL LACTATE (clean)"), "ALIVE vs DEAD")
+
+# Bar chart comparing mean values
+mean_alive = alive_stats.mean
+mean_dead = dead_stats.mean
+
+with timed("Mean bar chart", FIGURE):
+    fig_bar = go.Figure()
+    fig_bar.add_trace(
+        go.Bar(
+            x=["ALIVE", "DEAD"],
+            y=[mean_alive, mean_dead],
+            marker_color=["#2E8B57", "#DC143C"],
+            name="Mean Initial Lactate",
+        )
+    )
+    fig_bar.update_layout(
+        title="Mean Initial Lactate by Clinical Outcome",
+        yaxis_title="Mean Initial Lactate (mmol/L)",
+        xaxis_title="Clinical Outcome",
+        title_font=dict(size=30),
+        legend=dict(font=dict(size=26)),
+        xaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+        yaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+    )
+    st.plotly_chart(fig_bar, use_container_width=True)
+
+# Donut chart showing distribution of high vs low lactate
+lactate_threshold = filtered_df["INITIAL LACTATE (clean)"].median()
+high_lactate = len(
+    filtered_df[filtered_df["INITIAL LACTATE (clean)"] > lactate_threshold]
+)
+low_lactate = len(
+    filtered_df[filtered_df["INITIAL LACTATE (clean)"] <= lactate_threshold]
+)
+
+with timed("High/low donut", FIGURE):
+    fig_pie = px.pie(
+        values=[high_lactate, low_lactate],
+        names=[
+            f"High (>{lactate_threshold:.1f})",
+            f"Low (≤{lactate_threshold:.1f})",
+        ],
+        title="Initial Lactate Distribution (High vs Low)",
+        color_discrete_sequence=["#FF6B6B", "#4ECDC4"],
+        hole=0.4,
+    )
+    fig_pie.update_traces(textinfo="percent+label", textfont_size=20)
+    fig_pie.update_layout(title_font=dict(size=30), legend=dict(font=dict(size=26)))
+    st.plotly_chart(fig_pie, use_container_width=True)
+
+# Summary statistics
+st.subheader("📈 Summary Statistics")
+col1, col2 = st.columns(2)
+
+with col1:
+    st.write("**ALIVE Group**")
+    st.write(f"Mean: {alive_stats.mean:.2f} mmol/L")
+    st.write(f"Median: {alive_stats.median:.2f} mmol/L")
+    st.write(f"Std Dev: {alive_stats.std:.2f} mmol/L")
+    st.write(f"Count: {alive_stats.count}")
+
+with col2:
+    st.write("**DEAD Group**")
+    st.write(f"Mean: {dead_stats.mean:.2f} mmol/L")
+    st.write(f"Median: {dead_stats.median:.2f} mmol/L")
+    st.write(f"Std Dev: {dead_stats.std:.2f} mmol/L")
+    st.write(f"Count: {dead_stats.count}")
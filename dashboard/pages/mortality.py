@@ -0,0 +1,97 @@
+import streamlit as st
+import numpy as np
+import plotly.graph_objects as go
+
+from instrumentation import FIGURE, TEST, timed
+from mortality_model import (
+    DEFAULT_TERMS,
+    TERMS,
+    design_matrix,
+    formula,
+    model_frame,
+    outcome_vector,
+)
+from roc import roc_summary
+from dashboard.data import get_model_cache, page_data
+
+df = page_data("Mortality Model")
+
+st.header("🧮 Mortality Model: Multivariable Logistic Regression")
+
+terms = st.multiselect("Predictors", TERMS, default=DEFAULT_TERMS)
+if not terms:
+    st.warning("Select at least one predictor.")
+else:
+    model_cache = get_model_cache()
+    with timed("Logistic model", TEST):
+        fit = model_cache.fit(df, terms)
+    st.code(formula(terms))
+
+    model_df = model_frame(df, terms)
+    predicted = fit.predict(design_matrix(model_df, terms))
+    model_auc = roc_summary(predicted, outcome_vector(model_df), n_boot=0)
+
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        st.metric("Patients", fit.n)
+    with col2:
+        st.metric("Deaths", fit.events)
+    with col3:
+        st.metric("AIC", f"{fit.aic:.1f}")
+    with col4:
+        st.metric("McFadden R²", f"{fit.pseudo_r2:.3f}")
+    with col5:
+        st.metric("AUC", f"{model_auc['AUC']:.3f}" if model_auc else "n/a")
+
+    if not fit.converged:
+        st.warning(
+            f"The fit did not converge in {fit.iterations} iterations, so its "
+            "estimates are unreliable."
+        )
+    if fit.separated:
+        st.warning(
+            f"{', '.join(fit.separated)}: the outcomes are (nearly) separated, "
+            "so the coefficient has no finite estimate and its odds ratio is "
+            "not shown. Remove the term or combine it with others."
+        )
+
+    # Odds ratios
+    st.subheader("📋 Adjusted Odds Ratios")
+    or_df = fit.odds_ratios()
+    or_df["Significant (α=0.05)"] = np.where(or_df["P-Value"] < 0.05, "Yes", "No")
+    st.dataframe(or_df.round(4), use_container_width=True)
+
+    forest_df = or_df[(or_df["Term"] != "Intercept") & or_df["Odds Ratio"].notna()]
+    with timed("Odds ratio forest plot", FIGURE):
+        fig_forest = go.Figure()
+        fig_forest.add_trace(
+            go.Scatter(
+                x=forest_df["Odds Ratio"],
+                y=forest_df["Term"],
+                mode="markers",
+                marker=dict(color="#DC143C", size=14),
+                error_x=dict(
+                    type="data",
+                    symmetric=False,
+                    array=forest_df["OR Upper"] - forest_df["Odds Ratio"],
+                    arrayminus=forest_df["Odds Ratio"] - forest_df["OR Lower"],
+                ),
+                name="Odds Ratio (95% CI)",
+            )
+        )
+        fig_forest.add_vline(x=1, line_dash="dash", line_color="gray")
+        fig_forest.update_layout(
+            title="Adjusted Odds Ratios for Death",
+            xaxis_title="Odds Ratio (log scale)",
+            xaxis_type="log",
+            title_font=dict(size=30),
+            legend=dict(font=dict(size=26)),
+            xaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+            yaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+        )
+        st.plotly_chart(fig_forest, use_container_width=True)
+
+    st.caption(
+        f"Fitted with {fit.method} in {fit.iterations} iterations. "
+        f"Model cache: {model_cache.hits} hits, {model_cache.misses} fits."
+    )
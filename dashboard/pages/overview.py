@@ -0,0 +1,132 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from cohort_store import STORE_PATH
+from instrumentation import FIGURE, timed
+from dashboard.data import cohort_summary, get_cohort
+
+st.header("📊 Data Overview")
+summary = cohort_summary()
+
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    st.metric("Total Patients", summary.rows)
+with col2:
+    alive_count = summary.outcome_count("ALIVE")
+    st.metric("Alive", alive_count)
+with col3:
+    dead_count = summary.outcome_count("DEAD")
+    st.metric("Dead", dead_count)
+with col4:
+    survival_rate = (alive_count / summary.rows) * 100
+    st.metric("Survival Rate", f"{survival_rate:.1f}%")
+
+# Charts in two columns
+col1, col2 = st.columns(2)
+
+with col1:
+    # Outcome distribution pie chart
+    with timed("Outcome donut", FIGURE):
+        fig_pie = px.pie(
+            values=[alive_count, dead_count],
+            names=["ALIVE", "DEAD"],
+            title="Clinical Outcomes Distribution",
+            color_discrete_map={"ALIVE": "#2E8B57", "DEAD": "#DC143C"},
+            hole=0.4,
+        )
+        fig_pie.update_traces(textinfo="percent+label", textfont_size=20)
+        fig_pie.update_layout(title_font=dict(size=30), legend=dict(font=dict(size=26)))
+        st.plotly_chart(fig_pie, use_container_width=True)
+
+with col2:
+    # Gender distribution pie chart
+    male_count = summary.sex_count("MALE")
+    female_count = summary.sex_count("FEMALE")
+
+    with timed("Sex donut", FIGURE):
+        fig_gender = px.pie(
+            values=[male_count, female_count],
+            names=["MALE", "FEMALE"],
+            title="Gender Distribution",
+            color_discrete_map={"MALE": "#4169E1", "FEMALE": "#FF69B4"},
+            hole=0.4,
+        )
+        fig_gender.update_traces(textinfo="percent+label", textfont_size=20)
+        fig_gender.update_layout(
+            title_font=dict(size=30), legend=dict(font=dict(size=26))
+        )
+        st.plotly_chart(fig_gender, use_container_width=True)
+
+# Gender counts display
+st.subheader("👥 Gender Analysis")
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.metric("Male Patients", male_count)
+with col2:
+    st.metric("Female Patients", female_count)
+with col3:
+    male_percentage = (male_count / summary.rows) * 100
+    st.metric("Male Percentage", f"{male_percentage:.1f}%")
+
+# Age group analysis
+st.subheader("🎂 Age Group Analysis")
+
+age_group_counts = summary.age_group_counts()
+
+col1, col2 = st.columns(2)
+
+with col1:
+    # Age group pie chart
+    with timed("Age group donut", FIGURE):
+        fig_age_pie = px.pie(
+            values=age_group_counts.values,
+            names=age_group_counts.index,
+            title="Age Group Distribution",
+            color_discrete_sequence=["#FF6B6B", "#4ECDC4", "#45B7D1", "#96CEB4"],
+            hole=0.4,
+        )
+        fig_age_pie.update_traces(textinfo="percent+label", textfont_size=20)
+        fig_age_pie.update_layout(
+            title_font=dict(size=30), legend=dict(font=dict(size=26))
+        )
+        st.plotly_chart(fig_age_pie, use_container_width=True)
+
+with col2:
+    # Age group table
+    age_group_df = pd.DataFrame(
+        {
+            "Age Group": age_group_counts.index,
+            "Count": age_group_counts.values,
+            "Percentage": (age_group_counts.values / summary.rows * 100).round(1),
+        }
+    )
+    st.write("**Age Group Distribution Table**")
+    st.dataframe(age_group_df, use_container_width=True, hide_index=True)
+
+# Age distribution bar chart by groups
+age_outcome_df = summary.age_outcome_counts()
+
+with timed("Age group bar chart", FIGURE):
+    fig_age_bar = px.bar(
+        age_outcome_df,
+        x="Age_Group",
+        y="Count",
+        color="CLINICAL OUTCOMES",
+        title="Age Group Distribution by Clinical Outcome",
+        color_discrete_map={"ALIVE": "#2E8B57", "DEAD": "#DC143C"},
+        barmode="group",
+    )
+    fig_age_bar.update_layout(
+        title_font=dict(size=30),
+        legend=dict(font=dict(size=26)),
+        xaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+        yaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+    )
+    st.plotly_chart(fig_age_bar, use_container_width=True)
+
+# Memory footprint of the columns currently held for this cohort
+with st.expander("💾 Cohort Memory Usage"):
+    memory_df = get_cohort(STORE_PATH).memory_report()
+    st.metric("Total (KB)", f"{memory_df['Bytes'].sum() / 1024:.1f}")
+    st.dataframe(memory_df, use_container_width=True, hide_index=True)
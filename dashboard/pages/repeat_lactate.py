@@ -0,0 +1,154 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from instrumentation import FIGURE, timed
+from multiple_testing import adjust_table
+from dashboard.components import show_effect_sizes, show_most_significant
+from dashboard.data import (
+    cohort_summary,
+    group_effect_sizes,
+    group_test_family,
+    group_tests,
+    outcome_frame,
+)
+
+st.header("🔁 Repeat Lactate vs Clinical Outcomes")
+
+# Filter data
+filtered_df = outcome_frame("REPEAT LACTATE (clean)")
+
+# Per-outcome summary statistics maintained at ingestion
+alive_stats, dead_stats = cohort_summary().group_stats("REPEAT LACTATE (clean)")
+
+# Multiple Statistical Tests
+st.subheader("📊 Statistical Test Results")
+
+tests = group_tests("REPEAT LACTATE (clean)")
+
+# 1. Mann-Whitney U Test
+u_stat, p_mw, mw_method = tests.mann_whitney
+
+# 2. Welch's t-test (unequal variances)
+t_stat, p_ttest = tests.welch
+
+# 3. Kolmogorov-Smirnov test
+ks_stat, p_ks = tests.ks
+
+# 4. Permutation test of the mean difference; the same permutations
+# give the max-T adjusted p-value of every test in the table
+perm_p, max_t_p = group_test_family("REPEAT LACTATE (clean)")
+p_perm = perm_p[3]
+
+# 5. Bootstrap test of the mean difference, from the same resamples as
+# the effect sizes
+effects = group_effect_sizes("REPEAT LACTATE (clean)")
+mean_difference = effects.set_index("Effect Size").loc["Mean Difference"]
+p_boot = mean_difference["Bootstrap P"]
+
+# Create test results table
+test_results = {
+    "Test": [
+        "T-test",
+        f"Mann-Whitney U ({mw_method})",
+        "Kolmogorov-Smirnov",
+        "Permutation",
+        "Bootstrap (mean difference)",
+    ],
+    "Statistic": [
+        t_stat,
+        u_stat,
+        ks_stat,
+        mean_difference["Estimate"],
+        mean_difference["Estimate"],
+    ],
+    "P-Value": [p_ttest, p_mw, p_ks, p_perm, p_boot],
+    "Significant": [
+        "Yes" if p < 0.05 else "No" for p in [p_ttest, p_mw, p_ks, p_perm, p_boot]
+    ],
+    # Permutation and bootstrap rows test the same mean difference
+    "Max-T P": [max_t_p[0], max_t_p[1], max_t_p[2], max_t_p[3], max_t_p[3]],
+}
+
+results_df = adjust_table(pd.DataFrame(test_results))
+st.dataframe(results_df.round(4), use_container_width=True)
+show_effect_sizes(effects, "ALIVE vs DEAD")
+
+# Highlight most significant test, after correcting for the family
+show_most_significant(results_df)
+
+# Bar chart comparing mean and median values
+mean_alive = alive_stats.mean
+mean_dead = dead_stats.mean
+median_alive = alive_stats.median
+median_dead = dead_stats.median
+
+with timed("Mean/median bar chart", FIGURE):
+    fig_double_bar = go.Figure()
+    fig_double_bar.add_trace(
+        go.Bar(
+            name="ALIVE",
+            x=["Mean", "Median"],
+            y=[mean_alive, median_alive],
+            marker_color="#2E8B57",
+        )
+    )
+    fig_double_bar.add_trace(
+        go.Bar(
+            name="DEAD",
+            x=["Mean", "Median"],
+            y=[mean_dead, median_dead],
+            marker_color="#DC143C",
+        )
+    )
+    fig_double_bar.update_layout(
+        title="Repeat Lactate Statistics by Clinical Outcome",
+        yaxis_title="Repeat Lactate (mmol/L)",
+        xaxis_title="Statistic",
+        barmode="group",
+        title_font=dict(size=30),
+        legend=dict(font=dict(size=26)),
+        xaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+        yaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+    )
+    st.plotly_chart(fig_double_bar, use_container_width=True)
+
+# Pie chart showing normal vs elevated repeat lactate
+normal_threshold = 2.0  # Normal lactate threshold
+normal_lactate = len(
+    filtered_df[filtered_df["REPEAT LACTATE (clean)"] <= normal_threshold]
+)
+elevated_lactate = len(
+    filtered_df[filtered_df["REPEAT LACTATE (clean)"] > normal_threshold]
+)
+
+with timed("Normal/elevated donut", FIGURE):
+    fig_pie = px.pie(
+        values=[normal_lactate, elevated_lactate],
+        names=[f"Normal (≤{normal_threshold})", f"Elevated (>{normal_threshold})"],
+        title="Repeat Lactate Categories",
+        color_discrete_sequence=["#4ECDC4", "#FF6B6B"],
+        hole=0.4,
+    )
+    fig_pie.update_traces(textinfo="percent+label", textfont_size=20)
+    fig_pie.update_layout(title_font=dict(size=30), legend=dict(font=dict(size=26)))
+    st.plotly_chart(fig_pie, use_container_width=True)
+
+# Summary statistics
+st.subheader("📈 Summary Statistics")
+col1, col2 = st.columns(2)
+
+with col1:
+    st.write("**ALIVE Group**")
+    st.write(f"Mean: {alive_stats.mean:.2f} mmol/L")
+    st.write(f"Median: {alive_stats.median:.2f} mmol/L")
+    st.write(f"Std Dev: {alive_stats.std:.2f} mmol/L")
+    st.write(f"Count: {alive_stats.count}")
+
+with col2:
+    st.write("**DEAD Group**")
+    st.write(f"Mean: {dead_stats.mean:.2f} mmol/L")
+    st.write(f"Median: {dead_stats.median:.2f} mmol/L")
+    st.write(f"Std Dev: {dead_stats.std:.2f} mmol/L")
+    st.write(f"Count: {dead_stats.count}")
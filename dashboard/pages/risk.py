@@ -0,0 +1,97 @@
+import streamlit as st
+import plotly.graph_objects as go
+
+from instrumentation import FIGURE, TEST, timed
+from risk_score import DEFAULT_ITEMS, ITEMS, N_FOLDS
+from dashboard.data import get_score_builder, page_data
+
+df = page_data("Risk Score")
+
+st.header("🎯 Mortality Risk Score")
+
+col1, col2 = st.columns([3, 1])
+with col1:
+    items = st.multiselect("Score items", list(ITEMS), default=DEFAULT_ITEMS)
+with col2:
+    folds = st.number_input(
+        "Cross-validation folds", min_value=2, max_value=10, value=N_FOLDS
+    )
+if not items:
+    st.warning("Select at least one item.")
+else:
+    score_builder = get_score_builder()
+    with timed("Risk score cross-validation", TEST):
+        validation = score_builder.build(df, items, int(folds))
+    score = validation.score
+    cv_auc = validation.auc()
+
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        st.metric("Patients", validation.n)
+    with col2:
+        st.metric("Deaths", validation.events)
+    with col3:
+        st.metric(
+            "Cross-validated AUC",
+            f"{cv_auc['AUC']:.3f}" if cv_auc else "n/a",
+            help=(
+                f"95% CI {cv_auc['CI Lower']:.3f} to {cv_auc['CI Upper']:.3f}"
+                if cv_auc
+                else None
+            ),
+        )
+    with col4:
+        st.metric("Apparent AUC", f"{validation.apparent_auc():.3f}")
+    with col5:
+        st.metric("Brier Score", f"{validation.brier():.3f}")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("📋 Points")
+        st.dataframe(score.points_table(), use_container_width=True)
+    with col2:
+        st.subheader("📈 Score to Risk")
+        st.dataframe(score.risk_table().round(3), use_container_width=True)
+
+    # Calibration of the out-of-fold risks
+    st.subheader("⚖️ Calibration")
+    calibration_df = validation.calibration_table()
+    with timed("Calibration plot", FIGURE):
+        fig_calibration = go.Figure()
+        fig_calibration.add_trace(
+            go.Scatter(
+                x=[0, 1],
+                y=[0, 1],
+                mode="lines",
+                line=dict(color="gray", dash="dash"),
+                name="Perfect calibration",
+            )
+        )
+        fig_calibration.add_trace(
+            go.Scatter(
+                x=calibration_df["Predicted"],
+                y=calibration_df["Observed"],
+                mode="lines+markers",
+                marker=dict(color="#DC143C", size=14),
+                text=calibration_df["Patients"],
+                name="Out-of-fold risk groups",
+            )
+        )
+        fig_calibration.update_layout(
+            title="Predicted vs Observed Mortality",
+            xaxis_title="Mean Predicted Risk",
+            yaxis_title="Observed Death Rate",
+            title_font=dict(size=30),
+            legend=dict(font=dict(size=26)),
+            xaxis=dict(title_font=dict(size=28), tickfont=dict(size=26), range=[0, 1]),
+            yaxis=dict(title_font=dict(size=28), tickfont=dict(size=26), range=[0, 1]),
+        )
+        st.plotly_chart(fig_calibration, use_container_width=True)
+    st.dataframe(calibration_df.round(3), use_container_width=True)
+
+    fold_aucs = ", ".join(f"{auc:.3f}" for auc in validation.fold_aucs())
+    st.caption(
+        f"Calibration slope {validation.calibration_slope():.2f}. "
+        f"Fold AUCs: {fold_aucs}. Score cache: {score_builder.hits} hits, "
+        f"{score_builder.misses} builds."
+    )
@@ -0,0 +1,124 @@
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+
+from accumulators import SummaryStats
+from instrumentation import FIGURE, timed
+from rank_tests import mann_whitney
+from dashboard.components import show_effect_sizes
+from dashboard.data import get_effect_sizes, sepsis_clearance
+
+df2 = sepsis_clearance()
+
+st.header("🔄 SEPSIS Lactate Clearance vs Clinical Outcomes")
+
+# Filter data
+filtered_df = df2[["SEPSIS LACTATE CLEARANCE (clean)", "CLINICAL OUTCOME"]].dropna()
+alive_group = filtered_df[filtered_df["CLINICAL OUTCOME"] == "ALIVE"][
+    "SEPSIS LACTATE CLEARANCE (clean)"
+]
+dead_group = filtered_df[filtered_df["CLINICAL OUTCOME"] == "DEAD"][
+    "SEPSIS LACTATE CLEARANCE (clean)"
+]
+
+# Summary statistics for both groups in a single pass each
+alive_stats = SummaryStats.of(alive_group)
+dead_stats = SummaryStats.of(dead_group)
+
+# Mann-Whitney U Test
+u_stat, p_value, mw_method = mann_whitney(alive_group, dead_group)
+
+# Display test results
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.metric("U-Statistic", f"{u_stat:.2f}")
+with col2:
+    st.metric("P-Value", f"{p_value:.4f}")
+with col3:
+    significance = "Significant" if p_value < 0.05 else "Not Significant"
+    st.metric("Result", significance)
+st.caption(f"Mann-Whitney U p-value: {mw_method}")
+show_effect_sizes(
+    get_effect_sizes(alive_group.to_numpy(), dead_group.to_numpy()),
+    "ALIVE vs DEAD",
+)
+
+# Bar chart comparing mean values
+mean_alive = alive_stats.mean
+mean_dead = dead_stats.mean
+
+with timed("Mean bar chart", FIGURE):
+    fig_bar = go.Figure()
+    fig_bar.add_trace(
+        go.Bar(
+            x=["ALIVE", "DEAD"],
+            y=[mean_alive, mean_dead],
+            marker_color=["#2E8B57", "#DC143C"],
+            showlegend=False,
+        )
+    )
+    # Add custom legend to show color mapping
+    fig_bar.add_trace(
+        go.Scatter(
+            x=[None],
+            y=[None],
+            mode="markers",
+            marker=dict(size=10, color="#2E8B57"),
+            name="ALIVE",
+            showlegend=True,
+        )
+    )
+    fig_bar.add_trace(
+        go.Scatter(
+            x=[None],
+            y=[None],
+            mode="markers",
+            marker=dict(size=10, color="#DC143C"),
+            name="DEAD",
+            showlegend=True,
+        )
+    )
+    fig_bar.update_layout(
+        title="Mean SEPSIS Lactate Clearance by Clinical Outcome",
+        yaxis_title="Mean SEPSIS Lactate Clearance (%)",
+        xaxis_title="Clinical Outcome",
+        title_font=dict(size=30),
+        legend=dict(font=dict(size=26)),
+        xaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+        yaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+    )
+    st.plotly_chart(fig_bar, use_container_width=True)
+
+# Donut chart showing clearance categories
+good_clearance = len(filtered_df[filtered_df["SEPSIS LACTATE CLEARANCE (clean)"] >= 20])
+poor_clearance = len(filtered_df[filtered_df["SEPSIS LACTATE CLEARANCE (clean)"] < 20])
+
+with timed("Clearance category donut", FIGURE):
+    fig_pie = px.pie(
+        values=[good_clearance, poor_clearance],
+        names=["Good Clearance (≥20%)", "Poor Clearance (<20%)"],
+        title="SEPSIS Lactate Clearance Categories",
+        color_discrete_sequence=["#2E8B57", "#DC143C"],
+        hole=0.4,
+    )
+    fig_pie.update_traces(textinfo="percent+label", textfont_size=26)
+    fig_pie.update_layout(title_font=dict(size=30), legend=dict(font=dict(size=26)))
+    st.plotly_chart(fig_pie, use_container_width=True)
+
+# Summary statistics
+st.subheader("📈 Summary Statistics")
+col1, col2 = st.columns(2)
+
+with col1:
+    st.write("**ALIVE Group**")
+    st.write(f"Mean: {alive_stats.mean:.2f}%")
+    st.write(f"Median: {alive_stats.median:.2f}%")
+    st.write(f"Std Dev: {alive_stats.std:.2f}%")
+    st.write(f"Count: {alive_stats.count}")
+
+with col2:
+    st.write("**DEAD Group**")
+    st.write(f"Mean: {dead_stats.mean:.2f}%")
+    st.write(f"Median: {dead_stats.median:.2f}%")
+    st.write(f"Std Dev: {dead_stats.std:.2f}%")
+    st.write(f"Count: {dead_stats.count}")
@@ -0,0 +1,173 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from scipy.stats import chi2_contingency
+
+from cohort_store import COMORBIDITY_MASK, has_comorbidity
+from instrumentation import FIGURE, TEST, timed
+from dashboard.components import show_effect_sizes
+from dashboard.data import get_odds_ratio, page_data
+
+df = page_data("SHTN+T2DM Analysis")
+
+st.header("💔 SHTN+T2DM vs Clinical Outcomes")
+
+# Filter data for SHTN+T2DM analysis
+filtered_df = df[[COMORBIDITY_MASK, "CLINICAL OUTCOMES"]].dropna()
+
+# Check if both SHTN and T2DM are present in the K/C/O comorbidity bitmask
+filtered_df["has_SHTN_T2DM"] = has_comorbidity(filtered_df, "SHTN") | has_comorbidity(
+    filtered_df, "T2DM"
+)
+
+shtn_t2dm_group = filtered_df[filtered_df["has_SHTN_T2DM"] == True]["CLINICAL OUTCOMES"]
+no_shtn_t2dm_group = filtered_df[filtered_df["has_SHTN_T2DM"] == False][
+    "CLINICAL OUTCOMES"
+]
+
+# Create contingency table
+shtn_t2dm_alive = len(shtn_t2dm_group[shtn_t2dm_group.str.upper() == "ALIVE"])
+shtn_t2dm_dead = len(shtn_t2dm_group[shtn_t2dm_group.str.upper() == "DEAD"])
+no_shtn_t2dm_alive = len(no_shtn_t2dm_group[no_shtn_t2dm_group.str.upper() == "ALIVE"])
+no_shtn_t2dm_dead = len(no_shtn_t2dm_group[no_shtn_t2dm_group.str.upper() == "DEAD"])
+
+contingency_table = [
+    [shtn_t2dm_alive, shtn_t2dm_dead],
+    [no_shtn_t2dm_alive, no_shtn_t2dm_dead],
+]
+
+# Use Fisher's exact test if any cell has count < 5, otherwise chi-square
+with timed("Fisher/Chi-square", TEST):
+    if min(shtn_t2dm_alive, shtn_t2dm_dead, no_shtn_t2dm_alive, no_shtn_t2dm_dead) < 5:
+        from scipy.stats import fisher_exact
+
+        odds_ratio, p_chi2 = fisher_exact(contingency_table)
+        chi2_stat = odds_ratio
+        test_name = "Fisher's Exact Test"
+    else:
+        chi2_stat, p_chi2, dof, expected = chi2_contingency(contingency_table)
+        test_name = "Chi-square Test"
+
+# Display test results
+st.subheader("📊 Statistical Test Results")
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.metric(f"{test_name} Statistic", f"{chi2_stat:.4f}")
+with col2:
+    st.metric("P-Value", f"{p_chi2:.4f}")
+with col3:
+    significance = "Significant" if p_chi2 < 0.05 else "Not Significant"
+    st.metric("Result", significance)
+
+# Contingency table display
+st.subheader("📋 Contingency Table")
+contingency_df = pd.DataFrame(
+    {
+        "SHTN+T2DM": [shtn_t2dm_alive, shtn_t2dm_dead],
+        "Others": [no_shtn_t2dm_alive, no_shtn_t2dm_dead],
+    },
+    index=["ALIVE", "DEAD"],
+)
+st.dataframe(contingency_df, use_container_width=True)
+show_effect_sizes(
+    get_odds_ratio(
+        shtn_t2dm_dead, shtn_t2dm_alive, no_shtn_t2dm_dead, no_shtn_t2dm_alive
+    ),
+    "Odds of death with SHTN+T2DM vs others",
+)
+
+# Double bar chart (grouped)
+with timed("Outcome bar chart", FIGURE):
+    fig_bar = go.Figure()
+    fig_bar.add_trace(
+        go.Bar(
+            name="ALIVE",
+            x=["SHTN+T2DM", "Others"],
+            y=[shtn_t2dm_alive, no_shtn_t2dm_alive],
+            marker_color="#2E8B57",
+        )
+    )
+    fig_bar.add_trace(
+        go.Bar(
+            name="DEAD",
+            x=["SHTN+T2DM", "Others"],
+            y=[shtn_t2dm_dead, no_shtn_t2dm_dead],
+            marker_color="#DC143C",
+        )
+    )
+    fig_bar.update_layout(
+        title="Clinical Outcomes by SHTN+T2DM Status",
+        xaxis_title="Patient Group",
+        yaxis_title="Count",
+        barmode="group",
+        title_font=dict(size=30),
+        legend=dict(font=dict(size=26)),
+        xaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+        yaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+    )
+    st.plotly_chart(fig_bar, use_container_width=True)
+
+# Pie chart showing SHTN+T2DM distribution
+col1, col2 = st.columns(2)
+with col1:
+    with timed("SHTN+T2DM donut", FIGURE):
+        fig_pie_shtn = px.pie(
+            values=[
+                shtn_t2dm_alive + shtn_t2dm_dead,
+                no_shtn_t2dm_alive + no_shtn_t2dm_dead,
+            ],
+            names=["SHTN+T2DM", "Others"],
+            title="SHTN+T2DM Distribution",
+            color_discrete_sequence=["#FFD93D", "#96CEB4"],
+            hole=0.4,
+        )
+        fig_pie_shtn.update_traces(textinfo="percent+label", textfont_size=20)
+        fig_pie_shtn.update_layout(
+            title_font=dict(size=30), legend=dict(font=dict(size=26))
+        )
+        st.plotly_chart(fig_pie_shtn, use_container_width=True)
+
+with col2:
+    with timed("Outcome donut", FIGURE):
+        fig_pie_outcome = px.pie(
+            values=[
+                shtn_t2dm_alive + no_shtn_t2dm_alive,
+                shtn_t2dm_dead + no_shtn_t2dm_dead,
+            ],
+            names=["ALIVE", "DEAD"],
+            title="Overall Outcomes",
+            color_discrete_map={"ALIVE": "#2E8B57", "DEAD": "#DC143C"},
+            hole=0.4,
+        )
+        fig_pie_outcome.update_traces(textinfo="percent+label", textfont_size=20)
+        fig_pie_outcome.update_layout(
+            title_font=dict(size=30), legend=dict(font=dict(size=26))
+        )
+        st.plotly_chart(fig_pie_outcome, use_container_width=True)
+
+# Survival rates
+st.subheader("📈 Survival Rates")
+col1, col2 = st.columns(2)
+
+with col1:
+    shtn_t2dm_total = shtn_t2dm_alive + shtn_t2dm_dead
+    shtn_t2dm_survival_rate = (
+        (shtn_t2dm_alive / shtn_t2dm_total * 100) if shtn_t2dm_total > 0 else 0
+    )
+    st.write("**SHTN+T2DM Patients**")
+    st.write(f"Total: {shtn_t2dm_total}")
+    st.write(f"Alive: {shtn_t2dm_alive}")
+    st.write(f"Dead: {shtn_t2dm_dead}")
+    st.write(f"Survival Rate: {shtn_t2dm_survival_rate:.1f}%")
+
+with col2:
+    no_shtn_t2dm_total = no_shtn_t2dm_alive + no_shtn_t2dm_dead
+    no_shtn_t2dm_survival_rate = (
+        (no_shtn_t2dm_alive / no_shtn_t2dm_total * 100) if no_shtn_t2dm_total > 0 else 0
+    )
+    st.write("**Other Patients**")
+    st.write(f"Total: {no_shtn_t2dm_total}")
+    st.write(f"Alive: {no_shtn_t2dm_alive}")
+    st.write(f"Dead: {no_shtn_t2dm_dead}")
+    st.write(f"Survival Rate: {no_shtn_t2dm_survival_rate:.1f}%")
@@ -0,0 +1,87 @@
+import streamlit as st
+import numpy as np
+import plotly.graph_objects as go
+
+from instrumentation import FIGURE, TEST, timed
+from stratified import FLAGS, STRATA, StratifiedTables
+from dashboard.data import page_data
+
+df = page_data("Stratified Analysis")
+
+st.header("🧩 Stratified Analysis: Mantel-Haenszel")
+
+col1, col2 = st.columns(2)
+with col1:
+    exposure = st.selectbox("Exposure", FLAGS, index=FLAGS.index("CAD"))
+with col2:
+    strata = st.multiselect(
+        "Stratify by",
+        [s for s in STRATA if s != exposure],
+        default=["Age Group"],
+    )
+
+with timed("Stratified tables", TEST):
+    tables = StratifiedTables(df, exposure, strata)
+    mh = tables.mantel_haenszel()
+    bd = tables.breslow_day()
+
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    st.metric("Crude Odds Ratio", f"{tables.crude_odds_ratio():.3f}")
+with col2:
+    st.metric("Mantel-Haenszel OR", f"{mh['Odds Ratio']:.3f}")
+with col3:
+    st.metric("CMH P-Value", f"{mh['P-Value']:.4f}")
+with col4:
+    st.metric("Breslow-Day P-Value", f"{bd['P-Value']:.4f}")
+
+st.write(
+    f"**Pooled OR (95% CI):** {mh['Odds Ratio']:.3f} "
+    f"({mh['CI Lower']:.3f}-{mh['CI Upper']:.3f}); "
+    f"Cochran-Mantel-Haenszel χ² = {mh['Chi-square']:.3f}. "
+    f"Breslow-Day χ² = {bd['Chi-square']:.3f} on {bd['df']} df "
+    "(Tarone-corrected; a small p suggests the odds ratio differs "
+    "between strata)."
+)
+
+# Per-stratum tables
+st.subheader("📋 Stratum Tables")
+stratum_df = tables.per_stratum()
+st.dataframe(stratum_df.round(4), use_container_width=True)
+
+informative_df = stratum_df[stratum_df["Informative"]]
+stratum_names = [
+    " / ".join(map(str, label)) if isinstance(label, tuple) else str(label)
+    for label in informative_df.index
+]
+with timed("Stratum odds ratio chart", FIGURE):
+    fig_strata = go.Figure()
+    fig_strata.add_trace(
+        go.Scatter(
+            x=informative_df["Odds Ratio"],
+            y=stratum_names,
+            mode="markers",
+            marker=dict(
+                color="#4ECDC4",
+                size=8
+                + 20
+                * np.sqrt(informative_df.iloc[:, :4].sum(axis=1))
+                / np.sqrt(max(len(df), 1)),
+            ),
+            name="Stratum OR",
+        )
+    )
+    fig_strata.add_vline(
+        x=mh["Odds Ratio"], line_color="#DC143C", annotation_text="MH OR"
+    )
+    fig_strata.add_vline(x=1, line_dash="dash", line_color="gray")
+    fig_strata.update_layout(
+        title=f"{exposure}: Odds Ratio for Death by Stratum",
+        xaxis_title="Odds Ratio (log scale)",
+        xaxis_type="log",
+        title_font=dict(size=30),
+        legend=dict(font=dict(size=26)),
+        xaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+        yaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+    )
+    st.plotly_chart(fig_strata, use_container_width=True)
@@ -0,0 +1,229 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from scipy.stats import chi2_contingency
+
+from cohort_store import STORE_PATH, UNSTABLE_CRITERIA, store_version
+from instrumentation import FIGURE, TEST, timed
+from dashboard.components import show_effect_sizes
+from dashboard.data import flag_table, get_odds_ratio, get_sensitivity_grid
+
+st.header("⚠️ Unstable Hemodynamic vs Clinical Outcomes")
+
+# Contingency table of unstable hemodynamics vs outcome, over the patients
+# with every vital recorded
+contingency_table = flag_table("Unstable Hemodynamics")
+(unstable_alive, unstable_dead), (stable_alive, stable_dead) = contingency_table
+
+# Use Fisher's exact test if any cell has count < 5, otherwise chi-square
+with timed("Fisher/Chi-square", TEST):
+    if min(unstable_alive, unstable_dead, stable_alive, stable_dead) < 5:
+        from scipy.stats import fisher_exact
+
+        odds_ratio, p_chi2 = fisher_exact(contingency_table)
+        chi2_stat = odds_ratio
+        test_name = "Fisher's Exact Test"
+    else:
+        chi2_stat, p_chi2, dof, expected = chi2_contingency(contingency_table)
+        test_name = "Chi-square Test"
+
+# Display test results
+st.subheader("📊 Statistical Test Results")
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.metric(f"{test_name} Statistic", f"{chi2_stat:.4f}")
+with col2:
+    st.metric("P-Value", f"{p_chi2:.4f}")
+with col3:
+    significance = "Significant" if p_chi2 < 0.05 else "Not Significant"
+    st.metric("Result", significance)
+
+# Criteria display
+st.subheader("🩺 Unstable Hemodynamic Criteria")
+st.write("**Patients classified as unstable if ANY of the following:**")
+st.write("• SBP < 120 mmHg")
+st.write("• DBP < 80 mmHg")
+st.write("• SPO2 < 90%")
+st.write("• CBG < 75 mg/dL")
+st.write("• HR < 45 BPM")
+
+# Contingency table display
+st.subheader("📋 Contingency Table")
+contingency_df = pd.DataFrame(
+    {
+        "Unstable Hemodynamics": [unstable_alive, unstable_dead],
+        "Stable Hemodynamics": [stable_alive, stable_dead],
+    },
+    index=["ALIVE", "DEAD"],
+)
+st.dataframe(contingency_df, use_container_width=True)
+show_effect_sizes(
+    get_odds_ratio(unstable_dead, unstable_alive, stable_dead, stable_alive),
+    "Odds of death with unstable vs stable hemodynamics",
+)
+
+# Double bar chart (grouped)
+with timed("Outcome bar chart", FIGURE):
+    fig_bar = go.Figure()
+    fig_bar.add_trace(
+        go.Bar(
+            name="ALIVE",
+            x=["Unstable", "Stable"],
+            y=[unstable_alive, stable_alive],
+            marker_color="#2E8B57",
+        )
+    )
+    fig_bar.add_trace(
+        go.Bar(
+            name="DEAD",
+            x=["Unstable", "Stable"],
+            y=[unstable_dead, stable_dead],
+            marker_color="#DC143C",
+        )
+    )
+    fig_bar.update_layout(
+        title="Clinical Outcomes by Hemodynamic Status",
+        xaxis_title="Hemodynamic Status",
+        yaxis_title="Count",
+        barmode="group",
+        title_font=dict(size=30),
+        legend=dict(font=dict(size=26)),
+        xaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+        yaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+    )
+    st.plotly_chart(fig_bar, use_container_width=True)
+
+# Pie chart showing hemodynamic status distribution
+col1, col2 = st.columns(2)
+with col1:
+    with timed("Hemodynamic status donut", FIGURE):
+        fig_pie_hemo = px.pie(
+            values=[unstable_alive + unstable_dead, stable_alive + stable_dead],
+            names=["Unstable Hemodynamics", "Stable Hemodynamics"],
+            title="Hemodynamic Status Distribution",
+            color_discrete_sequence=["#FF6B6B", "#4ECDC4"],
+            hole=0.4,
+        )
+        fig_pie_hemo.update_traces(textinfo="percent+label", textfont_size=20)
+        fig_pie_hemo.update_layout(
+            title_font=dict(size=30), legend=dict(font=dict(size=26))
+        )
+        st.plotly_chart(fig_pie_hemo, use_container_width=True)
+
+with col2:
+    with timed("Outcome donut", FIGURE):
+        fig_pie_outcome = px.pie(
+            values=[unstable_alive + stable_alive, unstable_dead + stable_dead],
+            names=["ALIVE", "DEAD"],
+            title="Overall Outcomes",
+            color_discrete_map={"ALIVE": "#2E8B57", "DEAD": "#DC143C"},
+            hole=0.4,
+        )
+        fig_pie_outcome.update_traces(textinfo="percent+label", textfont_size=20)
+        fig_pie_outcome.update_layout(
+            title_font=dict(size=30), legend=dict(font=dict(size=26))
+        )
+        st.plotly_chart(fig_pie_outcome, use_container_width=True)
+
+# Survival rates
+st.subheader("📈 Survival Rates")
+col1, col2 = st.columns(2)
+
+with col1:
+    unstable_total = unstable_alive + unstable_dead
+    unstable_survival_rate = (
+        (unstable_alive / unstable_total * 100) if unstable_total > 0 else 0
+    )
+    st.write("**Unstable Hemodynamics**")
+    st.write(f"Total: {unstable_total}")
+    st.write(f"Alive: {unstable_alive}")
+    st.write(f"Dead: {unstable_dead}")
+    st.write(f"Survival Rate: {unstable_survival_rate:.1f}%")
+
+with col2:
+    stable_total = stable_alive + stable_dead
+    stable_survival_rate = (
+        (stable_alive / stable_total * 100) if stable_total > 0 else 0
+    )
+    st.write("**Stable Hemodynamics**")
+    st.write(f"Total: {stable_total}")
+    st.write(f"Alive: {stable_alive}")
+    st.write(f"Dead: {stable_dead}")
+    st.write(f"Survival Rate: {stable_survival_rate:.1f}%")
+
+# Sensitivity of the results to the instability thresholds
+st.subheader("🎛️ Threshold Sensitivity Analysis")
+grid = get_sensitivity_grid(STORE_PATH, store_version(STORE_PATH))
+st.write(
+    f"{grid.size:,} threshold combinations evaluated over {grid.n} "
+    "patients with complete vitals."
+)
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    x_vital = st.selectbox("X axis", grid.vitals, index=0)
+with col2:
+    y_vital = st.selectbox("Y axis", [v for v in grid.vitals if v != x_vital], index=0)
+with col3:
+    heatmap_metric = st.selectbox("Show", ["P-Value", "Odds Ratio"])
+
+fixed = dict(UNSTABLE_CRITERIA)
+held = [v for v in grid.vitals if v not in (x_vital, y_vital)]
+for col, vital in zip(st.columns(len(held)), held):
+    with col:
+        options = list(grid.grid[vital])
+        fixed[vital] = st.selectbox(
+            f"{vital} <",
+            options,
+            index=grid.index_of(fixed)[grid.vitals.index(vital)],
+        )
+
+if heatmap_metric == "P-Value":
+    plane = grid.plane(grid.p_value, x_vital, y_vital, fixed)
+    color_scale, midpoint = "RdYlGn", 0.05
+else:
+    plane = grid.plane(grid.odds_ratio, x_vital, y_vital, fixed)
+    color_scale, midpoint = "RdBu_r", 1
+with timed("Sensitivity heatmap", FIGURE):
+    fig_sensitivity = px.imshow(
+        plane.values,
+        x=plane.columns,
+        y=plane.index,
+        origin="lower",
+        aspect="auto",
+        text_auto=".2f",
+        color_continuous_scale=color_scale,
+        color_continuous_midpoint=midpoint,
+        labels=dict(x=f"{x_vital} <", y=f"{y_vital} <", color=heatmap_metric),
+        title=f"{heatmap_metric} of Unstable Hemodynamics vs Outcomes",
+    )
+    fig_sensitivity.add_trace(
+        go.Scatter(
+            x=[UNSTABLE_CRITERIA[x_vital]],
+            y=[UNSTABLE_CRITERIA[y_vital]],
+            mode="markers",
+            marker=dict(symbol="x", size=18, color="black"),
+            name="Current criteria",
+        )
+    )
+    fig_sensitivity.update_layout(
+        title_font=dict(size=30),
+        legend=dict(font=dict(size=26)),
+        xaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+        yaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+    )
+    st.plotly_chart(fig_sensitivity, use_container_width=True)
+
+sensitivity_df = grid.to_frame()
+st.write("**Most significant threshold combinations**")
+st.dataframe(
+    sensitivity_df.nsmallest(10, "P-Value").round(4),
+    use_container_width=True,
+)
+st.download_button(
+    label="📥 Download all combinations (CSV)",
+    data=sensitivity_df.to_csv(index=False),
+    file_name="hemodynamic_threshold_sensitivity.csv",
+    mime="text/csv",
+)
@@ -0,0 +1,179 @@
+import sys
+
+import pandas as pd
+import streamlit as st
+
+from cohort_store import STORE_PATH
+from instrumentation import (
+    KINDS,
+    LOG_PATH,
+    PROFILERS,
+    log_run,
+    nbytes,
+    peak_rss,
+    recording,
+    rss,
+)
+from dashboard.background import get_job_queue, session_jobs
+from dashboard.data import get_cohort, get_model_cache, get_score_builder
+
+# Per-run timings of the dashboard. streamlit_app.py records every run of
+# the script with page_run; the Performance panel in the sidebar shows the
+# timed blocks of the run (data loads, tests, figure builds, the page as a
+# whole) and those of this session's background jobs, can run a profiler
+# or trace memory over the next runs and append every run to a JSONL log.
+# Its Memory section shows the process's resident set size and the bytes
+# held by each cache, the figures to set eviction limits from.
+
+# Session state keys of the panel's settings
+PROFILER = "perf_profiler"
+LOGGING = "perf_logging"
+MEMORY = "perf_memory"
+CACHES = "perf_caches"
+
+MB = 2**20
+
+
+def page_run(page_title):
+    # Records one run of the app, with the profiler and memory tracing
+    # chosen in the panel
+    profiler = st.session_state.get(PROFILER)
+    return recording(
+        page_title,
+        None if profiler == "Off" else profiler,
+        memory=st.session_state.get(MEMORY, False),
+    )
+
+
+def timings_table(run):
+    # Timed blocks in the order they started, nested blocks marked by depth;
+    # with memory tracing, the MB each block left allocated and its peak
+    rows = []
+    for timing in run.ordered():
+        row = {
+            "Block": "· " * timing.depth + timing.name,
+            "Kind": timing.kind,
+            "ms": round(timing.seconds * 1000, 1),
+        }
+        if run.memory:
+            row["Kept MB"] = round(timing.allocated / MB, 2)
+            row["Peak MB"] = round(timing.peak / MB, 2)
+        rows.append(row)
+    columns = ["Block", "Kind", "ms"] + (["Kept MB", "Peak MB"] if run.memory else [])
+    return pd.DataFrame(rows, columns=columns)
+
+
+def streamlit_cache_sizes():
+    # (cache, entries, bytes) of the st.cache_data and st.cache_resource
+    # functions, from the server's cache statistics (empty without a server)
+    from streamlit import runtime
+    from streamlit.runtime.stats import CACHE_MEMORY_FAMILY
+
+    if not runtime.exists():
+        return []
+    stats = runtime.get_instance().stats_mgr.get_stats([CACHE_MEMORY_FAMILY])
+    sizes = {}
+    for stat in stats.get(CACHE_MEMORY_FAMILY, []):
+        name = f"{stat.category_name}: {stat.cache_name.rsplit('.', 1)[-1]}"
+        entries, size = sizes.get(name, (0, 0))
+        sizes[name] = (entries + 1, size + stat.byte_length)
+    return [(name, *totals) for name, totals in sizes.items()]
+
+
+def cache_sizes():
+    # Bytes held by every process-wide cache, largest first. The model and
+    # score caches can only hold entries once their engines are imported,
+    # and are not created (importing statsmodels) just to be measured.
+    cohort = get_cohort(STORE_PATH).memory_report()
+    rows = streamlit_cache_sizes()
+    rows.append(("Cohort columns", len(cohort), int(cohort["Bytes"].sum())))
+    if "mortality_model" in sys.modules:
+        fits = get_model_cache().entries()
+        rows.append(("Fitted models", len(fits), nbytes(fits)))
+    if "risk_score" in sys.modules:
+        results = get_score_builder().entries()
+        rows.append(("Risk scores", len(results), nbytes(results)))
+    jobs = [job for job in get_job_queue().jobs.values() if not job.active]
+    rows.append(("Job results", len(jobs), sum(job.result_bytes or 0 for job in jobs)))
+    table = pd.DataFrame(rows, columns=["Cache", "Entries", "Bytes"])
+    table["MB"] = (table["Bytes"] / MB).round(2)
+    return table.sort_values("Bytes", ascending=False, ignore_index=True)
+
+
+def memory_section(run):
+    st.markdown("**Memory**")
+    col1, col2 = st.columns(2)
+    col1.metric("Resident", f"{rss() / MB:.0f} MB")
+    peak = peak_rss()
+    col2.metric("Peak", f"{peak / MB:.0f} MB" if peak else "n/a")
+    # Sizing the caches walks every entry, so it is only done on request
+    if st.checkbox("Measure cache sizes", key=CACHES):
+        st.dataframe(cache_sizes(), hide_index=True, use_container_width=True)
+    if run.memory:
+        st.caption(
+            f"This run kept {run.allocated / MB:.2f} MB of Python allocations "
+            f"(peak {run.peak / MB:.2f} MB); lines whose allocations grew:"
+        )
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    (
+                        allocation.line,
+                        round(allocation.size / 1024, 1),
+                        allocation.count,
+                    )
+                    for allocation in run.allocations
+                ],
+                columns=["Line", "KB", "Blocks"],
+            ),
+            hide_index=True,
+            use_container_width=True,
+        )
+
+
+def performance_panel(run):
+    if st.session_state.get(LOGGING):
+        log_run(run)
+
+    st.markdown("---")
+    with st.expander("⏱ Performance"):
+        st.metric("Last run", f"{run.seconds * 1000:.0f} ms")
+        totals = run.totals()
+        st.caption(
+            " · ".join(f"{kind} {totals[kind] * 1000:.0f} ms" for kind in KINDS[:-1])
+        )
+        st.dataframe(timings_table(run), hide_index=True, use_container_width=True)
+
+        jobs = [job for job in session_jobs() if job.timings is not None]
+        for job in reversed(jobs):
+            if job.timings.seconds is None:
+                continue
+            st.markdown(f"**{job.name}** · {job.timings.seconds:.2f} s")
+            if job.rss is not None and job.rss.end is not None:
+                result = (job.result_bytes or 0) / MB
+                st.caption(
+                    f"Resident peak {job.rss.peak / MB:.0f} MB "
+                    f"(+{job.rss.growth / MB:.1f} MB); result {result:.2f} MB"
+                )
+            st.dataframe(
+                timings_table(job.timings), hide_index=True, use_container_width=True
+            )
+
+        memory_section(run)
+
+        st.selectbox(
+            "Profile the next runs with",
+            ["Off"] + PROFILERS,
+            key=PROFILER,
+            help="pyinstrument is offered when installed",
+        )
+        if run.profile:
+            st.code(run.profile, language=None)
+        st.checkbox(
+            "Trace memory of the next runs",
+            key=MEMORY,
+            help="tracemalloc: per-block allocations and the lines whose "
+            "allocations grew; runs are slower while tracing",
+        )
+        st.checkbox(f"Append runs to {LOG_PATH}", key=LOGGING)
+        st.caption(f"python instrumentation.py {LOG_PATH} summarises the log")
@@ -0,0 +1,397 @@
+import io
+import os
+import tempfile
+import zipfile
+
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from instrumentation import EXPORT, timed
+from jobs import Download
+from dashboard.background import start_job
+from dashboard.data import EXPORT_COLUMNS, cohort_columns, cohort_summary
+
+# Sidebar tools shown under the page navigation, called inside the sidebar
+# container. Each tool is a fragment, so its buttons rerun only the tool,
+# not the page with its resampling tests. The exports and the bordering run
+# as background jobs started from the button callbacks; their results are
+# downloaded from the jobs panel.
+
+
+def border_pdf(data, file_name, progress=None):
+    # Create temporary files
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_input:
+        tmp_input.write(data)
+        tmp_input_path = tmp_input.name
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_output:
+        tmp_output_path = tmp_output.name
+
+    try:
+        # Add borders
+        from pdf_borders import add_word_style_borders
+
+        with timed("Add borders", EXPORT):
+            add_word_style_borders(tmp_input_path, tmp_output_path, progress=progress)
+
+        # Read the processed file
+        with open(tmp_output_path, "rb") as f:
+            processed_pdf = f.read()
+    finally:
+        # Clean up temporary files
+        os.unlink(tmp_input_path)
+        os.unlink(tmp_output_path)
+    return Download(processed_pdf, f"bordered_{file_name}", "application/pdf")
+
+
+def start_bordering():
+    uploaded_file = st.session_state.border_pdf
+    start_job(
+        f"Borders: {uploaded_file.name}",
+        border_pdf,
+        uploaded_file.getvalue(),
+        uploaded_file.name,
+    )
+
+
+@st.fragment
+def pdf_border_tool():
+    st.markdown("---")
+    st.subheader("📄 PDF Border Tool")
+
+    uploaded_file = st.file_uploader("Upload PDF", type="pdf", key="border_pdf")
+    if uploaded_file is not None:
+        st.button("Add Borders", type="primary", on_click=start_bordering)
+
+
+# Function to convert plotly figure to PNG image with enhanced font sizes
+def fig_to_png(fig, width=1200, height=800, scale=3):
+    # Make a copy of the figure to avoid modifying the original
+    fig_copy = fig.update_layout(
+        font=dict(size=28),  # Increase base font size
+        title_font=dict(size=32),  # Increase title font size
+        legend=dict(font=dict(size=28)),  # Increase legend font size
+        xaxis=dict(title_font=dict(size=30), tickfont=dict(size=26)),  # X-axis fonts
+        yaxis=dict(title_font=dict(size=30), tickfont=dict(size=26)),  # Y-axis fonts
+    )
+    # Higher scale for better resolution
+    img_bytes = fig_copy.to_image(format="png", width=width, height=height, scale=scale)
+    return img_bytes
+
+
+def current_graphs(analysis_type):
+    # (file name, figure) pairs of the current page's graphs
+    figures = []
+    # Generate graphs based on current analysis type
+    if analysis_type == "Overview":
+        summary = cohort_summary()
+
+        # Clinical outcomes pie chart
+        alive_count = summary.outcome_count("ALIVE")
+        dead_count = summary.outcome_count("DEAD")
+        fig_outcomes = px.pie(
+            values=[alive_count, dead_count],
+            names=["ALIVE", "DEAD"],
+            title="Clinical Outcomes Distribution",
+            color_discrete_map={"ALIVE": "#2E8B57", "DEAD": "#DC143C"},
+        )
+        fig_outcomes.update_traces(textinfo="percent+label", textfont_size=20)
+        fig_outcomes.update_layout(
+            title_font=dict(size=30), legend=dict(font=dict(size=26))
+        )
+        figures.append(("Clinical_Outcomes_Distribution", fig_outcomes))
+
+        # Gender distribution pie chart
+        male_count = summary.sex_count("MALE")
+        female_count = summary.sex_count("FEMALE")
+        fig_gender = px.pie(
+            values=[male_count, female_count],
+            names=["MALE", "FEMALE"],
+            title="Gender Distribution",
+            color_discrete_map={"MALE": "#4169E1", "FEMALE": "#FF69B4"},
+        )
+        fig_gender.update_traces(textinfo="percent+label", textfont_size=20)
+        fig_gender.update_layout(
+            title_font=dict(size=30), legend=dict(font=dict(size=26))
+        )
+        figures.append(("Gender_Distribution", fig_gender))
+
+        # Age group distribution
+        age_group_counts = summary.age_group_counts()
+        fig_age_pie = px.pie(
+            values=age_group_counts.values,
+            names=age_group_counts.index,
+            title="Age Group Distribution",
+            color_discrete_sequence=[
+                "#FF6B6B",
+                "#4ECDC4",
+                "#45B7D1",
+                "#96CEB4",
+            ],
+        )
+        fig_age_pie.update_traces(textinfo="percent+label", textfont_size=20)
+        fig_age_pie.update_layout(
+            title_font=dict(size=30), legend=dict(font=dict(size=26))
+        )
+        figures.append(("Age_Group_Distribution", fig_age_pie))
+
+        # Age distribution bar chart
+        age_outcome_df = summary.age_outcome_counts()
+        fig_age_bar = px.bar(
+            age_outcome_df,
+            x="Age_Group",
+            y="Count",
+            color="CLINICAL OUTCOMES",
+            title="Age Group Distribution by Clinical Outcome",
+            color_discrete_map={"ALIVE": "#2E8B57", "DEAD": "#DC143C"},
+            barmode="group",
+        )
+        fig_age_bar.update_layout(
+            title_font=dict(size=30),
+            legend=dict(font=dict(size=26)),
+            xaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+            yaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+        )
+        figures.append(("Age_Group_Distribution_by_Clinical_Outcome", fig_age_bar))
+
+    elif analysis_type == "Initial Lactate Analysis":
+        # Filter data
+        filtered_df = cohort_columns("INITIAL LACTATE (clean)", "CLINICAL OUTCOMES")[
+            ["INITIAL LACTATE (clean)", "CLINICAL OUTCOMES"]
+        ].dropna()
+        alive_group = filtered_df[filtered_df["CLINICAL OUTCOMES"] == "ALIVE"][
+            "INITIAL LACTATE (clean)"
+        ]
+        dead_group = filtered_df[filtered_df["CLINICAL OUTCOMES"] == "DEAD"][
+            "INITIAL LACTATE (clean)"
+        ]
+
+        # Bar chart
+        mean_alive = alive_group.mean()
+        mean_dead = dead_group.mean()
+        fig_bar = go.Figure()
+        fig_bar.add_trace(
+            go.Bar(
+                x=["ALIVE", "DEAD"],
+                y=[mean_alive, mean_dead],
+                marker_color=["#2E8B57", "#DC143C"],
+                name="Mean Initial Lactate",
+            )
+        )
+        fig_bar.update_layout(
+            title="Mean Initial Lactate by Clinical Outcome",
+            yaxis_title="Mean Initial Lactate (mmol/L)",
+            xaxis_title="Clinical Outcome",
+            title_font=dict(size=30),
+            legend=dict(font=dict(size=26)),
+            xaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+            yaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+        )
+        figures.append(("Mean_Initial_Lactate_by_Clinical_Outcome", fig_bar))
+
+        # Donut chart
+        lactate_threshold = filtered_df["INITIAL LACTATE (clean)"].median()
+        high_lactate = len(
+            filtered_df[filtered_df["INITIAL LACTATE (clean)"] > lactate_threshold]
+        )
+        low_lactate = len(
+            filtered_df[filtered_df["INITIAL LACTATE (clean)"] <= lactate_threshold]
+        )
+        fig_pie = px.pie(
+            values=[high_lactate, low_lactate],
+            names=[
+                f"High (>{lactate_threshold:.1f})",
+                f"Low (≤{lactate_threshold:.1f})",
+            ],
+            title="Initial Lactate Distribution (High vs Low)",
+            color_discrete_sequence=["#FF6B6B", "#4ECDC4"],
+        )
+        fig_pie.update_traces(textinfo="percent+label", textfont_size=20)
+        fig_pie.update_layout(title_font=dict(size=30), legend=dict(font=dict(size=26)))
+        figures.append(("Initial_Lactate_Distribution", fig_pie))
+
+    # Add more conditions for other analysis types as needed
+    return figures
+
+
+def all_graphs():
+    figures = []
+    # Generate all key graphs
+    export_df = cohort_columns(*EXPORT_COLUMNS)
+    summary = cohort_summary()
+    alive_count = summary.outcome_count("ALIVE")
+    dead_count = summary.outcome_count("DEAD")
+    male_count = summary.sex_count("MALE")
+    female_count = summary.sex_count("FEMALE")
+
+    # Overview graphs
+    fig1 = px.pie(
+        values=[alive_count, dead_count],
+        names=["ALIVE", "DEAD"],
+        title="Clinical Outcomes Distribution",
+        color_discrete_map={"ALIVE": "#2E8B57", "DEAD": "#DC143C"},
+    )
+    fig1.update_traces(textinfo="percent+label", textfont_size=20)
+    fig1.update_layout(title_font=dict(size=30), legend=dict(font=dict(size=26)))
+    figures.append(("01_Clinical_Outcomes_Distribution", fig1))
+
+    fig2 = px.pie(
+        values=[male_count, female_count],
+        names=["MALE", "FEMALE"],
+        title="Gender Distribution",
+        color_discrete_map={"MALE": "#4169E1", "FEMALE": "#FF69B4"},
+    )
+    fig2.update_traces(textinfo="percent+label", textfont_size=20)
+    fig2.update_layout(title_font=dict(size=30), legend=dict(font=dict(size=26)))
+    figures.append(("02_Gender_Distribution", fig2))
+
+    # Age group analysis
+    age_group_counts = summary.age_group_counts()
+    fig3 = px.pie(
+        values=age_group_counts.values,
+        names=age_group_counts.index,
+        title="Age Group Distribution",
+        color_discrete_sequence=[
+            "#FF6B6B",
+            "#4ECDC4",
+            "#45B7D1",
+            "#96CEB4",
+        ],
+    )
+    fig3.update_traces(textinfo="percent+label", textfont_size=20)
+    fig3.update_layout(title_font=dict(size=30), legend=dict(font=dict(size=26)))
+    figures.append(("03_Age_Group_Distribution", fig3))
+
+    # Initial Lactate analysis
+    filtered_df = export_df[["INITIAL LACTATE (clean)", "CLINICAL OUTCOMES"]].dropna()
+    alive_group = filtered_df[filtered_df["CLINICAL OUTCOMES"] == "ALIVE"][
+        "INITIAL LACTATE (clean)"
+    ]
+    dead_group = filtered_df[filtered_df["CLINICAL OUTCOMES"] == "DEAD"][
+        "INITIAL LACTATE (clean)"
+    ]
+
+    fig4 = go.Figure()
+    fig4.add_trace(
+        go.Bar(
+            x=["ALIVE", "DEAD"],
+            y=[alive_group.mean(), dead_group.mean()],
+            marker_color=["#2E8B57", "#DC143C"],
+        )
+    )
+    fig4.update_layout(
+        title="Mean Initial Lactate by Clinical Outcome",
+        yaxis_title="Initial Lactate (mmol/L)",
+        xaxis_title="Clinical Outcome",
+        title_font=dict(size=30),
+        legend=dict(font=dict(size=26)),
+        xaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+        yaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+    )
+    figures.append(("04_Mean_Initial_Lactate_by_Clinical_Outcome", fig4))
+
+    # Lactate Clearance analysis
+    clearance_df = export_df[
+        ["LACTATE CLEARANCE (clean)", "CLINICAL OUTCOMES"]
+    ].dropna()
+    clearance_alive = clearance_df[
+        clearance_df["CLINICAL OUTCOMES"].str.upper() == "ALIVE"
+    ]["LACTATE CLEARANCE (clean)"]
+    clearance_dead = clearance_df[
+        clearance_df["CLINICAL OUTCOMES"].str.upper() == "DEAD"
+    ]["LACTATE CLEARANCE (clean)"]
+
+    fig5 = go.Figure()
+    fig5.add_trace(
+        go.Bar(
+            name="ALIVE",
+            x=["Mean", "Median"],
+            y=[clearance_alive.mean(), clearance_alive.median()],
+            marker_color="#2E8B57",
+        )
+    )
+    fig5.add_trace(
+        go.Bar(
+            name="DEAD",
+            x=["Mean", "Median"],
+            y=[clearance_dead.mean(), clearance_dead.median()],
+            marker_color="#DC143C",
+        )
+    )
+    fig5.update_layout(
+        title="Lactate Clearance Statistics by Clinical Outcome",
+        barmode="group",
+        title_font=dict(size=30),
+        legend=dict(font=dict(size=26)),
+        xaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+        yaxis=dict(title_font=dict(size=28), tickfont=dict(size=26)),
+    )
+    figures.append(("05_Lactate_Clearance_Statistics_by_Clinical_Outcome", fig5))
+    return figures
+
+
+def zip_figures(figures, file_name, html_fallback=False, progress=None):
+    # PNG export of every figure into one zip, reporting after each; with
+    # html_fallback a figure that cannot be exported is saved as HTML
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for done, (filename, fig) in enumerate(figures):
+            if progress:
+                progress(done, len(figures), filename)
+            try:
+                with timed(f"{filename}.png", EXPORT):
+                    zip_file.writestr(f"{filename}.png", fig_to_png(fig))
+            except Exception as e:
+                if not html_fallback:
+                    raise
+                # Fallback: save as HTML if image export fails
+                with timed(f"{filename}.html", EXPORT):
+                    zip_file.writestr(f"{filename}.html", fig.to_html().encode())
+                print(f"Error exporting {filename}: {str(e)}")
+    return Download(zip_buffer.getvalue(), file_name, "application/zip")
+
+
+def export_current_graphs(analysis_type):
+    figures = current_graphs(analysis_type)
+    if figures:
+        start_job(
+            f"{analysis_type} graphs",
+            zip_figures,
+            figures,
+            f"{analysis_type.replace(' ', '_')}_graphs.zip",
+        )
+
+
+def export_all_graphs():
+    start_job(
+        "All graphs",
+        zip_figures,
+        all_graphs(),
+        "medical_analysis_graphs.zip",
+        html_fallback=True,
+    )
+
+
+@st.fragment
+def download_current_graphs(analysis_type):
+    # Download functionality
+    st.markdown("---")
+    st.subheader("📥 Download Graphs")
+
+    # Create download button for current graph; the export starts in the
+    # callback, so the button only reads as pressed when there was nothing
+    # to export
+    if st.button(
+        "Download Current Graphs",
+        on_click=export_current_graphs,
+        args=(analysis_type,),
+    ):
+        st.info("No graphs to export on this page yet")
+
+
+@st.fragment
+def download_all_graphs():
+    # Download button
+    st.markdown("---")
+    st.subheader("📥 Download Graphs")
+    st.button("Download All Graphs", type="primary", on_click=export_all_graphs)
@@ -0,0 +1,286 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+from roc import SortedOutcomes, auc_from_groups
+
+# Two-sample effect sizes with BCa bootstrap intervals. Each sample is a set
+# of distinct values with counts (raw data is folded into its distinct
+# values, so costs grow with those rather than with patients), and every
+# statistic is written as a function of per-value weights (w1, w2), one row
+# per replicate: the counts themselves give the estimate, a resample gives how
+# often each value was drawn, and a jackknife replicate removes one patient.
+# One resample matrix per comparison therefore drives every effect size, and
+# each extra statistic costs a pass over the weights rather than a new
+# bootstrap.
+
+N_BOOT = 10000
+# Fewer replicates where each one is costly: a table draws no more than
+# about REPLICATE_BUDGET weights in all, and never fewer than MIN_BOOT
+# replicates
+REPLICATE_BUDGET = 2**25
+MIN_BOOT = 1000
+
+# The Hodges-Lehmann shift weighs every pair of distinct values, so it is
+# left out by default above this many pairs
+HL_PAIRS = 2**14
+
+# Replicates are processed in blocks of about this many weights
+BOOTSTRAP_BLOCK = 2**22
+
+
+class EffectSizes(ABC):
+    # Statistics comparing x with y (positive when x tends to be larger).
+    # Subclasses name the statistics and compute them in evaluate.
+
+    names = []
+    # Value of each statistic when the groups do not differ
+    nulls = []
+
+    def __init__(self, x, y, x_counts=None, y_counts=None):
+        self.x, self.x_counts = self._sample(x, x_counts)
+        self.y, self.y_counts = self._sample(y, y_counts)
+
+    @staticmethod
+    def _sample(values, counts):
+        values = np.asarray(values, dtype=np.float64)
+        if counts is None:
+            counts = np.ones(len(values), dtype=np.int64)
+        # Patients sharing a value are one value weighted by their number
+        values, inverse = np.unique(values, return_inverse=True)
+        counts = np.bincount(
+            inverse, weights=np.asarray(counts, dtype=np.int64), minlength=len(values)
+        ).astype(np.int64)
+        return values[counts > 0], counts[counts > 0]
+
+    @property
+    def sizes(self):
+        return int(self.x_counts.sum()), int(self.y_counts.sum())
+
+    @property
+    def pair_cost(self):
+        # Weights touched per replicate, for sizing blocks
+        return len(self.x) + len(self.y)
+
+    @abstractmethod
+    def evaluate(self, w1, w2):
+        # (statistics, replicates) array from per-value weights, one row of
+        # w1 and w2 per replicate
+        pass
+
+    def estimate(self):
+        return self.evaluate(self.x_counts[None, :], self.y_counts[None, :])[:, 0]
+
+
+class ContinuousEffects(EffectSizes):
+    # The Hodges-Lehmann shift needs every pair of distinct values, so by
+    # default (hodges_lehmann=None) it is only included up to HL_PAIRS pairs
+
+    def __init__(self, x, y, x_counts=None, y_counts=None, hodges_lehmann=None):
+        super().__init__(x, y, x_counts, y_counts)
+        if hodges_lehmann is None:
+            hodges_lehmann = len(self.x) * len(self.y) <= HL_PAIRS
+        self.hodges_lehmann = hodges_lehmann
+        self.names = ["Mean Difference"]
+        if hodges_lehmann:
+            self.names.append("Hodges-Lehmann Shift")
+        self.names.append("Cliff's Delta")
+        self.nulls = [0.0] * len(self.names)
+
+        # Pooled values sorted once for the rank statistics
+        pooled = np.concatenate([self.x, self.y])
+        self.order = np.argsort(-pooled)
+        self.sorted = SortedOutcomes(
+            pooled[self.order], self.order < len(self.x), presorted=True
+        )
+
+        # All pairwise differences x_i - y_j sorted once; the Hodges-Lehmann
+        # shift of a replicate is their median weighted by w1_i * w2_j
+        if hodges_lehmann:
+            differences = self.x[:, None] - self.y[None, :]
+            pair_order = np.argsort(differences, axis=None)
+            self.differences = differences.ravel()[pair_order]
+            self.pair_i, self.pair_j = np.unravel_index(pair_order, differences.shape)
+
+    @property
+    def pair_cost(self):
+        if self.hodges_lehmann:
+            return len(self.x) * len(self.y)
+        return len(self.x) + len(self.y)
+
+    def evaluate(self, w1, w2):
+        w1 = w1.astype(np.float64)
+        w2 = w2.astype(np.float64)
+        statistics = [(w1 @ self.x) / w1.sum(axis=1) - (w2 @ self.y) / w2.sum(axis=1)]
+
+        if self.hodges_lehmann:
+            pair_weights = w1[:, self.pair_i] * w2[:, self.pair_j]
+            cumulative = np.cumsum(pair_weights, axis=1)
+            half = cumulative[:, -1:] / 2
+            lower = np.argmax(cumulative >= half, axis=1)
+            upper = np.argmax(cumulative > half, axis=1)
+            statistics.append((self.differences[lower] + self.differences[upper]) / 2)
+
+        # P(X > Y) + P(X = Y) / 2 over the weighted pairs, as the ROC AUC
+        # with x as the positive group. For two independent samples the
+        # rank-biserial correlation 2 U / (n1 n2) - 1 is the same quantity,
+        # so it is not computed separately.
+        weights = np.concatenate([w1, w2], axis=1)[:, self.order]
+        cliffs_delta = 2 * auc_from_groups(*self.sorted.grouped(weights)) - 1
+        return np.stack(statistics + [cliffs_delta])
+
+
+class OddsRatioEffect(EffectSizes):
+    # Odds of an event in the exposed (x) vs unexposed (y) group from 2x2
+    # counts, Haldane-corrected for empty cells; each sample has two values,
+    # 1 for the event and 0 otherwise
+
+    names = ["Odds Ratio"]
+    nulls = [1.0]
+
+    def __init__(
+        self, exposed_events, exposed_other, unexposed_events, unexposed_other
+    ):
+        super().__init__(
+            [1.0, 0.0],
+            [1.0, 0.0],
+            [exposed_events, exposed_other],
+            [unexposed_events, unexposed_other],
+        )
+
+    def evaluate(self, w1, w2):
+        a = w1 @ self.x
+        b = w1.sum(axis=1) - a
+        c = w2 @ self.y
+        d = w2.sum(axis=1) - c
+        cells = np.stack([a, b, c, d]).astype(np.float64)
+        cells = np.where((cells == 0).any(axis=0), cells + 0.5, cells)
+        return (cells[0] * cells[3] / (cells[1] * cells[2]))[None, :]
+
+
+def _resample(rng, counts, rows):
+    # How often each value is drawn in rows resamples of the sample's
+    # patients with replacement (the resample index matrix, folded)
+    n = counts.sum()
+    return rng.multinomial(n, counts / n, size=rows)
+
+
+def replicate_count(effects, n_boot=N_BOOT):
+    # n_boot, lowered to fit REPLICATE_BUDGET where replicates are costly
+    affordable = REPLICATE_BUDGET // max(effects.pair_cost, 1)
+    return int(min(n_boot, max(MIN_BOOT, affordable)))
+
+
+def bootstrap_replicates(effects, n_boot=N_BOOT, seed=0):
+    # (statistics, n_boot) array; the groups are resampled separately so
+    # their sizes stay fixed
+    rng = np.random.default_rng(seed)
+    block = max(1, BOOTSTRAP_BLOCK // max(effects.pair_cost, 1))
+    replicates = [np.empty((len(effects.names), 0))]
+    for start in range(0, n_boot, block):
+        rows = min(block, n_boot - start)
+        replicates.append(
+            effects.evaluate(
+                _resample(rng, effects.x_counts, rows),
+                _resample(rng, effects.y_counts, rows),
+            )
+        )
+    return np.concatenate(replicates, axis=1)
+
+
+def jackknife_acceleration(effects):
+    # BCa acceleration from leave-one-out replicates of each sample, combined
+    # across the two samples as in scipy.stats.bootstrap. Leaving out any of
+    # the patients sharing a value gives the same replicate, so there is one
+    # replicate per distinct value, weighted by its count.
+    block = max(1, BOOTSTRAP_BLOCK // max(effects.pair_cost, 1))
+    base = [effects.x_counts, effects.y_counts]
+    numerator, denominator = 0.0, 0.0
+    for sample, counts in enumerate(base):
+        n = counts.sum()
+        replicates = []
+        for start in range(0, len(counts), block):
+            stop = min(len(counts), start + block)
+            weights = [np.tile(c, (stop - start, 1)) for c in base]
+            weights[sample][np.arange(stop - start), np.arange(start, stop)] -= 1
+            replicates.append(effects.evaluate(*weights))
+        replicates = np.concatenate(replicates, axis=1)
+        mean = (replicates * counts).sum(axis=1, keepdims=True) / n
+        u = (n - 1) * (mean - replicates)
+        numerator = numerator + (counts * u**3).sum(axis=1) / n**3
+        denominator = denominator + (counts * u**2).sum(axis=1) / n**2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        acceleration = numerator / (6 * denominator**1.5)
+    return np.nan_to_num(acceleration)
+
+
+def _share_below(replicates, value):
+    # Share of replicates below value, ties counted half
+    return ((replicates < value).mean() + (replicates <= value).mean()) / 2
+
+
+def bca_interval(estimate, replicates, acceleration, confidence=0.95):
+    replicates = replicates[np.isfinite(replicates)]
+    if not len(replicates):
+        return np.nan, np.nan
+    bias = norm.ppf(_share_below(replicates, estimate))
+    alpha = (1 - confidence) / 2
+    z = norm.ppf([alpha, 1 - alpha])
+    levels = norm.cdf(bias + (bias + z) / (1 - acceleration * (bias + z)))
+    if not np.isfinite(levels).all():
+        # Estimate outside the bootstrap distribution: percentile interval
+        levels = np.array([alpha, 1 - alpha])
+    low, high = np.quantile(replicates, levels)
+    return float(low), float(high)
+
+
+def bca_pvalue(estimate, replicates, acceleration, null=0.0):
+    # Two-sided p-value from inverting the BCa interval: the smallest
+    # 1 - confidence at which the interval excludes the null value. B
+    # replicates cannot resolve p-values below 1 / (B + 1), which is
+    # returned when the null value lies outside all of them.
+    replicates = replicates[np.isfinite(replicates)]
+    if not len(replicates):
+        return np.nan
+    floor = 1 / (len(replicates) + 1)
+    below = _share_below(replicates, null)
+    if below in (0.0, 1.0):
+        return floor
+    bias = norm.ppf(_share_below(replicates, estimate))
+    shift = norm.ppf(below) - bias
+    z = shift / (1 + acceleration * shift) - bias
+    if not np.isfinite(z):
+        z = norm.ppf(below)
+    return float(min(1.0, max(floor, 2 * norm.sf(abs(z)))))
+
+
+def effect_size_table(effects, n_boot=N_BOOT, confidence=0.95, seed=0):
+    columns = ["Effect Size", "Estimate", "CI Lower", "CI Upper", "Bootstrap P"]
+    if min(effects.sizes) < 2:
+        return pd.DataFrame(
+            [[name] + [np.nan] * 4 for name in effects.names], columns=columns
+        )
+    replicates = bootstrap_replicates(effects, replicate_count(effects, n_boot), seed)
+    acceleration = jackknife_acceleration(effects)
+    rows = []
+    for name, null, estimate, boot, accel in zip(
+        effects.names, effects.nulls, effects.estimate(), replicates, acceleration
+    ):
+        low, high = bca_interval(estimate, boot, accel, confidence)
+        rows.append(
+            [name, estimate, low, high, bca_pvalue(estimate, boot, accel, null)]
+        )
+    return pd.DataFrame(rows, columns=columns)
+
+
+def effect_row(table, name):
+    # One effect size with its interval, for a column block in another table
+    row = table[table["Effect Size"] == name].iloc[0]
+    return {
+        "Effect Size": name,
+        "Estimate": row["Estimate"],
+        "CI Lower": row["CI Lower"],
+        "CI Upper": row["CI Upper"],
+    }
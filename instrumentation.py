@@ -0,0 +1,416 @@
+import argparse
+import contextvars
+import io
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from collections import namedtuple
+from contextlib import contextmanager
+from importlib.util import find_spec
+
+# Timers for the hot paths of a dashboard run: data loading, the statistical
+# tests, the figure builds and the exports. A run is recorded with
+#
+#     with recording("Combined Analysis") as run:
+#         with timed("Mann-Whitney U", TEST):
+#             ...
+#
+# and timed blocks (also usable as function decorators) add a Timing to the
+# run recorded in the current thread; outside a recording they only cost a
+# context-variable lookup. A recording can also run a profiler over the
+# whole run. Runs can be appended to a JSONL log, summarised by
+#
+#     python instrumentation.py perf_log.jsonl
+#
+# A recording with memory=True also traces Python allocations (tracemalloc):
+# every block records the bytes it left allocated and its peak, and the run
+# keeps the source lines whose allocations grew the most, which is where a
+# leak shows up. Tracing is process-wide, so the figures are exact when one
+# traced run is going on at a time. sampled_rss follows the resident set
+# size over a block, which also counts memory allocated outside Python
+# (Arrow, PyMuPDF, the image exporter).
+
+LOAD = "load"
+TEST = "test"
+FIGURE = "figure"
+EXPORT = "export"
+PAGE = "page"
+KINDS = [LOAD, TEST, FIGURE, EXPORT, PAGE]
+
+LOG_PATH = "perf_log.jsonl"
+
+# Functions listed in a cProfile report
+PROFILE_LINES = 40
+
+# Source lines listed in a run's allocation growth, and the stack depth
+# traced to find the line of this code base behind each allocation
+ALLOCATION_LINES = 15
+TRACE_FRAMES = 25
+
+# Seconds between resident set size samples
+RSS_INTERVAL = 0.05
+
+# Profilers a recording can run; pyinstrument is optional
+PROFILERS = ["cProfile"] + (["pyinstrument"] if find_spec("pyinstrument") else [])
+
+# name, kind, start (seconds into the run), seconds, nesting depth, and with
+# memory tracing the bytes left allocated and the peak above the start
+Timing = namedtuple("Timing", "name kind start seconds depth allocated peak")
+
+# Source line, bytes and blocks allocated there during a run and still held
+Allocation = namedtuple("Allocation", "line size count")
+
+_current = contextvars.ContextVar("recording", default=None)
+_log_lock = threading.Lock()
+
+# Traced recordings in progress; tracemalloc is started for the first and
+# stopped after the last unless something else started it
+_tracing = {"runs": 0, "started": False}
+_tracing_lock = threading.Lock()
+
+
+class RunTimings:
+    def __init__(self, label):
+        self.label = label
+        self.created = time.time()
+        self.origin = time.perf_counter()
+        self.seconds = None
+        self.timings = []
+        self.depth = 0
+        self.profiler = None
+        self.profile = None
+        self.memory = False
+        self.allocated = None
+        self.peak = None
+        self.allocations = []
+        # Running peak of each open traced block, outermost first
+        self._peaks = []
+
+    def ordered(self):
+        # Timings in the order their blocks started
+        return sorted(self.timings, key=lambda timing: timing.start)
+
+    def totals(self):
+        # Seconds per kind, counting only the outermost block of each kind
+        totals = dict.fromkeys(KINDS, 0.0)
+        open_until = {}
+        for timing in self.ordered():
+            if timing.start >= open_until.get(timing.kind, -1):
+                totals[timing.kind] += timing.seconds
+                open_until[timing.kind] = timing.start + timing.seconds
+        return totals
+
+    def to_dict(self):
+        return {
+            "label": self.label,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.created)),
+            "seconds": self.seconds,
+            "profiler": self.profiler,
+            "allocated": self.allocated,
+            "peak": self.peak,
+            "timings": [timing._asdict() for timing in self.ordered()],
+        }
+
+
+@contextmanager
+def timed(name, kind):
+    run = _current.get()
+    if run is None:
+        yield
+        return
+    run.depth += 1
+    traced = run.memory and tracemalloc.is_tracing()
+    if traced:
+        before = _open_traced(run)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        allocated = peak = None
+        if traced:
+            allocated, peak = _close_traced(run, before)
+        run.depth -= 1
+        run.timings.append(
+            Timing(name, kind, start - run.origin, seconds, run.depth, allocated, peak)
+        )
+
+
+def _open_traced(run):
+    # Nested blocks each reset the traced peak, so the enclosing block keeps
+    # the highest peak seen before the reset as its running peak
+    current, peak = tracemalloc.get_traced_memory()
+    run._peaks[-1] = max(run._peaks[-1], peak)
+    tracemalloc.reset_peak()
+    run._peaks.append(current)
+    return current
+
+
+def _close_traced(run, before):
+    current, peak = tracemalloc.get_traced_memory()
+    peak = max(peak, run._peaks.pop())
+    run._peaks[-1] = max(run._peaks[-1], peak)
+    return current - before, peak - before
+
+
+@contextmanager
+def recording(label, profiler=None, memory=False):
+    # Records the timed blocks run in this thread until the block exits;
+    # profiler is None or one of PROFILERS, memory traces allocations
+    run = RunTimings(label)
+    run.profiler = profiler
+    run.memory = memory
+    token = _current.set(run)
+    if memory:
+        _start_tracing()
+        snapshot = _snapshot()
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        run._peaks.append(before)
+    stop = _start_profiler(profiler)
+    try:
+        yield run
+    finally:
+        run.profile = stop()
+        run.seconds = time.perf_counter() - run.origin
+        if memory:
+            current, peak = tracemalloc.get_traced_memory()
+            run.allocated = current - before
+            run.peak = max(peak, run._peaks.pop()) - before
+            run.allocations = _allocation_growth(snapshot, _snapshot())
+            _stop_tracing()
+        _current.reset(token)
+
+
+def _start_tracing():
+    with _tracing_lock:
+        if _tracing["runs"] == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            _tracing["started"] = True
+        _tracing["runs"] += 1
+
+
+def _stop_tracing():
+    with _tracing_lock:
+        _tracing["runs"] -= 1
+        if _tracing["runs"] == 0 and _tracing["started"]:
+            tracemalloc.stop()
+            _tracing["started"] = False
+
+
+def _snapshot():
+    # Allocations of the analysed code, without the tracer's own
+    return tracemalloc.take_snapshot().filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ]
+    )
+
+
+def _allocation_growth(before, after):
+    # Growth between two snapshots per source line, attributed to the
+    # innermost frame in this code base (the caller of numpy or pandas
+    # rather than their internals), largest first
+    here = os.path.abspath(__file__)
+    root = os.path.dirname(here)
+    growth = {}
+    for stat in after.compare_to(before, "traceback"):
+        frames = list(reversed(stat.traceback))
+        ours = [f for f in frames if f.filename.startswith(root)]
+        if ours and ours[0].filename == here:
+            # The recording's own bookkeeping
+            continue
+        frame = ours[0] if ours else frames[0]
+        line = f"{os.path.relpath(frame.filename, root)}:{frame.lineno}"
+        size, count = growth.get(line, (0, 0))
+        growth[line] = (size + stat.size_diff, count + stat.count_diff)
+    rows = [Allocation(line, *totals) for line, totals in growth.items()]
+    rows = [row for row in rows if row.size > 0]
+    return sorted(rows, key=lambda row: -row.size)[:ALLOCATION_LINES]
+
+
+class RssUsage:
+    # Resident set size in bytes at the start and end of a block, and the
+    # highest sample in between
+    def __init__(self, start):
+        self.start = start
+        self.peak = start
+        self.end = None
+
+    @property
+    def growth(self):
+        return self.peak - self.start
+
+
+@contextmanager
+def sampled_rss(interval=RSS_INTERVAL):
+    usage = RssUsage(rss())
+    done = threading.Event()
+
+    def sample():
+        while not done.wait(interval):
+            usage.peak = max(usage.peak, rss())
+
+    sampler = threading.Thread(target=sample, name="rss-sampler", daemon=True)
+    sampler.start()
+    try:
+        yield usage
+    finally:
+        done.set()
+        sampler.join()
+        usage.end = rss()
+        usage.peak = max(usage.peak, usage.end)
+
+
+def rss():
+    # Resident set size of this process in bytes; where /proc is missing,
+    # the peak so far is the best available figure
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return peak_rss()
+
+
+def peak_rss():
+    # Highest resident set size of this process so far, in bytes (None on
+    # platforms without the resource module)
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def nbytes(value, seen=None):
+    # Approximate bytes held by a value: buffers and arrays by their size,
+    # pandas objects deeply, containers and plain objects summed over what
+    # they hold, each object counted once
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, (bytes, bytearray, str)):
+        return sys.getsizeof(value)
+    if isinstance(value, memoryview):
+        return value.nbytes
+    if hasattr(value, "memory_usage") and hasattr(value, "index"):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    if hasattr(value, "nbytes") and not isinstance(value, type):
+        return int(value.nbytes)
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        items = [item for pair in value.items() for item in pair]
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = value
+    elif hasattr(value, "__dict__") and not isinstance(value, type):
+        items = vars(value).values()
+    else:
+        items = []
+    return size + sum(nbytes(item, seen) for item in items)
+
+
+def _start_profiler(profiler):
+    # Starts a profiler; returns the function that stops it and returns its
+    # text report (None without a profiler)
+    if profiler == "cProfile":
+        import cProfile
+        import pstats
+
+        profile = cProfile.Profile()
+        profile.enable()
+
+        def stop():
+            profile.disable()
+            out = io.StringIO()
+            stats = pstats.Stats(profile, stream=out).sort_stats("cumulative")
+            stats.print_stats(PROFILE_LINES)
+            return out.getvalue()
+
+        return stop
+    if profiler == "pyinstrument":
+        from pyinstrument import Profiler
+
+        profile = Profiler()
+        profile.start()
+
+        def stop():
+            profile.stop()
+            return profile.output_text()
+
+        return stop
+    if profiler:
+        raise ValueError(f"Unknown profiler {profiler!r}; use one of {PROFILERS}")
+    return lambda: None
+
+
+def log_run(run, path=LOG_PATH):
+    # Append the run as one JSON line; safe to call from several sessions
+    line = json.dumps(run.to_dict())
+    with _log_lock, open(path, "a") as f:
+        f.write(line + "\n")
+
+
+def read_log(path=LOG_PATH):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize(runs):
+    # Rows of (label, kind, name, runs, median, p95, last seconds, median
+    # peak bytes or None) for every timed block in the log, slowest first
+    seconds, peaks = {}, {}
+    for run in runs:
+        key = (run["label"], PAGE, "Run")
+        seconds.setdefault(key, []).append(run["seconds"])
+        if run.get("peak") is not None:
+            peaks.setdefault(key, []).append(run["peak"])
+        for timing in run["timings"]:
+            key = (run["label"], timing["kind"], timing["name"])
+            seconds.setdefault(key, []).append(timing["seconds"])
+            if timing.get("peak") is not None:
+                peaks.setdefault(key, []).append(timing["peak"])
+    rows = []
+    for key, values in seconds.items():
+        ordered = sorted(values)
+        p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+        peak = statistics.median(peaks[key]) if key in peaks else None
+        rows.append(
+            (*key, len(values), statistics.median(values), p95, values[-1], peak)
+        )
+    return sorted(rows, key=lambda row: -row[4])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Summarise dashboard timings logged by the Performance panel"
+    )
+    parser.add_argument("log", nargs="?", default=LOG_PATH)
+    parser.add_argument("--label", help="only runs of this page")
+    parser.add_argument("--top", type=int, default=30)
+    args = parser.parse_args()
+
+    runs = [
+        run
+        for run in read_log(args.log)
+        if not args.label or run["label"] == args.label
+    ]
+    print(f"{len(runs)} runs in {args.log}")
+    print(
+        f"{'Page':<34}{'Kind':<8}{'Block':<40}{'Runs':>6}{'Median':>9}{'P95':>9}"
+        f"{'Peak MB':>9}"
+    )
+    for label, kind, name, count, median, p95, _, peak in summarize(runs)[: args.top]:
+        shown = f"{peak / 2**20:9.2f}" if peak is not None else f"{'':>9}"
+        print(
+            f"{label[:33]:<34}{kind:<8}{name[:39]:<40}{count:>6}{median:9.3f}{p95:9.3f}"
+            f"{shown}"
+        )
@@ -0,0 +1,167 @@
+import itertools
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from instrumentation import nbytes, recording, sampled_rss
+
+# Background jobs for work that should not hold up a page: image exports,
+# PDF bordering, large permutation runs. A job is any function taking a
+# progress keyword; it is called with the job's report method, which
+# records (done, total, message) and raises Cancelled once the job has been
+# cancelled, so long loops stop at their next progress report. Jobs run on a
+# small thread pool (the heavy work is numpy, PyMuPDF or the image exporter,
+# which release the GIL) and finished jobs keep their result until evicted.
+# Jobs belong to an owner (a dashboard session); each owner keeps its newest
+# finished jobs, so one user's jobs never push out another's results, and
+# the jobs of owners that are gone are evicted first.
+# Each job is recorded, so the timed blocks it runs are kept as its timings,
+# with the process's resident set size over the job and the size of its
+# result.
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+WORKERS = 2
+
+# Finished jobs kept with their results per owner, oldest evicted first
+KEEP_FINISHED = 32
+
+# A job result that is offered as a file download
+Download = namedtuple("Download", "data file_name mime")
+
+
+class Cancelled(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, job_id, name, kind=None, owner=None):
+        self.id = job_id
+        self.name = name
+        self.kind = kind
+        self.owner = owner
+        self.status = QUEUED
+        self.done = 0
+        self.total = 1
+        self.message = ""
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.future = None
+        self.timings = None
+        self.rss = None
+        self.result_bytes = None
+        self._cancel = threading.Event()
+
+    @property
+    def active(self):
+        return self.status in (QUEUED, RUNNING)
+
+    @property
+    def progress(self):
+        return min(1.0, self.done / self.total) if self.total else 0.0
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def report(self, done, total=None, message=None):
+        if self._cancel.is_set():
+            raise Cancelled()
+        if total is not None:
+            self.total = total
+        self.done = done
+        if message is not None:
+            self.message = message
+
+    def cancel(self):
+        self._cancel.set()
+        if self.future is not None and self.future.cancel():
+            self.status = CANCELLED
+            self.finished = time.time()
+
+
+class JobQueue:
+    # alive(owner) tells whether an owner is still around to collect its
+    # results; by default every owner is
+
+    def __init__(self, workers=WORKERS, keep=KEEP_FINISHED, alive=None):
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix="job")
+        self.keep = keep
+        self.alive = alive or (lambda owner: True)
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+
+    def submit(self, name, fn, *args, kind=None, owner=None, **kwargs):
+        job = Job(next(self.ids), name, kind, owner)
+        with self.lock:
+            self.jobs[job.id] = job
+            self._evict()
+        job.future = self.pool.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job, fn, args, kwargs):
+        if job._cancel.is_set():
+            job.status = CANCELLED
+            return
+        job.status = RUNNING
+        job.started = time.time()
+        try:
+            with recording(job.name) as job.timings, sampled_rss() as job.rss:
+                job.result = fn(*args, progress=job.report, **kwargs)
+            job.result_bytes = nbytes(job.result)
+            job.done = job.total
+            job.status = DONE
+        except Cancelled:
+            job.status = CANCELLED
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = FAILED
+        finally:
+            job.finished = time.time()
+
+    def _evict(self):
+        # Each owner keeps its newest `keep` finished jobs; past `keep`
+        # finished jobs in all, those of owners that are gone go too
+        finished = [job for job in self.jobs.values() if not job.active]
+        by_owner = {}
+        for job in finished:
+            by_owner.setdefault(job.owner, []).append(job)
+        evicted = {
+            job.id
+            for jobs in by_owner.values()
+            for job in jobs[: max(0, len(jobs) - self.keep)]
+        }
+        orphans = [
+            job.id
+            for job in finished
+            if job.id not in evicted and not self.alive(job.owner)
+        ]
+        evicted.update(orphans[: max(0, len(finished) - len(evicted) - self.keep)])
+        for job_id in evicted:
+            del self.jobs[job_id]
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is not None:
+            job.cancel()
+
+    def remove(self, job_id):
+        # Forget a job; a running one is cancelled first
+        with self.lock:
+            job = self.jobs.pop(job_id, None)
+        if job is not None and job.active:
+            job.cancel()
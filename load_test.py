@@ -0,0 +1,281 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from dashboard import PAGES
+
+# Load test of the dashboard as a multi-user server. Starts streamlit_app.py
+# on a headless streamlit server and connects --sessions simulated browser
+# sessions to it over the websocket a browser tab uses, so every session
+# has its own session state and script thread in the one server process and
+# shares that process's caches. All sessions start together: each opens on
+# the Overview, as a browser does, then visits the pages in turn, starting
+# at a different page per session. Each page is rendered once ("first") and
+# rerun --reruns times ("rerun", the cost of a widget interaction). Prints
+# latency percentiles per page and overall, the throughput, and the
+# server's resident memory.
+#
+#     python load_test.py --sessions 8 --reruns 3
+#     python load_test.py --rows 1e5 --sessions 16 --pages "CAD Analysis"
+#
+# --rows serves a synthetic cohort store of that many patients
+# (synthetic_cohort.py), built in a temporary directory, instead of the
+# store built from the thesis CSV. Caches start cold; --warm has one
+# session visit every page first, so that only shared-cache hits are timed.
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "streamlit_app.py")
+TITLES = [title for title, _, _ in PAGES]
+LANDING = TITLES[0]
+PERCENTILES = [50, 90, 95, 99]
+# Seconds to wait for the server to start and for one run to finish
+STARTUP = 60
+TIMEOUT = 600
+
+Sample = namedtuple("Sample", "session page kind seconds")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, cwd):
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "streamlit",
+            "run",
+            APP,
+            "--server.headless",
+            "true",
+            "--server.port",
+            str(port),
+            "--browser.gatherUsageStats",
+            "false",
+        ],
+        cwd=cwd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + STARTUP
+    while True:
+        try:
+            urllib.request.urlopen(f"http://localhost:{port}/_stcore/health", timeout=1)
+            return server
+        except OSError:
+            if server.poll() is not None or time.monotonic() > deadline:
+                server.kill()
+                raise RuntimeError("the streamlit server did not start")
+            time.sleep(0.5)
+
+
+def server_memory(pid):
+    # (resident, peak resident) bytes of the server, from /proc where there
+    # is one
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            fields = dict(line.split(":", 1) for line in f)
+    except OSError:
+        return None, None
+    return tuple(int(fields[key].split()[0]) * 1024 for key in ("VmRSS", "VmHWM"))
+
+
+class Session:
+    # One browser tab: a websocket to the server that asks for script runs
+    # and waits for each to finish, noting the errors the pages show
+
+    def __init__(self, url):
+        self.url = url
+        self.pages = {}
+        self.errors = []
+
+    async def connect(self):
+        import websockets
+
+        self.socket = await websockets.connect(
+            self.url, subprotocols=["streamlit"], max_size=None
+        )
+        return self
+
+    async def close(self):
+        await self.socket.close()
+
+    async def run(self, page):
+        # Seconds from asking for a run of the page to the end of the run
+        from streamlit.proto.Alert_pb2 import Alert
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        request = BackMsg()
+        request.rerun_script.page_script_hash = self.pages.get(page, "")
+        begin = time.perf_counter()
+        await self.socket.send(request.SerializeToString())
+        while True:
+            raw = await asyncio.wait_for(self.socket.recv(), TIMEOUT)
+            if isinstance(raw, str):
+                continue
+            message = ForwardMsg()
+            message.ParseFromString(raw)
+            kind = message.WhichOneof("type")
+            if kind == "script_finished":
+                return time.perf_counter() - begin
+            if kind == "navigation":
+                self.pages = {
+                    app_page.page_name: app_page.page_script_hash
+                    for app_page in message.navigation.app_pages
+                }
+            elif kind == "delta":
+                element = message.delta.new_element
+                if element.WhichOneof("type") == "exception":
+                    self.errors.append((page, element.exception.message))
+                elif (
+                    element.WhichOneof("type") == "alert"
+                    and element.alert.format == Alert.ERROR
+                ):
+                    self.errors.append((page, element.alert.body))
+
+
+def session_pages(pages, session):
+    # The Overview first, then the other pages starting at a different one
+    # per session, so that concurrent sessions are spread over the pages
+    others = [page for page in pages if page != LANDING]
+    if not others:
+        return [LANDING]
+    offset = session % len(others)
+    return [LANDING] + others[offset:] + others[:offset]
+
+
+async def simulate(client, session, pages, reruns, samples):
+    for page in session_pages(pages, session):
+        for run in range(1 + reruns):
+            seconds = await client.run(page)
+            samples.append(
+                Sample(session, page, "first" if run == 0 else "rerun", seconds)
+            )
+
+
+async def run_load_test(url, sessions, pages, reruns):
+    # Connects every session before any starts, so that they run together
+    clients = [await Session(url).connect() for _ in range(sessions)]
+    samples = []
+    began = time.perf_counter()
+    try:
+        await asyncio.gather(
+            *(
+                simulate(client, session, pages, reruns, samples)
+                for session, client in enumerate(clients)
+            )
+        )
+    finally:
+        wall = time.perf_counter() - began
+        for client in clients:
+            await client.close()
+    errors = [error for client in clients for error in client.errors]
+    return samples, errors, wall
+
+
+def latency_table(samples):
+    # Percentiles (ms) per page and kind of run, then over every page
+    frame = pd.DataFrame(samples, columns=Sample._fields)
+    groups = list(frame.groupby(["page", "kind"], sort=False))
+    groups += [(("All pages", kind), runs) for kind, runs in frame.groupby("kind")]
+    rows = []
+    for (page, kind), runs in groups:
+        ms = runs["seconds"].to_numpy() * 1000
+        row = {"Page": page, "Kind": kind, "Runs": len(ms)}
+        for q, value in zip(PERCENTILES, np.percentile(ms, PERCENTILES)):
+            row[f"p{q}"] = value
+        row["Max"] = ms.max()
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time the dashboard server under concurrent simulated sessions"
+    )
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--reruns", type=int, default=3)
+    parser.add_argument(
+        "--pages", nargs="+", default=TITLES, help="titles of the pages to visit"
+    )
+    parser.add_argument(
+        "--rows", type=float, help="serve a synthetic cohort of this many patients"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--warm", action="store_true", help="fill the caches first")
+    parser.add_argument("--out", help="save the percentiles and samples as JSON")
+    args = parser.parse_args()
+    unknown = [page for page in args.pages if page not in TITLES]
+    if unknown:
+        parser.error(f"unknown pages: {', '.join(unknown)}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # The dashboard reads the store from its working directory
+        cwd = os.path.dirname(APP)
+        if args.rows:
+            from synthetic_cohort import build_store
+
+            build_store(
+                os.path.join(workdir, "cohort_store"), int(args.rows), args.seed
+            )
+            cwd = workdir
+        port = free_port()
+        server = start_server(port, cwd)
+        try:
+            url = f"ws://localhost:{port}/_stcore/stream"
+            if args.warm:
+                asyncio.run(run_load_test(url, 1, args.pages, 0))
+            samples, errors, wall = asyncio.run(
+                run_load_test(url, args.sessions, args.pages, args.reruns)
+            )
+            resident, peak = server_memory(server.pid)
+        finally:
+            server.terminate()
+            server.wait()
+
+    table = latency_table(samples)
+    print(
+        f"{args.sessions} sessions, {len(args.pages)} pages, {args.reruns} reruns "
+        f"per page{', after a warm-up' if args.warm else ''}: "
+        f"{len(samples)} runs in {wall:.1f} s ({len(samples) / wall:.1f} runs/s)"
+    )
+    print("Latency (ms):")
+    print(table.to_string(index=False, float_format=lambda v: f"{v:.0f}"))
+    if resident is not None:
+        print(f"Server resident {resident / 2**20:.0f} MB (peak {peak / 2**20:.0f} MB)")
+    for page, message in dict.fromkeys(errors):
+        print(f"Error on {page}: {message}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(
+                {
+                    "sessions": args.sessions,
+                    "reruns": args.reruns,
+                    "pages": args.pages,
+                    "rows": args.rows,
+                    "warm": args.warm,
+                    "wall_seconds": wall,
+                    "resident_bytes": resident,
+                    "peak_resident_bytes": peak,
+                    "latency_ms": table.to_dict(orient="records"),
+                    "samples": [sample._asdict() for sample in samples],
+                },
+                f,
+                indent=1,
+            )
+        print(f"Wrote {args.out}")
@@ -0,0 +1,330 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from scipy.special import expit
+from scipy.stats import norm
+
+from cohort_store import (
+    COMORBIDITIES,
+    COMORBIDITY_MASK,
+    UNSTABLE_CRITERIA,
+    has_comorbidity,
+    unstable_hemodynamics,
+)
+
+# Multivariable logistic regression of in-hospital death. Predictors are
+# named terms, each built from one or more cohort columns; a formula is the
+# ordered tuple of term names.
+
+CONTINUOUS_TERMS = {
+    "Initial Lactate": "INITIAL LACTATE (clean)",
+    "Lactate Clearance": "LACTATE CLEARANCE (clean)",
+    "CRP": "CRP (clean)",
+    "Age": "AGE",
+}
+HEMODYNAMIC_TERM = "Unstable Hemodynamics"
+TERMS = list(CONTINUOUS_TERMS) + COMORBIDITIES + [HEMODYNAMIC_TERM]
+DEFAULT_TERMS = list(CONTINUOUS_TERMS) + ["CAD", "SHTN", "T2DM", HEMODYNAMIC_TERM]
+MODEL_COLUMNS = (
+    list(CONTINUOUS_TERMS.values())
+    + [COMORBIDITY_MASK]
+    + list(UNSTABLE_CRITERIA)
+    + ["CLINICAL OUTCOMES"]
+)
+
+# Above this many rows fits use the float32 IRLS path instead of statsmodels
+LARGE_COHORT = 200_000
+
+# Log-odds per unit beyond which a coefficient is taken to have diverged: a
+# term that (nearly) separates the outcomes has no finite estimate, and the
+# fit stops wherever its iterations ran out
+SEPARATION_LOG_ODDS = 10
+
+
+def term_columns(term):
+    if term in CONTINUOUS_TERMS:
+        return [CONTINUOUS_TERMS[term]]
+    if term == HEMODYNAMIC_TERM:
+        return list(UNSTABLE_CRITERIA)
+    return [COMORBIDITY_MASK]
+
+
+def formula(terms):
+    return "CLINICAL OUTCOMES ~ " + " + ".join(terms)
+
+
+def model_frame(cohort, terms):
+    # Complete cases for the columns the terms are built from
+    columns = list(dict.fromkeys(c for term in terms for c in term_columns(term))) + [
+        "CLINICAL OUTCOMES"
+    ]
+    return cohort[columns].dropna()
+
+
+def design_matrix(frame, terms, dtype=np.float64, sparse=False):
+    # Intercept first, then one column per term. Comorbidity and hemodynamic
+    # flags are mostly zeros, which the sparse layout does not store
+    columns = [np.ones(len(frame), dtype=dtype)]
+    for term in terms:
+        if term in CONTINUOUS_TERMS:
+            values = frame[CONTINUOUS_TERMS[term]]
+        elif term == HEMODYNAMIC_TERM:
+            values = unstable_hemodynamics(frame)
+        else:
+            values = has_comorbidity(frame, term)
+        columns.append(values.to_numpy(dtype=dtype))
+    if sparse:
+        return sp.hstack([sp.csc_matrix(c[:, None]) for c in columns], format="csc")
+    return np.column_stack(columns)
+
+
+def outcome_vector(frame):
+    return (frame["CLINICAL OUTCOMES"] == "DEAD").to_numpy(dtype=np.float64)
+
+
+def fingerprint(frame):
+    # Content hash of the model frame; equal data gives an equal key
+    digest = hashlib.blake2b(digest_size=16)
+    for name, series in frame.items():
+        digest.update(str(name).encode())
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.cat.codes
+        digest.update(np.ascontiguousarray(series.to_numpy()).tobytes())
+    return digest.hexdigest()
+
+
+class ModelFit:
+    # Coefficients, covariance and fit statistics, whichever path produced them
+
+    def __init__(
+        self, terms, params, cov, llf, llnull, n, events, iterations, converged, method
+    ):
+        self.terms = tuple(terms)
+        self.params = np.asarray(params, dtype=np.float64)
+        self.cov = np.asarray(cov, dtype=np.float64)
+        self.llf = float(llf)
+        self.llnull = float(llnull)
+        self.n = int(n)
+        self.events = int(events)
+        self.iterations = int(iterations)
+        self.converged = bool(converged)
+        self.method = method
+
+    @property
+    def names(self):
+        return ["Intercept"] + list(self.terms)
+
+    @property
+    def separated(self):
+        # Terms whose coefficients diverged; their odds ratios are not shown
+        return [
+            name
+            for name, beta in zip(self.names[1:], self.params[1:])
+            if not abs(beta) <= SEPARATION_LOG_ODDS
+        ]
+
+    @property
+    def bse(self):
+        return np.sqrt(np.diag(self.cov))
+
+    @property
+    def pvalues(self):
+        return 2 * norm.sf(np.abs(self.params / self.bse))
+
+    @property
+    def aic(self):
+        return 2 * len(self.params) - 2 * self.llf
+
+    @property
+    def pseudo_r2(self):
+        # McFadden's R², as reported by statsmodels
+        return 1 - self.llf / self.llnull
+
+    def predict(self, X):
+        return expit(np.asarray(X @ self.params.astype(X.dtype), dtype=np.float64))
+
+    def odds_ratios(self, confidence=0.95):
+        z = norm.ppf(0.5 + confidence / 2)
+        table = pd.DataFrame(
+            {
+                "Term": self.names,
+                "Coefficient": self.params,
+                "Std Error": self.bse,
+                "Odds Ratio": np.exp(self.params),
+                "OR Lower": np.exp(self.params - z * self.bse),
+                "OR Upper": np.exp(self.params + z * self.bse),
+                "P-Value": self.pvalues,
+            }
+        )
+        table.loc[
+            table["Term"].isin(self.separated),
+            ["Odds Ratio", "OR Lower", "OR Upper", "P-Value"],
+        ] = np.nan
+        return table
+
+
+def _null_loglik(y):
+    p = y.mean()
+    if p in (0.0, 1.0):
+        return 0.0
+    return len(y) * (p * np.log(p) + (1 - p) * np.log(1 - p))
+
+
+def fit_statsmodels(X, y, terms, start=None):
+    # statsmodels is slow to import and only needed for in-memory cohorts
+    import statsmodels.api as sm
+
+    model = sm.Logit(y, X)
+    if start is not None:
+        # As in fit_irls, a warm start is only used if it beats zeros
+        start = np.asarray(start, dtype=float)
+        if not model.loglike(start) > model.loglike(np.zeros_like(start)):
+            start = None
+    result = model.fit(start_params=start, disp=0, maxiter=100)
+    return ModelFit(
+        terms,
+        result.params,
+        result.cov_params(),
+        result.llf,
+        result.llnull,
+        len(y),
+        y.sum(),
+        result.mle_retvals["iterations"],
+        result.mle_retvals["converged"],
+        "statsmodels",
+    )
+
+
+def _loglik(X, y, beta):
+    eta = np.asarray(X @ beta.astype(X.dtype), dtype=np.float64)
+    return (y * eta - np.logaddexp(0, eta)).sum(), eta
+
+
+def fit_irls(X, y, terms, start=None, tol=1e-5, max_iter=50, penalty=0.0):
+    # Newton-Raphson / IRLS on a float32 (optionally sparse) design matrix.
+    # Products with X stay in X's dtype; only the p x p Hessian and the
+    # coefficient vector are float64, so memory is about half the dense
+    # float64 design statsmodels would build. A penalty adds a ridge term on
+    # every coefficient but the intercept, which keeps fits on separated
+    # data finite.
+    dtype = X.dtype
+    ridge = np.full(X.shape[1], float(penalty))
+    ridge[0] = 0.0
+    beta = np.zeros(X.shape[1])
+    llf, eta = _loglik(X, y, beta)
+    if start is not None:
+        # A warm start from other data or another formula is only used if
+        # it beats starting from zeros
+        warm_llf, warm_eta = _loglik(X, y, np.asarray(start, dtype=float))
+        if warm_llf > llf:
+            beta, llf, eta = np.array(start, dtype=float), warm_llf, warm_eta
+    hessian = np.eye(X.shape[1])
+    converged = False
+    for iteration in range(1, max_iter + 1):
+        mu = expit(eta)
+        weights = (mu * (1 - mu)).astype(dtype)
+        gradient = np.asarray(X.T @ (y - mu).astype(dtype), dtype=np.float64)
+        if sp.issparse(X):
+            weighted = X.multiply(weights[:, None]).tocsc()
+            hessian = (X.T @ weighted).toarray().astype(np.float64)
+        else:
+            hessian = ((X * weights[:, None]).T @ X).astype(np.float64)
+        gradient -= ridge * beta
+        hessian += np.diag(ridge)
+        try:
+            step = np.linalg.solve(hessian, gradient)
+        except np.linalg.LinAlgError:
+            # Under separation the weights of the separated patients vanish
+            # as their fitted risks reach 0 or 1
+            break
+        beta += step
+        llf, eta = _loglik(X, y, beta)
+        # Relative test: float32 products cannot resolve steps much finer
+        if np.max(np.abs(step) / (1 + np.abs(beta))) < tol:
+            converged = True
+            break
+    return ModelFit(
+        terms,
+        beta,
+        np.linalg.pinv(hessian),
+        llf,
+        _null_loglik(y),
+        len(y),
+        y.sum(),
+        iteration,
+        converged,
+        "float32 IRLS" + (" (sparse)" if sp.issparse(X) else ""),
+    )
+
+
+class ModelCache:
+    # Fitted models keyed by (formula, data fingerprint), least recently
+    # used first out. Fits also seed later ones: a refit of the same formula
+    # on new data, or of a formula sharing terms, starts from the cached
+    # coefficients instead of zeros, and is redone from zeros if that fails.
+    # The dashboard shares one cache between its sessions' threads, so the
+    # cache is read and updated under a lock; the fits themselves run
+    # outside it.
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.fits = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def entries(self):
+        # The cached fits, as a list another thread cannot change
+        with self._lock:
+            return list(self.fits.values())
+
+    def warm_start(self, terms):
+        # Coefficients of the most recent fit sharing the most terms; called
+        # with the lock held
+        best, shared = None, 0
+        for fit in reversed(self.fits.values()):
+            overlap = len(set(fit.terms) & set(terms))
+            if overlap > shared:
+                best, shared = fit, overlap
+        if best is None:
+            return None
+        known = dict(zip(best.names, best.params))
+        return np.array([known.get(name, 0.0) for name in ["Intercept"] + terms])
+
+    def fit(self, cohort, terms, large_cohort=LARGE_COHORT, sparse=False):
+        terms = list(terms)
+        frame = model_frame(cohort, terms)
+        key = (formula(terms), fingerprint(frame))
+        with self._lock:
+            if key in self.fits:
+                self.hits += 1
+                self.fits.move_to_end(key)
+                return self.fits[key]
+            self.misses += 1
+            start = self.warm_start(terms)
+
+        y = outcome_vector(frame)
+        if len(frame) > large_cohort or sparse:
+            X = design_matrix(frame, terms, np.float32, sparse)
+            fitter = fit_irls
+        else:
+            X = design_matrix(frame, terms)
+            fitter = fit_statsmodels
+        try:
+            fit = fitter(X, y, terms, start)
+        except np.linalg.LinAlgError:
+            if start is None:
+                raise
+            fit = None
+        if start is not None and (fit is None or not fit.converged):
+            fit = fitter(X, y, terms)
+
+        with self._lock:
+            self.fits[key] = fit
+            while len(self.fits) > self.maxsize:
+                self.fits.popitem(last=False)
+        return fit
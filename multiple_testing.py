@@ -0,0 +1,186 @@
+import numpy as np
+from scipy.stats import rankdata
+
+# Multiplicity corrections for whole results tables. Holm and
+# Benjamini-Hochberg adjust any column of p-values; the max-T adjustment
+# (Westfall-Young, single step) permutes the outcome labels once per
+# replicate and evaluates every test of the family on that same permutation,
+# so the correlation between tests (several tests of one variable, or
+# variables measured on the same patients) is kept rather than assumed away.
+
+PERMUTATIONS = 10000
+
+# Permutations are drawn in blocks of about this many labels
+PERMUTATION_BLOCK = 2**21
+
+
+def holm(p_values):
+    # Step-down Holm; NaNs are left out of the family and stay NaN
+    p = np.asarray(p_values, dtype=np.float64)
+    adjusted = np.full(p.shape, np.nan)
+    known = np.flatnonzero(~np.isnan(p))
+    order = known[np.argsort(p[known], kind="stable")]
+    m = len(order)
+    steps = (m - np.arange(m)) * p[order]
+    adjusted[order] = np.minimum(1.0, np.maximum.accumulate(steps))
+    return adjusted
+
+
+def benjamini_hochberg(p_values):
+    # Step-up false discovery rate adjustment; NaNs stay NaN
+    p = np.asarray(p_values, dtype=np.float64)
+    adjusted = np.full(p.shape, np.nan)
+    known = np.flatnonzero(~np.isnan(p))
+    order = known[np.argsort(p[known], kind="stable")]
+    m = len(order)
+    steps = p[order] * m / np.arange(1, m + 1)
+    adjusted[order] = np.minimum(1.0, np.minimum.accumulate(steps[::-1])[::-1])
+    return adjusted
+
+
+def adjust_table(table, p_column="P-Value"):
+    # Copy of a results table with Holm and BH adjusted p-values
+    table = table.copy()
+    table["Holm P"] = holm(table[p_column])
+    table["BH P"] = benjamini_hochberg(table[p_column])
+    return table
+
+
+def max_t(observed, permuted):
+    # Single-step max-T adjusted p-values. observed is (tests,), permuted is
+    # (permutations, tests), both oriented so larger is more extreme. Each
+    # test is standardized by its own permutation distribution first, so
+    # tests on different scales compete fairly for the maximum.
+    center = permuted.mean(axis=0)
+    scale = permuted.std(axis=0)
+    scale[scale == 0] = 1.0
+    maxima = ((permuted - center) / scale).max(axis=1)
+    standardized = (np.asarray(observed) - center) / scale
+    exceed = (maxima[:, None] >= standardized[None, :] - 1e-12).sum(axis=0)
+    return (exceed + 1) / (len(maxima) + 1)
+
+
+def permuted_labels(labels, n_perm=PERMUTATIONS, seed=0):
+    # Blocks of (rows, patients) label matrices, each row a permutation;
+    # every test of a family is evaluated on the same blocks
+    labels = np.asarray(labels, dtype=bool)
+    rng = np.random.default_rng(seed)
+    block = max(1, PERMUTATION_BLOCK // max(len(labels), 1))
+    for start in range(0, n_perm, block):
+        rows = min(block, n_perm - start)
+        yield rng.permuted(np.tile(labels, (rows, 1)), axis=1)
+
+
+class TwoSampleFamily:
+    # The page tests of one variable (Welch t, Mann-Whitney U,
+    # Kolmogorov-Smirnov, difference in means) as functions of a label
+    # matrix, True for the first group
+
+    names = ["T-test", "Mann-Whitney U", "Kolmogorov-Smirnov", "Mean Difference"]
+
+    def __init__(self, x, y):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        x, y = x[~np.isnan(x)], y[~np.isnan(y)]
+        self.values = np.concatenate([x, y])
+        self.labels = np.r_[np.ones(len(x), bool), np.zeros(len(y), bool)]
+        self.n1, self.n2 = len(x), len(y)
+        self.ranks = rankdata(self.values)
+
+        # KS statistic from ECDFs at the end of each run of tied values
+        self.order = np.argsort(self.values, kind="stable")
+        sorted_values = self.values[self.order]
+        self.run_ends = np.flatnonzero(
+            np.r_[sorted_values[1:] != sorted_values[:-1], True]
+        )
+
+    def statistics(self, labels):
+        # (rows, tests) absolute statistics for a (rows, patients) label matrix
+        labels = np.atleast_2d(labels)
+        first = labels.astype(np.float64)
+        second = 1.0 - first
+        n1, n2 = self.n1, self.n2
+
+        mean1 = first @ self.values / n1
+        mean2 = second @ self.values / n2
+        var1 = (first @ self.values**2 - n1 * mean1**2) / (n1 - 1)
+        var2 = (second @ self.values**2 - n2 * mean2**2) / (n2 - 1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t = np.abs(mean1 - mean2) / np.sqrt(var1 / n1 + var2 / n2)
+
+        u = first @ self.ranks - n1 * (n1 + 1) / 2
+        cumulative = np.cumsum(labels[:, self.order], axis=1)[:, self.run_ends]
+        positions = self.run_ends + 1
+        ks = np.abs(cumulative / n1 - (positions - cumulative) / n2).max(axis=1)
+        return np.column_stack([t, np.abs(u - n1 * n2 / 2), ks, np.abs(mean1 - mean2)])
+
+    def permutation_test(self, n_perm=PERMUTATIONS, seed=0):
+        # Observed statistics, two-sided permutation p-values and max-T
+        # adjusted p-values, all from one set of permutations
+        observed = self.statistics(self.labels)[0]
+        permuted = np.concatenate(
+            [
+                self.statistics(block)
+                for block in permuted_labels(self.labels, n_perm, seed)
+            ]
+        )
+        exceed = (permuted >= observed - 1e-12).sum(axis=0)
+        return observed, (exceed + 1) / (n_perm + 1), max_t(observed, permuted)
+
+
+class OutcomeFamily:
+    # Tests of several variables against one outcome on the same patients:
+    # rank-sum z for continuous variables and the standardized
+    # flagged-and-dead count for binary flags. Each variable uses the
+    # patients where it is known.
+
+    def __init__(self, outcome):
+        self.outcome = np.asarray(outcome, dtype=bool)
+        self.tests = []
+
+    def add_continuous(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        known = ~np.isnan(values)
+        ranks = np.zeros(len(values))
+        ranks[known] = rankdata(values[known])
+        self.tests.append(("rank", known, ranks))
+        return self
+
+    def add_flag(self, flags):
+        flags = np.asarray(flags, dtype=np.float64)
+        known = ~np.isnan(flags)
+        self.tests.append(("flag", known, np.where(known, flags, 0.0)))
+        return self
+
+    def statistics(self, labels):
+        labels = np.atleast_2d(labels).astype(np.float64)
+        columns = []
+        for kind, known, values in self.tests:
+            n = known.sum()
+            cases = labels @ known
+            with np.errstate(invalid="ignore", divide="ignore"):
+                if kind == "rank":
+                    # Rank sum of the deaths against its null mean and sd
+                    total = labels @ values
+                    mean = cases * (n + 1) / 2
+                    sd = np.sqrt(cases * (n - cases) * (n + 1) / 12)
+                else:
+                    # Flagged deaths against the hypergeometric mean and sd
+                    flagged = values.sum()
+                    total = labels @ values
+                    mean = cases * flagged / n
+                    sd = np.sqrt(
+                        cases * flagged / n * (n - flagged) / n * (n - cases) / (n - 1)
+                    )
+                columns.append(np.nan_to_num(np.abs(total - mean) / sd))
+        return np.column_stack(columns)
+
+    def max_t(self, n_perm=PERMUTATIONS, seed=0, progress=None):
+        # progress(done, total) is called after every block of permutations
+        observed = self.statistics(self.outcome)[0]
+        permuted = []
+        for block in permuted_labels(self.outcome, n_perm, seed):
+            permuted.append(self.statistics(block))
+            if progress:
+                progress(sum(len(p) for p in permuted), n_perm)
+        return max_t(observed, np.concatenate(permuted))
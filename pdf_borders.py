@@ -1,10 +1,11 @@
-import fitz  # PyMuPDF
+def add_word_style_borders(input_path, output_path, border_width=1, progress=None):
+    import fitz  # PyMuPDF, loaded on first use
 
-
-def add_word_style_borders(input_path, output_path, border_width=1):
     doc = fitz.open(input_path)
 
-    for page in doc:
+    for number, page in enumerate(doc):
+        if progress:
+            progress(number, len(doc), f"Page {number + 1} of {len(doc)}")
         rect = page.rect  # Get page size
         width, height = rect.width, rect.height
 
@@ -32,6 +33,8 @@ def add_word_style_borders(input_path, output_path, border_width=1):
 
 
 # Example usage
-add_word_style_borders(
-    "AHS 242101011 - Anu Priya - Thesis (2).pdf", "output_with_word_style_borders.pdf"
-)
+if __name__ == "__main__":
+    add_word_style_borders(
+        "AHS 242101011 - Anu Priya - Thesis (2).pdf",
+        "output_with_word_style_borders.pdf",
+    )
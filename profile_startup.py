@@ -0,0 +1,101 @@
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Cold-start profile of the dashboard: each run is a fresh interpreter that
+# renders one page of streamlit_app.py headlessly (streamlit's AppTest), with
+# -X importtime reporting how long every import took. Prints the time to
+# first render, the rerun latency of the page once its caches are warm (what
+# every widget interaction costs) and the slowest top-level imports.
+
+RUN = """
+import os, statistics, time
+from dashboard import PAGES
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file(os.path.abspath("streamlit_app.py"), default_timeout=600)
+harness = time.perf_counter()
+app.run()
+script = dict((title, script) for title, script, _ in PAGES)[{page!r}]
+if {page!r} != PAGES[0][0]:
+    app.switch_page("dashboard/pages/" + script).run()
+end = time.perf_counter()
+reruns = []
+for _ in range({reruns}):
+    begin = time.perf_counter()
+    app.run()
+    reruns.append(time.perf_counter() - begin)
+rerun = statistics.median(reruns) if reruns else float("nan")
+print(f"{{harness - start:.3f}} {{end - harness:.3f}} {{rerun:.4f}} {{len(app.exception)}}")
+"""
+
+
+def parse_importtime(stderr):
+    # {top-level module: cumulative microseconds} from -X importtime output
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if name.startswith("  "):
+            continue
+        imports[name.strip()] = imports.get(name.strip(), 0) + int(cumulative)
+    return imports
+
+
+def profile(page, repeat, reruns):
+    runs = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                RUN.format(page=page, reruns=reruns),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        harness, render, rerun, exceptions = result.stdout.split()[-4:]
+        runs.append(
+            (
+                float(harness),
+                float(render),
+                float(rerun),
+                int(exceptions),
+                result.stderr,
+            )
+        )
+    return runs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time the dashboard's cold start and its slowest imports"
+    )
+    parser.add_argument("--page", default="Overview")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = profile(args.page, args.repeat, args.reruns)
+    render = [run[1] for run in runs]
+    print(f"Page: {args.page}")
+    print(f"Streamlit harness import: {statistics.median(r[0] for r in runs):.2f} s")
+    print(
+        f"First render: median {statistics.median(render):.2f} s "
+        f"(min {min(render):.2f} s, max {max(render):.2f} s)"
+    )
+    if args.reruns:
+        rerun = statistics.median(run[2] for run in runs)
+        print(f"Rerun (warm caches): median {rerun * 1000:.0f} ms")
+    if any(run[3] for run in runs):
+        print("Warning: the page raised an exception")
+
+    imports = parse_importtime(runs[-1][4])
+    print(f"\nSlowest top-level imports (last run, of {len(imports)}):")
+    for name, micros in sorted(imports.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"  {micros / 1e6:7.3f} s  {name}")
@@ -0,0 +1,132 @@
+import itertools
+from collections import namedtuple
+from functools import lru_cache
+from math import comb
+
+import numpy as np
+from scipy.stats import norm, rankdata
+
+from instrumentation import TEST, timed
+
+# Two-sided Mann-Whitney U with the p-value method chosen per comparison:
+#   exact        no ties and n1 * n2 <= EXACT_MAX_PAIRS, from the cached
+#                null distribution of U for (n1, n2)
+#   permutation  ties and n1 * n2 <= EXACT_MAX_PAIRS, over the midranks:
+#                every relabelling when there are few enough, else a
+#                random sample of them
+#   asymptotic   otherwise, normal approximation with tie and continuity
+#                corrections (as scipy.stats.mannwhitneyu)
+
+EXACT_MAX_PAIRS = 2500
+PERMUTATION_RESAMPLES = 20000
+
+# Relabellings are enumerated exactly when there are at most this many
+EXACT_PERMUTATIONS = 200_000
+
+# Permutations are drawn in blocks of about this many ranks
+PERMUTATION_BLOCK = 2**21
+
+MannWhitneyResult = namedtuple("MannWhitneyResult", "statistic pvalue method")
+
+
+@lru_cache(maxsize=256)
+def u_distribution(n1, n2):
+    # CDF of U under the null with no ties. The counts are the coefficients
+    # of the Gaussian binomial [n1 + n2 choose n1]_q, built as
+    # prod_i (1 - q^(n2 + i)) / (1 - q^i) in exact integers. Symmetric in
+    # (n1, n2), so both orders share one cache entry.
+    if n1 > n2:
+        return u_distribution(n2, n1)
+    counts = np.zeros(n1 * n2 + 1, dtype=object)
+    counts[0] = 1
+    for i in range(1, n1 + 1):
+        shift = n2 + i
+        if shift <= n1 * n2:
+            counts[shift:] = counts[shift:] - counts[:-shift]
+        # division by (1 - q^i): running sums within each residue class
+        for residue in range(i):
+            counts[residue::i] = np.cumsum(counts[residue::i])
+    total = comb(n1 + n2, n1)
+    cdf = np.cumsum([int(c) / total for c in counts])
+    cdf.setflags(write=False)
+    return cdf
+
+
+def _tie_term(ranks):
+    _, counts = np.unique(ranks, return_counts=True)
+    return float((counts**3 - counts).sum())
+
+
+def asymptotic_pvalue(u1, n1, n2, tie_term=0.0):
+    # Normal approximation using the larger of U1 and U2, with the tie
+    # correction to the variance and a 0.5 continuity correction
+    n = n1 + n2
+    mu = n1 * n2 / 2
+    u = max(u1, n1 * n2 - u1)
+    sigma = np.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))))
+    if sigma == 0:
+        return 1.0
+    return float(min(1.0, 2 * norm.sf((u - mu - 0.5) / sigma)))
+
+
+def exact_pvalue(u1, n1, n2):
+    u = int(round(max(u1, n1 * n2 - u1)))
+    cdf = u_distribution(n1, n2)
+    return float(min(1.0, 2 * (1 - cdf[u - 1]))) if u > 0 else 1.0
+
+
+def permutation_pvalue(ranks, n1, n_resamples=PERMUTATION_RESAMPLES, seed=0):
+    # Share of relabellings whose rank sum deviates from its mean at least as
+    # much as observed (|R1 - E R1| = |U1 - E U1|). When there are at most
+    # EXACT_PERMUTATIONS relabellings all of them are enumerated and the
+    # p-value is exact; otherwise (count + 1) / (resamples + 1) over random ones, as
+    # in scipy.stats.permutation_test
+    n = len(ranks)
+    observed = abs(ranks[:n1].sum() - n1 * (n + 1) / 2) - 1e-9
+    k = min(n1, n - n1)
+    mean = k * (n + 1) / 2
+    if comb(n, k) <= EXACT_PERMUTATIONS:
+        chosen = np.fromiter(
+            itertools.chain.from_iterable(itertools.combinations(range(n), k)),
+            dtype=np.int64,
+        ).reshape(-1, k)
+        sums = ranks[chosen].sum(axis=1)
+        return float((np.abs(sums - mean) >= observed).mean()), "exact permutation"
+
+    rng = np.random.default_rng(seed)
+    block = max(1, PERMUTATION_BLOCK // n)
+    extreme = 0
+    for start in range(0, n_resamples, block):
+        size = min(block, n_resamples - start)
+        shuffled = rng.permuted(np.tile(ranks, (size, 1)), axis=1)
+        sums = shuffled[:, :k].sum(axis=1)
+        extreme += int((np.abs(sums - mean) >= observed).sum())
+    return (extreme + 1) / (n_resamples + 1), "permutation"
+
+
+def choose_method(n1, n2, ties):
+    if n1 * n2 <= EXACT_MAX_PAIRS:
+        return "permutation" if ties else "exact"
+    return "asymptotic"
+
+
+@timed("Mann-Whitney U", TEST)
+def mann_whitney(x, y, method="auto"):
+    # U is reported for x, like scipy.stats.mannwhitneyu
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    x, y = x[~np.isnan(x)], y[~np.isnan(y)]
+    n1, n2 = len(x), len(y)
+    ranks = rankdata(np.concatenate([x, y]))
+    u1 = ranks[:n1].sum() - n1 * (n1 + 1) / 2
+    tie_term = _tie_term(ranks)
+
+    if method == "auto":
+        method = choose_method(n1, n2, tie_term > 0)
+    if method == "exact":
+        p_value = exact_pvalue(u1, n1, n2)
+    elif method == "permutation":
+        p_value, method = permutation_pvalue(ranks, n1)
+    else:
+        p_value = asymptotic_pvalue(u1, n1, n2, tie_term)
+    return MannWhitneyResult(float(u1), p_value, method)
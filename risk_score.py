@@ -0,0 +1,314 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.special import expit, logit
+
+from cohort_store import UNSTABLE_CRITERIA, unstable_hemodynamics
+from mortality_model import fingerprint, fit_irls, outcome_vector
+from roc import SortedOutcomes, auc_from_groups, roc_summary
+
+# Point-based mortality risk scores. Every item bands one cleaned column (or
+# the hemodynamic flag); a ridge-penalized logistic fit gives each band a
+# coefficient, and the points of a band are its coefficient above the item's
+# lowest-risk band, rescaled so the strongest band is worth MAX_POINTS. A
+# logistic fit of death on the total score calibrates points to risk.
+#
+# Scores are validated by stratified k-fold cross-validation: each fold
+# derives its own points and calibration from the other folds, so the
+# out-of-fold risks measure the whole procedure. Scripts can fit the folds in
+# max_workers processes; the default fits them in the calling thread, as
+# forking the dashboard's multi-threaded server process is unsafe.
+
+# Item -> (column, band cut points); values at a cut point fall in the band
+# above it
+ITEMS = {
+    "Initial Lactate": ("INITIAL LACTATE (clean)", [2.0, 4.0]),
+    "Lactate Clearance": ("LACTATE CLEARANCE (clean)", [10.0, 30.0]),
+    "Repeat Lactate": ("REPEAT LACTATE (clean)", [2.0, 4.0]),
+    "CRP": ("CRP (clean)", [50.0, 150.0]),
+    "Age": ("AGE", [45.0, 65.0]),
+    "Unstable Hemodynamics": (None, None),
+}
+DEFAULT_ITEMS = [
+    "Initial Lactate",
+    "Lactate Clearance",
+    "CRP",
+    "Unstable Hemodynamics",
+]
+
+MAX_POINTS = 5
+N_FOLDS = 5
+CALIBRATION_BINS = 5
+
+# Ridge penalty on the band coefficients; small banded cohorts are often
+# separated (e.g. no deaths in the best clearance band)
+RIDGE = 1.0
+
+
+def item_columns(item):
+    if ITEMS[item][0] is None:
+        return list(UNSTABLE_CRITERIA)
+    return [ITEMS[item][0]]
+
+
+def band_labels(item):
+    column, cuts = ITEMS[item]
+    if column is None:
+        return ["Stable", "Unstable"]
+    labels = [f"< {cuts[0]:g}"]
+    labels += [f"{low:g} to < {high:g}" for low, high in zip(cuts, cuts[1:])]
+    return labels + [f"≥ {cuts[-1]:g}"]
+
+
+def score_frame(cohort, items):
+    # Complete cases for the columns the items are built from
+    columns = list(dict.fromkeys(c for item in items for c in item_columns(item)))
+    return cohort[columns + ["CLINICAL OUTCOMES"]].dropna()
+
+
+def band_codes(frame, items):
+    # (patients, items) band index of every patient on every item
+    codes = []
+    for item in items:
+        column, cuts = ITEMS[item]
+        if column is None:
+            codes.append(unstable_hemodynamics(frame).to_numpy(dtype=np.int64))
+        else:
+            values = frame[column].to_numpy(dtype=np.float64)
+            codes.append(np.searchsorted(cuts, values, side="right"))
+    return np.column_stack(codes).astype(np.int64)
+
+
+def _design(codes, levels):
+    # Intercept plus one indicator per band above each item's first band
+    columns = [np.ones(len(codes))]
+    for item, n_bands in enumerate(levels):
+        for band in range(1, n_bands):
+            columns.append((codes[:, item] == band).astype(np.float64))
+    return np.column_stack(columns)
+
+
+def _auc(risk, y):
+    data = SortedOutcomes(risk, y.astype(bool))
+    return float(auc_from_groups(*data.grouped()))
+
+
+class RiskScore:
+    # Points per band of every item and the logistic map from total score
+    # to risk of death
+
+    def __init__(self, items, points, intercept, slope):
+        self.items = list(items)
+        self.points = [np.asarray(p, dtype=np.int64) for p in points]
+        self.intercept = float(intercept)
+        self.slope = float(slope)
+
+    def score(self, codes):
+        return sum(points[codes[:, i]] for i, points in enumerate(self.points))
+
+    def risk(self, score):
+        return expit(self.intercept + self.slope * np.asarray(score, dtype=float))
+
+    @property
+    def max_score(self):
+        return int(sum(points.max() for points in self.points))
+
+    def points_table(self):
+        rows = []
+        for item, points in zip(self.items, self.points):
+            for label, value in zip(band_labels(item), points):
+                rows.append({"Item": item, "Band": label, "Points": int(value)})
+        return pd.DataFrame(rows)
+
+    def risk_table(self):
+        scores = np.arange(self.max_score + 1)
+        return pd.DataFrame({"Score": scores, "Risk of Death": self.risk(scores)})
+
+
+def fit_score(codes, y, items, levels, max_points=MAX_POINTS, ridge=RIDGE):
+    fit = fit_irls(_design(codes, levels), y, list(items), penalty=ridge)
+    coefficients, position = [], 1
+    for n_bands in levels:
+        band = np.r_[0.0, fit.params[position : position + n_bands - 1]]
+        coefficients.append(band - band.min())
+        position += n_bands - 1
+    strongest = max(c.max() for c in coefficients)
+    unit = strongest / max_points if strongest > 0 else 1.0
+    points = [np.round(c / unit) for c in coefficients]
+
+    score = sum(p[codes[:, i]] for i, p in enumerate(points))
+    calibration = fit_irls(
+        np.column_stack([np.ones(len(y)), score]), y, ["Score"], penalty=ridge
+    )
+    intercept, slope = calibration.params
+    return RiskScore(items, points, intercept, slope)
+
+
+def stratified_folds(y, k, seed=0):
+    # Fold number of every patient, deaths and survivors spread evenly
+    rng = np.random.default_rng(seed)
+    folds = np.empty(len(y), dtype=np.int64)
+    for outcome in (0, 1):
+        members = rng.permutation(np.flatnonzero(y == outcome))
+        folds[members] = np.arange(len(members)) % k
+    return folds
+
+
+def _fit_fold(task):
+    # Points and calibration from the training folds, applied to the held
+    # out fold; run in a worker process
+    codes, y, items, levels, test, max_points, ridge = task
+    score = fit_score(codes[~test], y[~test], items, levels, max_points, ridge)
+    held_out = score.score(codes[test])
+    return score, held_out, score.risk(held_out)
+
+
+class CrossValidation:
+    # Out-of-fold scores and risks for every patient, with the final score
+    # fitted on the whole cohort
+
+    def __init__(self, score, codes, y, folds, fold_scores, oof_score, oof_risk):
+        self.score = score
+        self.codes = codes
+        self.y = y
+        self.folds = folds
+        self.fold_scores = fold_scores
+        self.oof_score = oof_score
+        self.oof_risk = oof_risk
+        # AUC summaries by n_boot; a result is shared by every session
+        # through the score cache, so its bootstrap runs once
+        self.aucs = {}
+
+    @property
+    def n(self):
+        return len(self.y)
+
+    @property
+    def events(self):
+        return int(self.y.sum())
+
+    def auc(self, n_boot=1000):
+        if n_boot not in self.aucs:
+            self.aucs[n_boot] = roc_summary(self.oof_risk, self.y, n_boot=n_boot)
+        return self.aucs[n_boot]
+
+    def apparent_auc(self):
+        # AUC of the final score on the patients it was fitted to
+        return _auc(self.score.risk(self.score.score(self.codes)), self.y)
+
+    def fold_aucs(self):
+        return [
+            _auc(self.oof_risk[self.folds == fold], self.y[self.folds == fold])
+            for fold in range(len(self.fold_scores))
+        ]
+
+    def brier(self):
+        return float(((self.oof_risk - self.y) ** 2).mean())
+
+    def calibration_slope(self):
+        # Slope of death on the out-of-fold log-odds; 1 is ideal, below 1
+        # means the score's risks are too extreme
+        risk = np.clip(self.oof_risk, 1e-9, 1 - 1e-9)
+        X = np.column_stack([np.ones(self.n), logit(risk)])
+        return float(fit_irls(X, self.y, ["Log-odds"]).params[1])
+
+    def calibration_table(self, bins=CALIBRATION_BINS):
+        # Mean predicted vs observed death rate in quantile groups of the
+        # out-of-fold risk
+        groups = pd.qcut(self.oof_risk, bins, labels=False, duplicates="drop")
+        frame = pd.DataFrame(
+            {"Group": groups, "Predicted": self.oof_risk, "Observed": self.y}
+        )
+        table = frame.groupby("Group").agg(
+            Patients=("Observed", "size"),
+            Predicted=("Predicted", "mean"),
+            Observed=("Observed", "mean"),
+        )
+        return table.reset_index(drop=True)
+
+
+def cross_validate(
+    codes,
+    y,
+    items,
+    levels,
+    k=N_FOLDS,
+    seed=0,
+    max_points=MAX_POINTS,
+    ridge=RIDGE,
+    max_workers=1,
+):
+    folds = stratified_folds(y, k, seed)
+    tasks = [
+        (codes, y, items, levels, folds == fold, max_points, ridge) for fold in range(k)
+    ]
+    workers = min(k, max_workers or os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_fit_fold, tasks))
+    else:
+        results = [_fit_fold(task) for task in tasks]
+
+    oof_score = np.zeros(len(y))
+    oof_risk = np.zeros(len(y))
+    for fold, (_, held_out, risk) in enumerate(results):
+        oof_score[folds == fold] = held_out
+        oof_risk[folds == fold] = risk
+    score = fit_score(codes, y, items, levels, max_points, ridge)
+    return CrossValidation(
+        score, codes, y, folds, [r[0] for r in results], oof_score, oof_risk
+    )
+
+
+class ScoreBuilder:
+    # Cross-validated scores keyed by (items, settings, data fingerprint),
+    # least recently used first out, so rebuilding a score already seen on
+    # the same data costs a dictionary lookup. Shared between the
+    # dashboard's session threads, so lookups and updates hold a lock; the
+    # cross-validation runs outside it.
+
+    def __init__(self, maxsize=32, max_workers=1):
+        self.maxsize = maxsize
+        self.max_workers = max_workers
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def entries(self):
+        # The cached results, as a list another thread cannot change
+        with self._lock:
+            return list(self.results.values())
+
+    def build(self, cohort, items, k=N_FOLDS, seed=0, max_points=MAX_POINTS):
+        items = list(items)
+        frame = score_frame(cohort, items)
+        key = (tuple(items), k, seed, max_points, fingerprint(frame))
+        with self._lock:
+            if key in self.results:
+                self.hits += 1
+                self.results.move_to_end(key)
+                return self.results[key]
+            self.misses += 1
+
+        codes = band_codes(frame, items)
+        levels = [len(band_labels(item)) for item in items]
+        result = cross_validate(
+            codes,
+            outcome_vector(frame),
+            items,
+            levels,
+            k,
+            seed,
+            max_points,
+            max_workers=self.max_workers,
+        )
+        with self._lock:
+            self.results[key] = result
+            while len(self.results) > self.maxsize:
+                self.results.popitem(last=False)
+        return result
@@ -0,0 +1,165 @@
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+# ROC analysis against in-hospital death. Each variable is sorted once; the
+# curve, AUC, Youden cutoff and every bootstrap replicate are then cumulative
+# sums over that order, evaluated for all candidate thresholds at once.
+# The AUC interval is a bootstrap one up to BOOTSTRAP_ROWS patients; above
+# that (or with n_boot=0) it is DeLong's asymptotic interval, which costs one
+# pass over the threshold groups, as the bootstrap costs a pass per replicate
+# over every patient.
+
+# Bootstrap replicates are processed in blocks of about this many weights
+BOOTSTRAP_BLOCK = 2**22
+BOOTSTRAP_ROWS = 10_000
+
+
+class SortedOutcomes:
+    # Values sorted in descending order with their outcome labels, grouped
+    # into runs of tied values (one run per candidate threshold)
+
+    def __init__(self, values, positive, presorted=False):
+        # Ties form one group whatever their order, so no stable sort needed
+        values = np.asarray(values, dtype=np.float64)
+        positive = np.asarray(positive, dtype=bool)
+        if not presorted:
+            keep = ~np.isnan(values)
+            values, positive = values[keep], positive[keep]
+            order = np.argsort(-values)
+            values, positive = values[order], positive[order]
+        self.values = values
+        self.positive = positive
+        self.starts = np.flatnonzero(np.r_[True, self.values[1:] != self.values[:-1]])
+        self.thresholds = self.values[self.starts]
+
+    def negated(self):
+        # The same data for -values; reversing the order keeps it sorted
+        return SortedOutcomes(-self.values[::-1], self.positive[::-1], True)
+
+    def __len__(self):
+        return len(self.values)
+
+    def grouped(self, weights=None):
+        # Positive and negative weight per threshold group; weights may be a
+        # (replicates, n) array, giving one row per replicate
+        if weights is None:
+            total = np.diff(np.r_[self.starts, len(self.values)])
+            tp = np.add.reduceat(self.positive.astype(np.int64), self.starts)
+            return tp, total - tp
+        tp = np.add.reduceat(weights * self.positive, self.starts, axis=-1)
+        fp = np.add.reduceat(weights * ~self.positive, self.starts, axis=-1)
+        return tp, fp
+
+
+def auc_from_groups(tp, fp):
+    # P(positive > negative) + P(tie) / 2, i.e. U / (n1 * n2) from the
+    # Mann-Whitney test with the positive group as the first sample
+    above = np.cumsum(tp, axis=-1) - tp
+    pairs = tp.sum(axis=-1) * fp.sum(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return ((above + tp / 2) * fp).sum(axis=-1) / pairs
+
+
+def delong_variance(tp, fp):
+    # DeLong's variance of the AUC from the threshold groups (descending):
+    # each positive is placed by the share of negatives below it and each
+    # negative by the share of positives above it, ties counted half
+    n_pos, n_neg = tp.sum(), fp.sum()
+    positive_place = (n_neg - (np.cumsum(fp) - fp) - fp / 2) / n_neg
+    negative_place = (np.cumsum(tp) - tp + tp / 2) / n_pos
+    auc = (tp * positive_place).sum() / n_pos
+    with np.errstate(invalid="ignore", divide="ignore"):
+        positive_var = (tp * (positive_place - auc) ** 2).sum() / (n_pos - 1)
+        negative_var = (fp * (negative_place - auc) ** 2).sum() / (n_neg - 1)
+        return positive_var / n_pos + negative_var / n_neg
+
+
+def roc_curve(values, positive, direction="≥"):
+    # Curve for "positive if value >= threshold" (or <= threshold)
+    sign = 1.0 if direction == "≥" else -1.0
+    data = SortedOutcomes(sign * np.asarray(values, dtype=np.float64), positive)
+    tp, fp = data.grouped()
+    tpr = np.r_[0.0, np.cumsum(tp) / tp.sum()]
+    fpr = np.r_[0.0, np.cumsum(fp) / fp.sum()]
+    return pd.DataFrame(
+        {
+            "Threshold": sign * np.r_[np.inf, data.thresholds],
+            "FPR": fpr,
+            "TPR": tpr,
+        }
+    )
+
+
+def bootstrap_auc(data, n_boot=1000, seed=0):
+    # Poisson(1) bootstrap weights on the already sorted data, so no
+    # replicate needs its own sort; close to the multinomial bootstrap for
+    # any cohort size
+    rng = np.random.default_rng(seed)
+    block = max(1, BOOTSTRAP_BLOCK // max(len(data), 1))
+    aucs = [np.empty(0)]
+    for start in range(0, n_boot, block):
+        weights = rng.poisson(1.0, size=(min(block, n_boot - start), len(data)))
+        aucs.append(auc_from_groups(*data.grouped(weights)))
+    return np.concatenate(aucs)
+
+
+def roc_summary(values, positive, n_boot=1000, confidence=0.95, seed=0):
+    values = np.asarray(values, dtype=np.float64)
+    data = SortedOutcomes(values, positive)
+    tp, fp = data.grouped()
+    if tp.sum() == 0 or fp.sum() == 0:
+        return None
+    auc = float(auc_from_groups(tp, fp))
+
+    # Lower values can be the risk direction (e.g. lactate clearance); the
+    # curve is then built on the negated values
+    direction = "≥"
+    if auc < 0.5:
+        direction = "≤"
+        data = data.negated()
+        tp, fp = data.grouped()
+        auc = 1 - auc
+
+    tpr = np.cumsum(tp) / tp.sum()
+    fpr = np.cumsum(fp) / fp.sum()
+    best = int(np.argmax(tpr - fpr))
+    cutoff = data.thresholds[best]
+
+    alpha = (1 - confidence) / 2
+    if n_boot and len(data) <= BOOTSTRAP_ROWS:
+        method = "Bootstrap"
+        low, high = np.nanquantile(
+            bootstrap_auc(data, n_boot, seed), [alpha, 1 - alpha]
+        )
+    else:
+        method = "DeLong"
+        half = NormalDist().inv_cdf(1 - alpha) * np.sqrt(delong_variance(tp, fp))
+        low, high = max(0.0, auc - half), min(1.0, auc + half)
+    return {
+        "AUC": auc,
+        "CI Lower": float(low),
+        "CI Upper": float(high),
+        "CI Method": method,
+        "DEAD if": direction,
+        "Youden Cutoff": float(cutoff if direction == "≥" else -cutoff),
+        "Sensitivity": float(tpr[best]),
+        "Specificity": float(1 - fpr[best]),
+        "Youden J": float(tpr[best] - fpr[best]),
+        "N": len(data),
+    }
+
+
+def roc_table(df, columns, outcome="CLINICAL OUTCOMES", positive="DEAD", **kwargs):
+    # One row per numeric variable, rows with an unknown outcome dropped
+    known = df[outcome].notna().to_numpy()
+    labels = (df[outcome] == positive).to_numpy(dtype=bool)[known]
+    rows = []
+    for column in columns:
+        summary = roc_summary(
+            df[column].to_numpy(dtype=np.float64)[known], labels, **kwargs
+        )
+        if summary is not None:
+            rows.append({"Variable": column, **summary})
+    return pd.DataFrame(rows)
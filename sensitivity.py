@@ -0,0 +1,112 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from contingency import chi2_2x2, fisher_exact_2x2
+
+# Sensitivity of the unstable-hemodynamics flag (any vital below its
+# threshold) to the thresholds themselves. Every vital is coded once against
+# its threshold grid, a single bincount gives the joint histogram of codes by
+# outcome, and suffix sums over that histogram give the 2x2 table for every
+# combination of thresholds at once.
+
+DEFAULT_GRID = {
+    "SBP_clean": np.arange(80, 145, 5),
+    "DBP_clean": np.arange(50, 95, 5),
+    "SPO2_clean": np.arange(80, 98, 2),
+    "CBG_clean": np.arange(55, 100, 5),
+    "HR_clean": np.arange(35, 70, 5),
+}
+
+
+class SensitivityGrid:
+    # 2x2 tables, odds ratios and p-values for every threshold combination.
+    # Arrays are indexed [SBP, DBP, ...] in grid order; tables follow the
+    # dashboard layout [[unstable alive, unstable dead],
+    # [stable alive, stable dead]].
+
+    def __init__(self, df, grid=DEFAULT_GRID):
+        self.vitals = list(grid)
+        self.grid = {vital: np.asarray(grid[vital], dtype=float) for vital in grid}
+        data = df[self.vitals + ["CLINICAL OUTCOMES"]].dropna()
+        dead = (data["CLINICAL OUTCOMES"] == "DEAD").to_numpy(dtype=np.int64)
+
+        # code = number of thresholds at or below the value, so the patient
+        # is below threshold k (flagged by it) exactly when k >= code
+        codes = [
+            np.searchsorted(self.grid[vital], data[vital].to_numpy(), side="right")
+            for vital in self.vitals
+        ]
+        shape = tuple(len(self.grid[vital]) + 1 for vital in self.vitals) + (2,)
+        index = np.ravel_multi_index(codes + [dead], shape)
+        histogram = np.bincount(index, minlength=np.prod(shape)).reshape(shape)
+
+        # Stable at thresholds k: code > k for every vital, a suffix sum
+        # along each vital axis
+        stable = histogram
+        for axis in range(len(self.vitals)):
+            stable = np.flip(np.cumsum(np.flip(stable, axis), axis=axis), axis)
+        stable = stable[(slice(1, None),) * len(self.vitals)]
+        totals = histogram.reshape(-1, 2).sum(axis=0)
+
+        self.n = int(totals.sum())
+        self.stable_alive = stable[..., 0]
+        self.stable_dead = stable[..., 1]
+        self.unstable_alive = totals[0] - self.stable_alive
+        self.unstable_dead = totals[1] - self.stable_dead
+        self._tests()
+
+    def _tests(self):
+        a, b = self.unstable_alive, self.unstable_dead
+        c, d = self.stable_alive, self.stable_dead
+
+        # Odds of death unstable vs stable, Haldane-corrected for empty cells
+        cells = np.stack([a, b, c, d]).astype(np.float64)
+        cells = np.where((cells == 0).any(axis=0), cells + 0.5, cells)
+        self.odds_ratio = cells[1] * cells[2] / (cells[0] * cells[3])
+
+        # Same rule as the dashboard: Fisher's exact if any cell < 5
+        self.fisher = np.minimum(np.minimum(a, b), np.minimum(c, d)) < 5
+        _, p_values = chi2_2x2(a, b, c, d)
+        if self.fisher.any():
+            p_values[self.fisher] = fisher_exact_2x2(
+                a[self.fisher], b[self.fisher], c[self.fisher], d[self.fisher]
+            )
+        self.p_value = p_values
+
+    @property
+    def size(self):
+        return self.odds_ratio.size
+
+    def index_of(self, thresholds):
+        # Grid index of a {vital: threshold} mapping (nearest grid value)
+        return tuple(
+            int(np.abs(self.grid[vital] - thresholds[vital]).argmin())
+            for vital in self.vitals
+        )
+
+    def plane(self, values, x, y, fixed):
+        # 2D slice of a result array over vitals x and y, with the remaining
+        # vitals held at the thresholds in fixed
+        index = list(self.index_of(fixed))
+        index[self.vitals.index(x)] = slice(None)
+        index[self.vitals.index(y)] = slice(None)
+        plane = values[tuple(index)]
+        if self.vitals.index(x) < self.vitals.index(y):
+            plane = plane.T
+        return pd.DataFrame(plane, index=self.grid[y], columns=self.grid[x])
+
+    def to_frame(self):
+        thresholds = itertools.product(*(self.grid[vital] for vital in self.vitals))
+        frame = pd.DataFrame(list(thresholds), columns=self.vitals)
+        frame["Unstable Alive"] = self.unstable_alive.ravel()
+        frame["Unstable Dead"] = self.unstable_dead.ravel()
+        frame["Stable Alive"] = self.stable_alive.ravel()
+        frame["Stable Dead"] = self.stable_dead.ravel()
+        frame["Odds Ratio"] = self.odds_ratio.ravel()
+        frame["Test Type"] = np.where(
+            self.fisher.ravel(), "Fisher's Exact Test", "Chi-square Test"
+        )
+        frame["P-Value"] = self.p_value.ravel()
+        return frame
@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2, norm
+
+from cohort_store import (
+    COMORBIDITIES,
+    UNSTABLE_CRITERIA,
+    has_comorbidity,
+    unstable_hemodynamics,
+)
+from contingency import fisher_exact_2x2
+
+# Stratified 2x2 analysis of death by exposure. All stratum tables come from
+# one bincount over a combined (stratum, exposure, outcome) code; the
+# Mantel-Haenszel, Breslow-Day and per-stratum Fisher statistics are then
+# array operations over the stratum axis.
+#
+# Per stratum: a = exposed dead, b = exposed alive, c = unexposed dead,
+# d = unexposed alive, so odds ratios are odds of death exposed vs not.
+
+FLAGS = ["SHTN+T2DM", "Unstable Hemodynamics"] + COMORBIDITIES
+STRATA = ["Age Group", "Sex"] + FLAGS
+
+
+def flag(df, name):
+    # Float 0/1 with NaN where the flag is unknown (missing vitals)
+    if name == "SHTN+T2DM":
+        values = has_comorbidity(df, "SHTN") & has_comorbidity(df, "T2DM")
+    elif name == "Unstable Hemodynamics":
+        values = unstable_hemodynamics(df).astype(float)
+        return values.where(df[list(UNSTABLE_CRITERIA)].notna().all(axis=1))
+    else:
+        values = has_comorbidity(df, name)
+    return values.astype(float)
+
+
+def flag_columns(name):
+    if name == "Unstable Hemodynamics":
+        return list(UNSTABLE_CRITERIA)
+    if name == "Age Group":
+        return ["Age_Group"]
+    if name == "Sex":
+        return ["SEX"]
+    return ["COMORBIDITY MASK"]
+
+
+def _codes(df, name):
+    # Integer codes (-1 for unknown) and level labels of a stratifier
+    if name in ("Age Group", "Sex"):
+        column = df["Age_Group" if name == "Age Group" else "SEX"]
+        return column.cat.codes.to_numpy(), list(column.cat.categories)
+    values = flag(df, name).to_numpy()
+    codes = np.where(np.isnan(values), -1, values).astype(np.int64)
+    return codes, ["No", "Yes"]
+
+
+class StratifiedTables:
+    # 2x2 tables of exposure by outcome within every combination of the
+    # stratifiers' levels; rows with any unknown value are left out
+
+    def __init__(self, df, exposure, strata):
+        self.exposure = exposure
+        self.strata = list(strata)
+        exposed = flag(df, exposure).to_numpy()
+        dead = (df["CLINICAL OUTCOMES"] == "DEAD").to_numpy()
+        known = ~np.isnan(exposed) & df["CLINICAL OUTCOMES"].notna().to_numpy()
+
+        codes, levels = [], []
+        for name in self.strata:
+            stratum_codes, stratum_levels = _codes(df, name)
+            known &= stratum_codes >= 0
+            codes.append(stratum_codes)
+            levels.append(stratum_levels)
+
+        # [stratum..., unexposed/exposed row, alive/dead column] flattened
+        shape = tuple(len(level) for level in levels) + (2, 2)
+        index = np.ravel_multi_index(
+            [c[known] for c in codes]
+            + [1 - exposed[known].astype(np.int64), 1 - dead[known]],
+            shape,
+        )
+        counts = np.bincount(index, minlength=int(np.prod(shape)))
+        tables = counts.reshape(-1, 2, 2).astype(np.float64)
+        self.a, self.b = tables[:, 0, 0], tables[:, 0, 1]
+        self.c, self.d = tables[:, 1, 0], tables[:, 1, 1]
+        self.n = self.a + self.b + self.c + self.d
+        if self.strata:
+            self.labels = pd.MultiIndex.from_product(levels, names=self.strata)
+        else:
+            self.labels = pd.Index(["All"], name="Stratum")
+
+    @property
+    def informative(self):
+        # Strata with both exposure groups and both outcomes present
+        return (
+            (self.a + self.b > 0)
+            & (self.c + self.d > 0)
+            & (self.a + self.c > 0)
+            & (self.b + self.d > 0)
+        )
+
+    def crude_odds_ratio(self):
+        a, b, c, d = self.a.sum(), self.b.sum(), self.c.sum(), self.d.sum()
+        return a * d / (b * c) if b * c > 0 else np.inf
+
+    def mantel_haenszel(self, confidence=0.95):
+        # Pooled odds ratio with the Robins-Breslow-Greenland variance and
+        # the continuity-corrected Cochran-Mantel-Haenszel test
+        keep = self.informative
+        a, b, c, d, n = (x[keep] for x in (self.a, self.b, self.c, self.d, self.n))
+        r, s = a * d / n, b * c / n
+        odds_ratio = r.sum() / s.sum()
+
+        p, q = (a + d) / n, (b + c) / n
+        variance = (
+            (p * r).sum() / (2 * r.sum() ** 2)
+            + (p * s + q * r).sum() / (2 * r.sum() * s.sum())
+            + (q * s).sum() / (2 * s.sum() ** 2)
+        )
+        z = norm.ppf(0.5 + confidence / 2)
+        spread = z * np.sqrt(variance)
+
+        row1, row2, col1, col2 = a + b, c + d, a + c, b + d
+        expected = row1 * col1 / n
+        var_a = row1 * row2 * col1 * col2 / (n**2 * (n - 1))
+        statistic = (abs(a.sum() - expected.sum()) - 0.5) ** 2 / var_a.sum()
+        return {
+            "Odds Ratio": odds_ratio,
+            "CI Lower": odds_ratio * np.exp(-spread),
+            "CI Upper": odds_ratio * np.exp(spread),
+            "Chi-square": statistic,
+            "P-Value": chi2.sf(statistic, 1),
+        }
+
+    def breslow_day(self):
+        # Homogeneity of the odds ratios across strata, Tarone-corrected
+        keep = self.informative
+        a, b, c, d, n = (x[keep] for x in (self.a, self.b, self.c, self.d, self.n))
+        if keep.sum() < 2:
+            return {"Chi-square": np.nan, "df": 0, "P-Value": np.nan}
+        odds_ratio = self.mantel_haenszel()["Odds Ratio"]
+        row1, col1 = a + b, a + c
+
+        # Expected a under the common odds ratio: the root of
+        # (1 - OR) x^2 + (n - row1 - col1 + OR (row1 + col1)) x - OR row1 col1
+        # lying between the table's bounds
+        low = np.maximum(0, row1 + col1 - n)
+        high = np.minimum(row1, col1)
+        quad = 1 - odds_ratio
+        lin = n - row1 - col1 + odds_ratio * (row1 + col1)
+        const = -odds_ratio * row1 * col1
+        if abs(quad) < 1e-12:
+            fitted = -const / lin
+        else:
+            root = np.sqrt(lin**2 - 4 * quad * const)
+            first = (-lin + root) / (2 * quad)
+            second = (-lin - root) / (2 * quad)
+            inside = (first >= low - 1e-9) & (first <= high + 1e-9)
+            fitted = np.where(inside, first, second)
+
+        cells = np.stack(
+            [fitted, row1 - fitted, col1 - fitted, n - row1 - col1 + fitted]
+        )
+        variance = 1 / (1 / cells).sum(axis=0)
+        statistic = ((a - fitted) ** 2 / variance).sum()
+        statistic -= (a.sum() - fitted.sum()) ** 2 / variance.sum()
+        dof = int(keep.sum()) - 1
+        return {"Chi-square": statistic, "df": dof, "P-Value": chi2.sf(statistic, dof)}
+
+    def per_stratum(self):
+        # Haldane-corrected odds ratio and Fisher's exact p for every stratum
+        cells = np.stack([self.a, self.b, self.c, self.d])
+        corrected = np.where((cells == 0).any(axis=0), cells + 0.5, cells)
+        frame = pd.DataFrame(
+            cells.T.astype(np.int64),
+            index=self.labels,
+            columns=[
+                "Exposed Dead",
+                "Exposed Alive",
+                "Unexposed Dead",
+                "Unexposed Alive",
+            ],
+        )
+        frame["Odds Ratio"] = (
+            corrected[0] * corrected[3] / (corrected[1] * corrected[2])
+        )
+        frame["Fisher P-Value"] = fisher_exact_2x2(*cells)
+        frame["Informative"] = self.informative
+        return frame[self.n > 0]
@@ -0,0 +1,290 @@
+import argparse
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from cohort_store import (
+    COMORBIDITIES,
+    CSV_PATH,
+    OUTCOMES,
+    SEXES,
+    SYNTHETIC,
+    CohortSummary,
+    clean_cohort,
+    clear_store,
+    save_summary,
+    write_part,
+)
+
+# Synthetic cohorts in the layout of the spreadsheet export (_Thesis -
+# Sheet1.csv): the same columns, unit-suffixed text and K/C/O lists, with
+# per-outcome distributions roughly matching the real cohort so the tests
+# find similar effects. No real patient data is used. Text columns are
+# categoricals over their distinct formatted values, so ten million rows
+# cost a code per cell rather than a Python string. Large cohorts are
+# generated in batches, each seeded by its number, so the batches can be
+# built by parallel workers and the output does not depend on their count.
+#
+#     python synthetic_cohort.py 1e8 --store /data/synthetic_store --workers 8
+#
+# A store built at the default STORE_PATH is picked up by the dashboard in
+# place of the real cohort, for demos without patient data. Its parts are
+# stamped as synthetic and the dashboard shows a banner on every page; the
+# raw CSV carries no such mark, so it is never written over the thesis
+# export at CSV_PATH.
+
+DEAD_RATE = 0.346
+MALE_RATE = 0.615
+
+# Rows generated at a time by write_csv and build_store
+BATCH = 500_000
+
+# source column: (suffix, decimals, rounding step, lognormal,
+# (ALIVE mean, sd), (DEAD mean, sd), lowest, highest)
+MEASUREMENTS = {
+    "SBP": (" mm Hg", 0, 10, False, (145, 32), (138, 32), 60, 220),
+    "DBP": (" mm Hg", 0, 10, False, (85, 16), (82, 15), 40, 130),
+    "SPO2%": ("%", 0, 1, False, (93, 8), (92.5, 10), 50, 100),
+    "RR": (" min⁻¹", 0, 1, False, (25, 6), (25, 6.5), 10, 50),
+    "CBG": (" mg/dL", 0, 1, True, (189, 95), (186, 94), 40, 600),
+    "TEMPERATURE": (" °F", 1, 0.1, False, (98.1, 1.4), (98.0, 1.3), 92, 106),
+    "HR": (" BPM", 0, 1, False, (97, 21), (95, 20), 35, 180),
+    "UREA": (" mg/dL", 0, 1, True, (102, 56), (134, 68), 10, 400),
+    "CREATININE": (" mg/dL", 1, 0.1, True, (5.8, 5.1), (5.7, 3.3), 0.3, 30),
+    "CRP": (" mg/L", 0, 1, True, (98, 111), (144, 120), 1, 500),
+    "INITIAL LACTATE": (" mmol/L", 1, 0.1, True, (3.0, 2.5), (3.4, 3.9), 0.3, 25),
+    "REPEAT LACTATE": (" mmol/L", 1, 0.1, True, (1.7, 1.4), (4.8, 4.6), 0.2, 25),
+}
+AGE = ((57, 14), (62, 11), 18, 99)
+
+# Share of ALIVE and DEAD patients listing each comorbidity in K/C/O
+PREVALENCE = {
+    "CKD": (0.91, 0.83),
+    "SHTN": (0.77, 0.89),
+    "T2DM": (0.66, 0.58),
+    "CAD": (0.32, 0.22),
+    "APE": (0.06, 0.14),
+    "CLD": (0.03, 0.06),
+    "HF": (0.015, 0.055),
+    "CVA": (0.005, 0.03),
+    "HYPOTHYROID": (0.045, 0.08),
+    "ANEMIA": (0.03, 0.03),
+}
+# K/C/O is typed by hand: the same conditions are listed in one of a few
+# orders, some entries start with a space and some add conditions the
+# dashboard does not track
+KCO_ORDERS = 4
+LEADING_SPACE = 0.12
+OTHER_RATE = 0.1
+OTHER_CONDITIONS = [
+    "DYSLIPIDEMIA",
+    "LEPTOSPIROSIS",
+    "SEIZURE DISORDER",
+    "PARKINSONS DISEASE",
+    "TB",
+    "ACS",
+]
+COMPLAINTS = [
+    "BREATHLESSNESS",
+    "GIDDINESS",
+    "CHEST PAIN",
+    "GIDDINESS VOMITING",
+    "BREATHLESSNESS FEVER",
+    "ALTERED SENSORIUM",
+    "PEDAL EDEMA",
+    "DECREASED URINE OUTPUT",
+    "ABDOMINAL PAIN",
+    "AFI",
+    "VOMITING",
+    "BREATHLESSNESS CHEST PAIN",
+]
+NAMES = [f"PATIENT {i:04d}" for i in range(10_000)]
+
+
+def _draw(rng, dead, alive_params, dead_params, lognormal):
+    mean = np.where(dead, dead_params[0], alive_params[0])
+    sd = np.where(dead, dead_params[1], alive_params[1])
+    if not lognormal:
+        return rng.normal(mean, sd)
+    # Lognormal with the given mean and sd
+    sigma2 = np.log1p((sd / mean) ** 2)
+    return rng.lognormal(np.log(mean) - sigma2 / 2, np.sqrt(sigma2))
+
+
+def _text(values, suffix, decimals, missing):
+    # Categorical of formatted values; NaN values and missing rows stay empty
+    steps = np.round(np.nan_to_num(values) * 10**decimals).astype(np.int64)
+    uniques, codes = np.unique(steps, return_inverse=True)
+    labels = [f"{step / 10**decimals:.{decimals}f}{suffix}" for step in uniques]
+    codes[missing | np.isnan(values)] = -1
+    return pd.Categorical.from_codes(codes, labels)
+
+
+def _kco(key):
+    # K/C/O text for a key of (comorbidity mask, listing order, other
+    # condition, leading space) built by synthetic_cohort
+    key, space = divmod(int(key), 2)
+    key, other = divmod(key, len(OTHER_CONDITIONS) + 1)
+    mask, order = divmod(key, KCO_ORDERS)
+    names = [name for i, name in enumerate(COMORBIDITIES) if mask >> i & 1]
+    if order:
+        names = [
+            names[i]
+            for i in np.random.default_rng([mask, order]).permutation(len(names))
+        ]
+    if other:
+        names.append(OTHER_CONDITIONS[other - 1])
+    return " " * space + " ".join(names)
+
+
+def synthetic_cohort(n, seed=0, missing=0.01):
+    # Raw frame with the spreadsheet's columns; every measurement is missing
+    # independently with probability missing
+    rng = np.random.default_rng(seed)
+    dead = rng.random(n) < DEAD_RATE
+    raw = {}
+    raw["NAME"] = pd.Categorical.from_codes(rng.integers(len(NAMES), size=n), NAMES)
+    raw["PID NO"] = rng.integers(10**11, 10**12, size=n)
+    age = np.clip(np.round(_draw(rng, dead, *AGE[:2], False)), AGE[2], AGE[3])
+    raw["AGE"] = age.astype(np.int64)
+    raw["SEX"] = pd.Categorical.from_codes(
+        (rng.random(n) >= MALE_RATE).astype(int), SEXES
+    )
+    raw["COMPLAINTS"] = pd.Categorical.from_codes(
+        rng.integers(len(COMPLAINTS), size=n), COMPLAINTS
+    )
+
+    mask = np.zeros(n, dtype=np.int64)
+    for i, name in enumerate(COMORBIDITIES):
+        rate = np.where(dead, PREVALENCE[name][1], PREVALENCE[name][0])
+        mask |= (rng.random(n) < rate).astype(np.int64) << i
+    other = np.where(
+        rng.random(n) < OTHER_RATE, rng.integers(len(OTHER_CONDITIONS), size=n) + 1, 0
+    )
+    key = (mask * KCO_ORDERS + rng.integers(KCO_ORDERS, size=n)) * (
+        len(OTHER_CONDITIONS) + 1
+    ) + other
+    key = key * 2 + (rng.random(n) < LEADING_SPACE)
+    uniques, codes = np.unique(key, return_inverse=True)
+    # Orders of a single condition give the same text
+    kco, same = np.unique([_kco(k) for k in uniques], return_inverse=True)
+    raw["K/C/O"] = pd.Categorical.from_codes(same[codes], kco)
+
+    values = {}
+    for column, params in MEASUREMENTS.items():
+        suffix, decimals, step, lognormal, alive, died, lo, hi = params
+        drawn = np.clip(_draw(rng, dead, alive, died, lognormal), lo, hi)
+        values[column] = np.round(drawn / step) * step
+        raw[column] = _text(values[column], suffix, decimals, rng.random(n) < missing)
+
+    # "120/80 mm Hg" from the two readings, empty if either is missing
+    sbp, dbp = raw["SBP"], raw["DBP"]
+    known = (sbp.codes >= 0) & (dbp.codes >= 0)
+    pairs = np.where(known, sbp.codes.astype(int) * len(dbp.categories) + dbp.codes, -1)
+    uniques, codes = np.unique(pairs, return_inverse=True)
+    labels = [
+        f"{sbp.categories[p // len(dbp.categories)].split()[0]}/"
+        f"{dbp.categories[p % len(dbp.categories)]}"
+        for p in uniques[uniques >= 0]
+    ]
+    raw["SBP/DBP"] = pd.Categorical.from_codes(codes - (uniques[0] < 0), labels)
+
+    initial = values["INITIAL LACTATE"]
+    repeat = values["REPEAT LACTATE"]
+    clearance = (initial - repeat) / initial * 100
+    unknown = (raw["INITIAL LACTATE"].codes < 0) | (raw["REPEAT LACTATE"].codes < 0)
+    raw["LACTATE CLEARANCE"] = _text(clearance, "%", 2, unknown)
+    raw["CLINICAL OUTCOMES"] = pd.Categorical.from_codes(dead.astype(int), OUTCOMES)
+
+    columns = ["NAME", "PID NO", "AGE", "SEX", "COMPLAINTS", "K/C/O", "SBP", "DBP"]
+    columns += ["SBP/DBP", "SPO2%", "RR", "CBG", "TEMPERATURE", "HR", "UREA"]
+    columns += ["CREATININE", "CRP", "INITIAL LACTATE", "REPEAT LACTATE"]
+    columns += ["LACTATE CLEARANCE", "CLINICAL OUTCOMES"]
+    return pd.DataFrame(raw)[columns]
+
+
+def _tasks(n, seed, missing, batch):
+    # (batch number, rows, seed, missing) for every batch of an n-row cohort
+    return [
+        (i, min(batch, n - start), seed, missing)
+        for i, start in enumerate(range(0, n, batch))
+    ]
+
+
+def _map(function, tasks, max_workers):
+    # Results of function over tasks in order; batches are built in worker
+    # processes unless one worker is asked for
+    workers = max_workers or min(len(tasks), os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(function, tasks)
+    else:
+        yield from map(function, tasks)
+
+
+def _csv_part(task):
+    path, (i, rows, seed, missing) = task
+    part = f"{path}.part-{i:05d}"
+    synthetic_cohort(rows, (seed, i), missing).to_csv(part, index=False, header=i == 0)
+    return part
+
+
+def write_csv(path, n, seed=0, missing=0.01, batch=BATCH, max_workers=None):
+    # Each worker writes its batch to a part file; the parts are appended to
+    # path in order as they finish
+    tasks = [(path, task) for task in _tasks(n, seed, missing, batch)]
+    with open(path, "wb") as out:
+        for part in _map(_csv_part, tasks, max_workers):
+            with open(part, "rb") as f:
+                shutil.copyfileobj(f, out)
+            os.unlink(part)
+    return path
+
+
+def _store_part(task):
+    store_path, (i, rows, seed, missing) = task
+    cohort = clean_cohort(synthetic_cohort(rows, (seed, i), missing))
+    write_part(store_path, cohort, i, source=SYNTHETIC)
+    return CohortSummary().update(cohort)
+
+
+def build_store(store_path, n, seed=0, missing=0.01, batch=BATCH, max_workers=None):
+    # A cohort store with one part per batch, as if admitted in batches. The
+    # workers write their parts directly and return the part's summary,
+    # which are merged into the store's
+    clear_store(store_path)
+    os.makedirs(store_path, exist_ok=True)
+    tasks = [(store_path, task) for task in _tasks(n, seed, missing, batch)]
+    summary = CohortSummary()
+    for part_summary in _map(_store_part, tasks, max_workers):
+        summary.merge(part_summary)
+    save_summary(store_path, summary)
+    return store_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Write a synthetic cohort in the spreadsheet's layout"
+    )
+    parser.add_argument("rows", type=float, help="number of patients, e.g. 1e6")
+    parser.add_argument("--csv", help="write the raw CSV here")
+    parser.add_argument("--store", help="build a cohort store here")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--missing", type=float, default=0.01)
+    parser.add_argument("--batch", type=int, default=BATCH)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    if not args.csv and not args.store:
+        parser.error("give --csv and/or --store")
+    if args.csv and os.path.abspath(args.csv) == os.path.abspath(CSV_PATH):
+        parser.error(f"--csv would overwrite the thesis export {CSV_PATH}")
+    rows = int(args.rows)
+    if args.csv:
+        write_csv(args.csv, rows, args.seed, args.missing, args.batch, args.workers)
+        print(f"Wrote {args.csv}")
+    if args.store:
+        build_store(args.store, rows, args.seed, args.missing, args.batch, args.workers)
+        print(f"Wrote {args.store}")
@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cohort_store import CSV_PATH, clean_cohort
+from mortality_model import DEFAULT_TERMS, ModelCache
+
+# The model cache seeds each fit from the cached fit sharing the most terms;
+# a seed from a larger model must not break the fit of a smaller one.
+
+
+@pytest.fixture(scope="module")
+def cohort():
+    return clean_cohort(pd.read_csv(CSV_PATH))
+
+
+@pytest.mark.parametrize("terms", [["Initial Lactate", "CAD"], ["SHTN"]])
+def test_subset_after_default_model(cohort, terms):
+    cache = ModelCache()
+    cache.fit(cohort, DEFAULT_TERMS)
+    warm = cache.fit(cohort, terms)
+    cold = ModelCache().fit(cohort, terms)
+    assert warm.converged
+    np.testing.assert_allclose(warm.params, cold.params, rtol=1e-4, atol=1e-6)